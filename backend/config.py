@@ -53,6 +53,9 @@ class Settings:
     OPENAI_MODEL_FAST: str = _getenv("OPENAI_MODEL_FAST", "gpt-4o-mini")
     OPENAI_MODEL_ACCURATE: str = _getenv("OPENAI_MODEL_ACCURATE", "gpt-4o")
 
+    # 1 = strict json_schema response_format (enum of allowed IDs); 0 = json_object
+    OPENAI_STRUCTURED_OUTPUTS: int = _getenv_int("OPENAI_STRUCTURED_OUTPUTS", 1)
+
     # Compatibility names
     OPENAI_MODEL: str = _getenv("OPENAI_MODEL", _getenv("OPENAI_MODEL_FAST", "gpt-4o-mini"))
     OPENAI_VISION_MODEL: str = _getenv("OPENAI_VISION_MODEL", _getenv("OPENAI_MODEL_FAST", "gpt-4o-mini"))
@@ -64,6 +67,29 @@ class Settings:
         default_factory=lambda: _getenv_list("ALLOWED_EXTENSIONS", "jpg,jpeg,png,webp,jfif")
     )
 
+    # Model upload encoding
+    IMAGE_MAX_SIDE: int = _getenv_int("IMAGE_MAX_SIDE", 1024)
+    IMAGE_QUALITY: int = _getenv_int("IMAGE_QUALITY", 85)
+    IMAGE_FORMAT: str = _getenv("IMAGE_FORMAT", "jpeg").lower()  # jpeg|webp
+    IMAGE_TARGET_KB: int = _getenv_int("IMAGE_TARGET_KB", 0)  # 0 = fixed IMAGE_QUALITY
+    IMAGE_ENCODE_OPTIMIZE: int = _getenv_int("IMAGE_ENCODE_OPTIMIZE", 0)
+
+    # IDs offered to the vision model: curated = PRIORITY_VIOLATIONS; taxonomy = curated plus
+    # model_relevance "vision" IDs; all. Sensitive IDs are always offered.
+    VISION_ALLOWED_IDS: str = _getenv("VISION_ALLOWED_IDS", "curated").lower()
+    # Roll taxonomy-policy IDs up to this level (0 = top-level violations; -1 = no rollup)
+    VISION_TAXONOMY_MAX_LEVEL: int = _getenv_int("VISION_TAXONOMY_MAX_LEVEL", -1)
+
+    # Tiling (opt-in per request via ?tiling=true)
+    TILE_MIN_SOURCE_SIDE: int = _getenv_int("TILE_MIN_SOURCE_SIDE", 2048)
+    TILE_OVERLAP_PCT: int = _getenv_int("TILE_OVERLAP_PCT", 20)
+    TILE_MAX_TILES: int = _getenv_int("TILE_MAX_TILES", 6)
+    TILE_CONCURRENCY: int = _getenv_int("TILE_CONCURRENCY", 4)
+
+    # Response compression (gzip always; br/zstd when brotli/zstandard are installed)
+    COMPRESS_MIN_BYTES: int = _getenv_int("COMPRESS_MIN_BYTES", 1024)  # 0 = off
+    COMPRESS_THREAD_MIN_BYTES: int = _getenv_int("COMPRESS_THREAD_MIN_BYTES", 16384)
+
     # CORS
     CORS_ALLOW_ORIGINS: str = _getenv("CORS_ALLOW_ORIGINS", "*")
 
@@ -77,8 +103,27 @@ class Settings:
     CACHE_TTL_SECONDS: int = _getenv_int("CACHE_TTL_SECONDS", 3600)
     REDIS_URL: str = _getenv("REDIS_URL", "")
 
+    # Admin API (/api/v1/admin/*, ?profile=1); empty = disabled
+    ADMIN_TOKEN: str = _getenv("ADMIN_TOKEN", "")
+
+    # Slow-request profiling: sample the event loop and keep profiles of requests slower than this (0 = off)
+    SLOW_REQUEST_PROFILE_MS: int = _getenv_int("SLOW_REQUEST_PROFILE_MS", 0)
+    PROFILE_SAMPLE_INTERVAL_MS: int = _getenv_int("PROFILE_SAMPLE_INTERVAL_MS", 5)
+    PROFILE_BUFFER_SIZE: int = _getenv_int("PROFILE_BUFFER_SIZE", 20)
+
     # Data paths
     LAWS_JSON_PATH: str = _getenv("LAWS_JSON_PATH", "backend/data/laws.json")
+    # Cache-Control max-age for the static /laws endpoints (ETag-validated; 0 = no-cache)
+    LAWS_CACHE_MAX_AGE_S: int = _getenv_int("LAWS_CACHE_MAX_AGE_S", 300)
+    # Poll laws.json for changes and hot-swap the knowledge base (0 = admin-triggered reloads only)
+    KB_WATCH_INTERVAL_S: int = _getenv_int("KB_WATCH_INTERVAL_S", 30)
+    # Sleep between reload build steps so requests run uncontended in between (0 = no pauses)
+    KB_RELOAD_PAUSE_MS: int = _getenv_int("KB_RELOAD_PAUSE_MS", 20)
+
+    # Prefork server (python -m backend.server): worker processes forked after the KB is loaded
+    WEB_CONCURRENCY: int = _getenv_int("WEB_CONCURRENCY", 1)
+    # Move the preloaded heap into the GC's permanent generation before forking (0 = off)
+    GC_FREEZE: int = _getenv_int("GC_FREEZE", 1)
 
 
 settings = Settings()
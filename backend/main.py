@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from backend.config import settings
+from backend.services.kb_registry import kb_registry
+from backend.services.metrics import TimingMiddleware, metrics
+from backend.services.profiler import ProfilerMiddleware
+from backend.utils.compression import CompressionMiddleware
+from backend.utils.uploads import UploadLimitMiddleware
+import backend.routers.admin as admin
 import backend.routers.analyze as analyze
 import backend.routers.laws as laws
 import backend.routers.reports as reports
@@ -18,8 +26,19 @@ def _parse_cors_origins() -> list[str]:
     return [x.strip() for x in raw.split(",") if x.strip()]
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Load + warm the knowledge base before serving, then watch laws.json for new waves.
+    kb_registry.current()
+    kb_registry.start_watcher(float(getattr(settings, "KB_WATCH_INTERVAL_S", 0) or 0))
+    try:
+        yield
+    finally:
+        kb_registry.stop_watcher()
+
+
 # ✅ Uvicorn expects this name: app
-app = FastAPI(title=settings.APP_NAME, version=getattr(settings, "APP_VERSION", "1.0.0"))
+app = FastAPI(title=settings.APP_NAME, version=getattr(settings, "APP_VERSION", "1.0.0"), lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,13 +48,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/br/zstd for JSON bodies >= COMPRESS_MIN_BYTES (large ones off the loop).
+app.add_middleware(CompressionMiddleware)
+
+# Reject oversized image uploads before the multipart body is spooled.
+app.add_middleware(UploadLimitMiddleware, paths=["/api/v1/analyze"])
+
+# Slow-request sampling and admin-only ?profile=1 (inside the timing middleware so
+# captured profiles include the per-stage breakdown).
+app.add_middleware(ProfilerMiddleware)
+
+# Outermost: per-stage timings (Server-Timing / X-Timing headers + latency histograms).
+app.add_middleware(TimingMiddleware)
+
 
 @app.get("/health")
 def health():
     return {"status": "ok", "version": getattr(settings, "APP_VERSION", "1.0.0")}
 
 
+@app.get("/health/details")
+def health_details():
+    """/health plus knowledge-base state, for status widgets (never loads or waits for the KB).
+
+    `status` is "starting" until the first KB snapshot is indexed and warmed; `kb` is
+    `KBRegistry.status()` (version, reload state, last reload error).
+    """
+    kb = kb_registry.status()
+    return {
+        "status": "ok" if kb["current"] is not None else "starting",
+        "version": getattr(settings, "APP_VERSION", "1.0.0"),
+        "kb": kb,
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ✅ Mount routers under /api/v1
 app.include_router(analyze.router, prefix="/api/v1")
 app.include_router(laws.router, prefix="/api/v1")
 app.include_router(reports.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
@@ -1,9 +1,27 @@
 from __future__ import annotations
 
+from typing import List
+
 from pydantic import BaseModel, Field
 
+# Upper bound for one POST /laws/violations:batchGet (the KB has a few hundred IDs).
+BATCH_GET_MAX_IDS = 500
+
 
 class ReportRequest(BaseModel):
     """Request body for PDF report generation."""
     analysis: dict = Field(..., description="The analysis JSON (same shape as /analyze response)")
     title: str = Field(default="ConstrucSafe BD Report")
+
+
+class BatchGetViolationsRequest(BaseModel):
+    """Request body for bulk violation lookup."""
+    ids: List[str] = Field(..., min_length=1, max_length=BATCH_GET_MAX_IDS, description="Violation IDs (duplicates ignored)")
+    include_authorities: bool = Field(default=True, description="Resolve enforcement authorities")
+    include_penalties: bool = Field(default=True, description="Resolve referenced penalty profiles")
+
+
+class RollupViolationsRequest(BaseModel):
+    """Detected violation IDs to group under their taxonomy ancestors."""
+    ids: List[str] = Field(..., min_length=1, max_length=BATCH_GET_MAX_IDS, description="Detected IDs (each one counts)")
+    level: int = Field(default=0, ge=0, description="Taxonomy level to roll up to (0 = top-level violations)")
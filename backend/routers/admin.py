@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from backend.services.kb_registry import kb_registry
+from backend.services.profiler import request_profiler
+from backend.utils.admin import require_admin
+
+# Operator-only endpoints; every route requires X-Admin-Token (see ADMIN_TOKEN).
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """Captured request profiles, newest first (summaries only)."""
+    profiler = request_profiler
+    return {
+        "slow_request_threshold_ms": profiler.threshold_ms,
+        "sample_interval_ms": round(profiler.sampler.interval_s * 1000.0, 3),
+        "profiles": [p.summary() for p in profiler.store.list()],
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: int):
+    """Full profile: top functions, folded stacks (sampled) or pstats report (cProfile)."""
+    p = request_profiler.store.get(profile_id)
+    if p is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return p.to_dict()
+
+
+@router.get("/profiles/{profile_id}/folded", response_class=PlainTextResponse)
+async def get_profile_folded(profile_id: int):
+    """Collapsed stacks for flamegraph.pl / speedscope (sampled profiles only)."""
+    p = request_profiler.store.get(profile_id)
+    if p is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(p.folded)
+
+
+@router.delete("/profiles")
+async def clear_profiles():
+    request_profiler.store.clear()
+    return {"cleared": True}
+
+
+@router.get("/kb")
+async def kb_status():
+    """Current knowledge-base snapshot (version/content hash), reload count and last error."""
+    return kb_registry.status()
+
+
+@router.post("/kb/reload")
+async def kb_reload(
+    force: bool = Query(False, description="Swap even if the content hash is unchanged"),
+    wait: bool = Query(False, description="Block until the new snapshot is built and swapped"),
+):
+    """Re-read laws.json; indexes are built off the request path and swapped atomically."""
+    if wait:
+        return await run_in_threadpool(kb_registry.reload, force=force, wait=True)
+    return kb_registry.reload(force=force)
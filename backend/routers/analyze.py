@@ -1,28 +1,40 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-import inspect
 import io
 import logging
 import traceback
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request
+from fastapi import APIRouter, UploadFile, File, HTTPException, Path, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
 
 from backend.services.vision_analyzer import VisionAnalyzer
-from backend.services.law_matcher import LawMatcher, ClauseMatch
+from backend.services.analysis_response import encode_analysis_body, enrich_detections, warm_law_bundles
+from backend.services.kb_registry import KnowledgeBase, kb_registry
 from backend.services.cache_store import cache_store
 from backend.services.usage_limiter import usage_limiter
-from backend.models.responses import (
-    AnalysisResponse,
-    DetectedViolation,
-    LawReference,
-    PenaltyProfile,
-    ViolationWithLaw,
-    FlaggedViolationWithLaw,
+from backend.services.metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    MODEL_ERRORS,
+    RATE_LIMITED,
+    UPLOAD_HASH_HITS,
+    set_label,
+    stage,
 )
-from backend.utils.image_processing import validate_image, resize_image
+from backend.models.responses import AnalysisResponse
+from backend.utils.fast_json import JSONBytesResponse, dumps
+from backend.utils.http_cache import PreEncodedBody, conditional_response
+from backend.utils.image_processing import (
+    model_ready_bytes,
+    resize_image,
+    tile_image,
+    upload_profile,
+    validate_image,
+)
+from backend.utils.uploads import read_upload
 
 try:
     from PIL import Image
@@ -34,34 +46,44 @@ logger = logging.getLogger("constructsafe.analyze")
 router = APIRouter(tags=["Analysis"])
 
 
-def _make_law_matcher() -> LawMatcher:
-    sig = inspect.signature(LawMatcher.__init__)
-    params = list(sig.parameters.keys())
+# Pre-encode law bundles for each new KB snapshot before it is swapped in.
+kb_registry.add_warmer(lambda kb: warm_law_bundles(kb.law_matcher))
 
-    if "laws_path" in params:
-        return LawMatcher(laws_path="data/laws.json")  # type: ignore[arg-type]
-    if "laws_file" in params:
-        return LawMatcher(laws_file="data/laws.json")  # type: ignore[arg-type]
 
-    try:
-        return LawMatcher()  # type: ignore[call-arg]
-    except TypeError:
-        return LawMatcher("data/laws.json")  # type: ignore[call-arg]
+# Settings are fixed for the life of the process, so the profile is encoded once.
+_UPLOAD_PROFILE = PreEncodedBody.build(dumps(upload_profile()))
 
 
-def _resize_bytes_for_model(image_bytes: bytes) -> bytes:
+def _resize_bytes_for_model(image_src: Any) -> bytes:
+    # Clients that downscale before upload (GET /analyze/config) send model-ready bytes.
+    ready = model_ready_bytes(image_src)
+    if ready is not None:
+        return ready
     try:
-        return resize_image(image_bytes)  # type: ignore[arg-type]
+        return resize_image(image_src)  # type: ignore[arg-type]
     except TypeError:
         if Image is None:
             raise HTTPException(
                 status_code=500,
                 detail="PIL/Pillow is required for image processing but is not installed. Run: pip install pillow",
             )
-        img = Image.open(io.BytesIO(image_bytes))
+        if isinstance(image_src, (bytes, bytearray, memoryview)):
+            image_src = io.BytesIO(image_src)
+        img = Image.open(image_src)
         return resize_image(img)  # type: ignore[arg-type]
 
 
+def _upload_cache_key(sha256: str, *, mode: str, include_laws: bool, tiling: bool, kb: KnowledgeBase) -> Optional[str]:
+    """Cache key of an earlier analysis of exactly these upload bytes, found without decoding them."""
+    if tiling:
+        # Tiled analyses are keyed on the original upload already.
+        return cache_store.make_key(
+            None, digest=sha256, mode=mode, include_laws=include_laws, tiling=True, kb_version=kb.version
+        )
+    alias = cache_store.make_upload_key(sha256, mode=mode, include_laws=include_laws, kb_version=kb.version)
+    return cache_store.get_alias(alias)
+
+
 async def _run_vision(vision: VisionAnalyzer, image_bytes: bytes, mode: str) -> Dict[str, Any]:
     if hasattr(vision, "analyze_image"):
         fn = getattr(vision, "analyze_image")
@@ -75,32 +97,48 @@ async def _run_vision(vision: VisionAnalyzer, image_bytes: bytes, mode: str) ->
     raise HTTPException(status_code=500, detail="VisionAnalyzer has no analyze method.")
 
 
-def _clause_matches_to_law_refs(matches: List[ClauseMatch]) -> List[LawReference]:
-    out: List[LawReference] = []
-    for m in matches:
-        interpretation_parts = [m.title]
-        if m.section:
-            interpretation_parts.append(f"Section: {m.section}")
-        if m.pdf_page is not None:
-            interpretation_parts.append(f"PDF page: {m.pdf_page}")
-        if m.gazette_page is not None:
-            interpretation_parts.append(f"Gazette page: {m.gazette_page}")
-        interpretation = " | ".join([p for p in interpretation_parts if p])
-
-        out.append(
-            LawReference(
-                source_id=m.source_catalog_id,
-                citation=m.citation or m.title,
-                interpretation=interpretation,
-                confidence=str(round(float(m.score), 4)),
-            )
-        )
-    return out
+async def _run_vision_tiles(vision: VisionAnalyzer, tiles: List[Any], mode: str) -> Dict[str, Any]:
+    if len(tiles) <= 1 or not hasattr(vision, "analyze_tiles"):
+        return await _run_vision(vision, tiles[0].image_bytes, mode=mode)
+    return await vision.analyze_tiles(tiles, mode=mode)
+
 
+@router.get("/analyze/config")
+async def analyze_config(request: Request) -> Response:
+    """Image profile the model receives (max side, format, quality, limits).
 
-def _val(x: Any) -> Any:
-    """Enum-safe value extractor."""
-    return getattr(x, "value", x)
+    Clients downscale and re-encode to this before uploading; uploads that already match
+    are passed to the model without being decoded or re-encoded.
+    """
+    return conditional_response(request, _UPLOAD_PROFILE)
+
+
+@router.get("/analyze/by-hash/{sha256}", response_model=AnalysisResponse)
+@router.head("/analyze/by-hash/{sha256}")
+async def analyze_by_hash(
+    request: Request,
+    sha256: str = Path(..., pattern="^[0-9a-fA-F]{64}$", description="sha256 of the exact file bytes to upload"),
+    include_laws: bool = Query(True),
+    mode: str = Query("fast", pattern="^(fast|accurate)$"),
+    tiling: bool = Query(False),
+) -> Response:
+    """Cached analysis of a file the server has already seen, looked up by its hash.
+
+    Clients hash the file locally and ask here first; only a 404 needs the upload.
+    HEAD answers the same question without the body. No quota is charged.
+    """
+    set_label("mode", mode)
+    kb = kb_registry.current()
+    with stage("cache_lookup"):
+        key = _upload_cache_key(sha256.lower(), mode=mode, include_laws=include_laws, tiling=tiling, kb=kb)
+        cached = cache_store.get_bytes(key) if key else None
+    if cached is None:
+        raise HTTPException(status_code=404, detail="No cached analysis for this image; upload it to /analyze")
+    CACHE_HITS.inc(mode=mode)
+    UPLOAD_HASH_HITS.inc(mode=mode)
+    if request.method == "HEAD":
+        return Response(status_code=200, media_type="application/json", headers={"Content-Length": str(len(cached))})
+    return JSONBytesResponse(cached)
 
 
 @router.post("/analyze", response_model=AnalysisResponse)
@@ -109,29 +147,81 @@ async def analyze_image(
     file: UploadFile = File(...),
     include_laws: bool = Query(True),
     mode: str = Query("fast", pattern="^(fast|accurate)$"),
-) -> AnalysisResponse:
+    tiling: bool = Query(False, description="Analyze overlapping crops of large photos (extra model calls)"),
+) -> Response:
     try:
-        usage_limiter.enforce(request, cost=2 if mode == "accurate" else 1)
-
-        vision_analyzer = VisionAnalyzer()
-        law_matcher = _make_law_matcher()
-
-        image_bytes = await file.read()
-        filename = file.filename or "upload.jpg"
-
-        if not validate_image(image_bytes, filename):
+        set_label("mode", mode)
+        cost = 2 if mode == "accurate" else 1
+        try:
+            usage_limiter.enforce(request, cost=cost + 1 if tiling else cost)
+        except HTTPException as e:
+            if e.status_code == 429:
+                RATE_LIMITED.inc(mode=mode)
+            raise
+
+        # One KB snapshot for the whole request, even if a reload swaps mid-flight.
+        kb = kb_registry.current()
+        law_matcher = kb.law_matcher
+
+        # The upload stays in Starlette's spooled file; Pillow reads it in place.
+        with stage("upload_read"):
+            upload = await read_upload(file)
+
+        # Level 1: raw upload hash (computed while streaming). An exact repeat of a file is
+        # answered here without validating, decoding or resizing it.
+        with stage("cache_lookup"):
+            known_key = _upload_cache_key(
+                upload.sha256, mode=mode, include_laws=include_laws, tiling=tiling, kb=kb
+            )
+            cached = cache_store.get_bytes(known_key) if known_key else None
+        if cached is not None:
+            CACHE_HITS.inc(mode=mode)
+            UPLOAD_HASH_HITS.inc(mode=mode)
+            return JSONBytesResponse(cached)
+
+        with stage("validate"):
+            valid = validate_image(upload.file, upload.filename)
+        if not valid:
             raise HTTPException(status_code=400, detail="Invalid image format or size")
 
-        processed_bytes = _resize_bytes_for_model(image_bytes)
-
-        cache_key = cache_store.make_key(processed_bytes, mode=mode, include_laws=include_laws)
-        cached = cache_store.get(cache_key)
-        if isinstance(cached, dict) and cached.get("success") is True:
-            return AnalysisResponse(**cached)
-
-        result = await _run_vision(vision_analyzer, processed_bytes, mode=mode)
+        if tiling:
+            # Tiles are cut from the original pixels, so key on the original upload
+            # (the level-1 lookup above already checked this key).
+            cache_key = cache_store.make_key(
+                None, digest=upload.sha256, mode=mode, include_laws=include_laws, tiling=True, kb_version=kb.version
+            )
+        else:
+            # Level 2: processed-image key; different files that resize to the same bytes share it.
+            with stage("resize"):
+                processed_bytes = _resize_bytes_for_model(upload.file)
+            cache_key = cache_store.make_key(
+                processed_bytes, mode=mode, include_laws=include_laws, kb_version=kb.version
+            )
+            cache_store.set_alias(
+                cache_store.make_upload_key(
+                    upload.sha256, mode=mode, include_laws=include_laws, kb_version=kb.version
+                ),
+                cache_key,
+            )
+            with stage("cache_lookup"):
+                cached = cache_store.get_bytes(cache_key)
+            if cached is not None:
+                # Only successful analyses are cached; send the stored bytes as-is.
+                CACHE_HITS.inc(mode=mode)
+                return JSONBytesResponse(cached)
+        CACHE_MISSES.inc(mode=mode)
+        vision_analyzer = VisionAnalyzer(law_matcher=law_matcher)
+
+        if tiling:
+            with stage("resize"):
+                # Full-resolution decode + one JPEG encode per crop: keep it off the event loop.
+                tiles = await run_in_threadpool(tile_image, upload.file)
+            result = await _run_vision_tiles(vision_analyzer, tiles, mode=mode)
+        else:
+            result = await _run_vision(vision_analyzer, processed_bytes, mode=mode)
 
         if not isinstance(result, dict) or not result.get("success", False):
+            MODEL_ERRORS.inc(mode=mode)
             err = "Unknown error"
             if isinstance(result, dict):
                 err = str(result.get("error") or err)
@@ -149,144 +239,24 @@ async def analyze_image(
         if not isinstance(image_quality, str):
             image_quality = None
 
-        violations_out: List[ViolationWithLaw] = []
-        flagged_out: List[FlaggedViolationWithLaw] = []
-
-        for v in raw_violations:
-            if not isinstance(v, dict):
-                continue
-
-            dv = DetectedViolation(**v)
-
-            laws: List[LawReference] = []
-            penalties: List[PenaltyProfile] = []
-            actions: List[str] = []
-
-            if include_laws:
-                exact = law_matcher.match_violation(dv.violation_type)
-
-                if isinstance(exact, dict):
-                    laws = [LawReference(**lr) for lr in (exact.get("laws") or [])]
-                    penalties = [PenaltyProfile(**p) for p in (exact.get("penalties") or [])]
-                    actions = exact.get("recommended_actions") or []
-                else:
-                    query_text = dv.description or dv.violation_type
-                    matches = law_matcher.match_violation(query_text, top_k=3)
-
-                    if isinstance(matches, list) and matches and isinstance(matches[0], ClauseMatch):
-                        laws = _clause_matches_to_law_refs(matches)
-
-            violations_out.append(
-                ViolationWithLaw(
-                    violation=dv,
-                    laws=laws,
-                    penalties=penalties,
-                    recommended_actions=actions,
-                )
+        # Plain dicts and pre-encoded law bundle fragments straight to JSON bytes
+        # (no per-item pydantic objects, no re-validation).
+        with stage("law_enrichment"):
+            enriched = enrich_detections(
+                law_matcher=law_matcher,
+                raw_violations=raw_violations,
+                raw_flagged=raw_flagged,
+                include_laws=include_laws,
             )
-
-        for v in raw_flagged:
-            if not isinstance(v, dict):
-                continue
-
-            dv_data: Dict[str, Any] = {
-                "violation_type": v.get("violation_type"),
-                "description": v.get("description"),
-                "severity": v.get("severity"),
-                "confidence": v.get("confidence"),
-                "location": v.get("location"),
-                "affected_parties": v.get("affected_parties"),
-            }
-            dv = DetectedViolation(**dv_data)
-
-            laws: List[LawReference] = []
-            penalties: List[PenaltyProfile] = []
-            actions: List[str] = []
-
-            if include_laws:
-                exact = law_matcher.match_violation(dv.violation_type)
-                if isinstance(exact, dict):
-                    laws = [LawReference(**lr) for lr in (exact.get("laws") or [])]
-                    penalties = [PenaltyProfile(**p) for p in (exact.get("penalties") or [])]
-                    actions = exact.get("recommended_actions") or []
-                else:
-                    query_text = dv.description or dv.violation_type
-                    matches = law_matcher.match_violation(query_text, top_k=3)
-                    if isinstance(matches, list) and matches and isinstance(matches[0], ClauseMatch):
-                        laws = _clause_matches_to_law_refs(matches)
-
-            flagged_out.append(
-                FlaggedViolationWithLaw(
-                    violation=dv,
-                    laws=laws,
-                    penalties=penalties,
-                    recommended_actions=actions,
-                    flag_reason=str(v.get("flag_reason") or "Requires manual review."),
-                    requires_human_verification=bool(v.get("requires_human_verification", True)),
-                    assumption_note=(
-                        str(v.get("assumption_note"))
-                        if isinstance(v.get("assumption_note"), str)
-                        else "This is an AI-assisted hypothesis. If confirmed by a human inspector, the attached laws and penalties would apply."
-                    ),
-                )
+        with stage("serialization"):
+            body = encode_analysis_body(
+                enriched,
+                image_id=str(uuid.uuid4()),
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                image_quality=image_quality,
             )
-
-        # UI summary (enum-safe)
-        def _sev_rank(s: Any) -> int:
-            sv = str(_val(s))
-            return {"critical": 4, "high": 3, "medium": 2, "low": 1}.get(sv, 0)
-
-        def _conf_rank(c: Any) -> int:
-            cv = str(_val(c))
-            return {"high": 3, "medium": 2, "low": 1}.get(cv, 0)
-
-        severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for vw in violations_out:
-            sev = str(_val(vw.violation.severity))
-            if sev in severity_counts:
-                severity_counts[sev] += 1
-
-        top = sorted(
-            [vw.violation for vw in violations_out],
-            key=lambda x: (_sev_rank(x.severity), _conf_rank(x.confidence)),
-            reverse=True,
-        )[:4]
-
-        ui_summary = {
-            "critical_count": severity_counts["critical"],
-            "high_count": severity_counts["high"],
-            "medium_count": severity_counts["medium"],
-            "low_count": severity_counts["low"],
-            "top_priorities": [
-                {
-                    "violation_type": t.violation_type,
-                    "severity": str(_val(t.severity)),
-                    "confidence": str(_val(t.confidence)),
-                    "location": t.location,
-                }
-                for t in top
-            ],
-            "flagged_for_review_count": len(flagged_out),
-        }
-
-        response = AnalysisResponse(
-            success=True,
-            image_id=str(uuid.uuid4()),
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            violations_found=len(violations_out),
-            violations=violations_out,
-            flagged_found=len(flagged_out),
-            flagged_for_review=flagged_out,
-            image_quality=image_quality,
-            ui_summary=ui_summary,
-            disclaimer=(
-                "⚠️ AI-assisted analysis. Confirm with qualified safety professionals and official authorities. "
-                "Items under 'flagged_for_review' are hypotheses that require human verification; attached laws/penalties are conditional until confirmed."
-            ),
-        )
-
-        cache_store.set(cache_key, response.model_dump())
-        return response
+            cache_store.set_bytes(cache_key, body)
+        return JSONBytesResponse(body)
 
     except HTTPException:
         raise
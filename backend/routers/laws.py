@@ -1,39 +1,303 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+import base64
+import bisect
+import hashlib
+from typing import Dict, List, Optional, Tuple
 
-from backend.services.law_matcher import LawMatcher
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+
+from backend.models.requests import BatchGetViolationsRequest, RollupViolationsRequest
+from backend.services.kb_bundle import kb_bundle, manifest_for
+from backend.services.kb_registry import kb_registry
+from backend.services.kb_responses import kb_responses
+from backend.services.search_index import search_index, validate_kinds
+from backend.utils.fast_json import JSONBytesResponse, dumps, raw_object
+from backend.utils.http_cache import cache_control, conditional_response, validator_matches
 
 # IMPORTANT: router prefix ensures /api/v1/laws/... always exists
 router = APIRouter(prefix="/laws", tags=["Laws"])
 
-# Make sure LawMatcher can load your JSON
-law_matcher = LawMatcher(laws_file="data/laws.json")
+
+# Encode every static /laws body (+ ETag, gzip/br), build the search index and the offline
+# bundle when a KB snapshot is built.
+kb_registry.add_warmer(kb_responses)
+kb_registry.add_warmer(lambda kb: search_index(kb.law_matcher))
+kb_registry.add_warmer(kb_bundle)
+
+
+def _law_matcher():
+    # Current KB snapshot; swapped atomically on reload.
+    return kb_registry.current().law_matcher
+
+
+def _responses():
+    return kb_responses(kb_registry.current())
+
+
+# The static endpoints below send pre-encoded bodies with strong ETags; a matching
+# If-None-Match gets 304 with no body.
 
 
 @router.get("/violations")
-async def get_supported_violations():
+async def get_supported_violations(request: Request):
     """Get list of all detectable violation types."""
     # If your frontend needs more details, use law_matcher.list_violations()
-    return {"violations": law_matcher.get_all_violation_types()}
+    return conditional_response(request, _responses().violations_list)
 
 
 @router.get("/violations/{violation_id}")
-async def get_violation_details(violation_id: str):
+async def get_violation_details(violation_id: str, request: Request):
     """Get full details for a specific violation."""
-    result = law_matcher.get_violation_details(violation_id)
-    if not result:
+    entry = _responses().violation(violation_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Violation type not found")
+    return conditional_response(request, entry)
+
+
+@router.post("/violations:batchGet")
+async def batch_get_violations(req: BatchGetViolationsRequest):
+    """Details for many violations in one call, with authorities and penalty profiles resolved once each.
+
+    `violations` keeps request order (duplicates dropped); unknown IDs are listed in
+    `not_found`. Bodies are spliced from the pre-encoded per-KB responses.
+    """
+    kb = kb_registry.current()
+    lm = kb.law_matcher
+    responses = kb_responses(kb)
+
+    found: Dict[str, bytes] = {}
+    not_found: List[str] = []
+    authority_ids: Dict[str, None] = {}  # ordered sets
+    penalty_ids: Dict[str, None] = {}
+    for raw_id in req.ids:
+        vid = (raw_id or "").strip()
+        if vid in found:
+            continue
+        entry = responses.violation(vid)
+        if entry is None:
+            if raw_id not in not_found:
+                not_found.append(raw_id)
+            continue
+        found[vid] = entry.body
+        if req.include_authorities:
+            authority_ids.update(dict.fromkeys(lm.authority_ids_for(vid)))
+        if req.include_penalties:
+            penalty_ids.update(dict.fromkeys(lm.penalty_profile_ids_for(vid)))
+
+    authorities = [(aid, responses.authorities[aid].body) for aid in authority_ids if aid in responses.authorities]
+    penalties = [(pid, responses.penalties[pid]) for pid in penalty_ids if pid in responses.penalties]
+    body = raw_object(
+        [
+            ("kb_version", dumps(kb.version)),
+            ("violations", raw_object(found.items())),
+            ("authorities", raw_object(authorities)),
+            ("penalties", raw_object(penalties)),
+            ("not_found", dumps(not_found)),
+        ]
+    )
+    return JSONBytesResponse(body)
+
+
+# ---------------------------------------------------------------------------
+# Taxonomy (parent_violation_id): subtrees and roll-ups, from indexes built with the KB
+# ---------------------------------------------------------------------------
+
+SUBTREE_FIELDS: Tuple[str, ...] = ("display_name_en", "display_name_bn", "category", "severity", "model_relevance")
+
+
+@router.get("/violations/{violation_id}/subtree")
+async def get_violation_subtree(violation_id: str, request: Request):
+    """A violation with all its descendants (preorder), plus its ancestors, root first."""
+    kb = kb_registry.current()
+    lm = kb.law_matcher
+    ids = lm.subtree(violation_id)
+    if not ids:
         raise HTTPException(status_code=404, detail="Violation type not found")
-    return result
+
+    vid = ids[0]
+    etag = f'"subtree-{kb.version}-{hashlib.sha256(vid.encode("utf-8")).hexdigest()[:16]}"'
+    headers = {"Cache-Control": cache_control(), "Vary": "Accept-Encoding", "ETag": etag}
+    if validator_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    nodes = [
+        {"violation_id": x, "parent_violation_id": lm.parent_of(x), "level": lm.taxonomy_level(x), **lm.violation_fields(x, SUBTREE_FIELDS)}
+        for x in ids
+    ]
+    body = dumps(
+        {
+            "kb_version": kb.version,
+            "violation_id": vid,
+            "level": lm.taxonomy_level(vid),
+            "ancestors": list(reversed(lm.ancestors_of(vid))),
+            "subtree": nodes,
+        }
+    )
+    return JSONBytesResponse(body, headers=headers)
+
+
+@router.post("/violations:rollup")
+async def rollup_violations(req: RollupViolationsRequest):
+    """Detections grouped under their ancestor at `level`, most frequent first.
+
+    Each group lists the detected IDs it absorbed (duplicates kept, so `count` is the
+    number of detections). Unknown IDs are listed in `not_found`.
+    """
+    kb = kb_registry.current()
+    lm = kb.law_matcher
+    groups, unknown = lm.rollup(req.ids, req.level)
+    ordered = sorted(groups.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+    body = dumps(
+        {
+            "kb_version": kb.version,
+            "level": req.level,
+            "groups": [
+                {
+                    "violation_id": target,
+                    "count": len(members),
+                    "violation_ids": list(dict.fromkeys(members)),
+                    **lm.violation_fields(target, ("display_name_en", "severity")),
+                }
+                for target, members in ordered
+            ],
+            "not_found": list(dict.fromkeys(unknown)),
+        }
+    )
+    return JSONBytesResponse(body)
 
 
 @router.get("/authorities/{authority_id}")
-async def get_authority_info(authority_id: str):
+async def get_authority_info(authority_id: str, request: Request):
     """Get contact info for an enforcement authority."""
-    result = law_matcher.get_authority_info(authority_id)
-    if not result:
+    entry = _responses().authority(authority_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Authority not found")
-    return result
+    return conditional_response(request, entry)
+
+
+# ---------------------------------------------------------------------------
+# Catalog: filtered, paginated, projected listing (one round-trip for Browse Laws)
+# ---------------------------------------------------------------------------
+
+CATALOG_DEFAULT_FIELDS: Tuple[str, ...] = ("violation_id", "display_name_en", "display_name_bn", "category", "severity")
+CATALOG_MAX_LIMIT = 200
+
+
+def _encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        raw = base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True)
+        return raw.decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _projection(fields: Optional[str], available: Tuple[str, ...]) -> Tuple[str, ...]:
+    if not fields:
+        return CATALOG_DEFAULT_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    if requested == ["*"]:
+        requested = list(available)
+    unknown = [f for f in requested if f not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}",
+        )
+    return tuple(dict.fromkeys(["violation_id", *requested]))
+
+
+@router.get("/catalog")
+async def get_violation_catalog(
+    request: Request,
+    kind: Optional[str] = Query(None, description="canonical | micro (DIFE checklist entries)"),
+    category: Optional[str] = Query(None, description="Category (case-insensitive)"),
+    severity: Optional[str] = Query(None, description="critical | high | medium | low"),
+    authority: Optional[str] = Query(None, description="Enforcing authority ID, e.g. DIFE"),
+    source_id: Optional[str] = Query(None, description="Legal source ID, e.g. BNBC_2020"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or * for all"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=CATALOG_MAX_LIMIT),
+):
+    """Violations filtered by kind/category/severity/authority/source, sorted by ID, one page at a time."""
+    kb = kb_registry.current()
+    lm = kb.law_matcher
+    proj = _projection(fields, lm.catalog_fields())
+    after = _decode_cursor(cursor) if cursor else None
+
+    # A page is a pure function of (KB version, query), so the validator needs no body hash.
+    query_key = repr(sorted(request.query_params.multi_items())).encode("utf-8")
+    etag = f'"catalog-{kb.version}-{hashlib.sha256(query_key).hexdigest()[:16]}"'
+    headers = {"Cache-Control": cache_control(), "Vary": "Accept-Encoding", "ETag": etag}
+    if validator_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    ids = lm.catalog_ids({"kind": kind, "category": category, "severity": severity, "authority": authority, "source_id": source_id})
+    start = bisect.bisect_right(ids, after) if after is not None else 0
+    page = ids[start : start + limit]
+    items = [lm.violation_fields(vid, proj) for vid in page]
+    next_cursor = _encode_cursor(page[-1]) if page and start + len(page) < len(ids) else None
+
+    body = dumps({"total": len(ids), "count": len(items), "next_cursor": next_cursor, "fields": list(proj), "items": items})
+    return JSONBytesResponse(body, headers=headers)
+
+
+@router.get("/catalog/facets")
+async def get_catalog_facets(request: Request):
+    """Catalog filter values with counts, and the fields available for projection."""
+    return conditional_response(request, _responses().catalog_facets)
+
+
+# ---------------------------------------------------------------------------
+# Offline bundle: the whole browsable KB in one cacheable artifact
+# ---------------------------------------------------------------------------
+
+
+@router.get("/bundle")
+async def get_kb_bundle(request: Request):
+    """Violations, authorities, penalty profiles, source catalog, catalog facets and the
+    search index (with tokenizer tables) of the current KB, for local browsing and search."""
+    return conditional_response(request, kb_bundle(kb_registry.current()).full)
+
+
+@router.get("/bundle/delta")
+async def get_kb_bundle_delta(
+    request: Request,
+    since: str = Query(..., min_length=1, description="kb_version of the bundle the client holds"),
+):
+    """Changes from bundle `since` to the current one: upserted/removed items per keyed
+    section and replaced whole sections. 404 if `since` is unknown here (load /bundle)."""
+    kb = kb_registry.current()
+    bundle = kb_bundle(kb)
+    base = manifest_for(since)
+    if base is None:
+        raise HTTPException(status_code=404, detail="Unknown KB version; load /laws/bundle instead")
+
+    etag = f'"bundle-delta-{since}-{kb.version}"'
+    headers = {"Cache-Control": cache_control(), "Vary": "Accept-Encoding", "ETag": etag}
+    if validator_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(bundle.delta(base), headers=headers)
+
+
+@router.get("/search")
+async def search_laws(
+    q: str = Query(..., min_length=1, description="Free text"),
+    top_k: int = Query(10, ge=1, le=50),
+    kind: Optional[List[str]] = Query(None, description="violation | micro | clause (repeatable)"),
+):
+    """Ranked search across violations, DIFE checklist items and BNBC clauses."""
+    try:
+        kinds = validate_kinds(kind)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    hits = search_index(_law_matcher()).search(q, top_k=top_k, kinds=kinds)
+    return JSONBytesResponse(dumps({"query": q, "top_k": top_k, "results": [h.to_dict() for h in hits]}))
 
 
 @router.get("/match-text")
@@ -42,5 +306,5 @@ async def match_text(
     top_k: int = Query(3, ge=1, le=20),
 ):
     """Text search → top_k clause matches."""
-    matches = law_matcher.match_violation_text(text, top_k=top_k)
+    matches = _law_matcher().match_violation_text(text, top_k=top_k)
     return {"query": text, "top_k": top_k, "matches": [m.__dict__ for m in matches]}
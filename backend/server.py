@@ -0,0 +1,174 @@
+"""Prefork server: load the knowledge base once, then fork workers that share it.
+
+    python -m backend.server [--host 0.0.0.0] [--port $PORT] [--workers $WEB_CONCURRENCY]
+
+The master imports the app and builds the current KB snapshot with every warmer (indexes,
+pre-encoded responses, search index, bundle) with the collector disabled, runs one full
+collection and then `gc.freeze()`s the survivors into the permanent generation. Workers
+forked afterwards share those pages copy-on-write: the collector never traverses frozen
+objects, so collections stay short and don't write to (and un-share) the KB's pages.
+Refcount updates on objects a request actually touches still copy their pages.
+
+The master owns the listening socket, replaces workers that die and forwards
+SIGTERM/SIGINT. Each worker keeps its own in-process cache, rate-limit counters, metrics and
+KB watcher, so a hot reload is built per worker and is not shared; use REDIS_URL for a
+shared result cache when running more than one worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+import uvicorn
+
+from backend.config import settings
+
+logger = logging.getLogger("constructsafe.server")
+
+# Seconds to wait before replacing a worker that exited (avoids a tight crash loop).
+RESPAWN_DELAY_S = 1.0
+
+
+def preload(*, freeze: bool = True) -> Any:
+    """Import the app and warm the current KB in this process; returns the ASGI app."""
+    gc.disable()  # no collections while the long-lived object graph is being built
+    try:
+        from backend.main import app
+        from backend.services.kb_registry import kb_registry
+
+        kb_registry.current()
+        gc.collect()
+        if freeze:
+            gc.freeze()
+    finally:
+        gc.enable()
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def memory_usage(pid: int) -> Optional[Dict[str, float]]:
+    """MiB from /proc/<pid>/smaps_rollup: rss, pss (shared pages split), uss (private), shared.
+
+    None where smaps_rollup is unavailable (non-Linux, or the process is gone).
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    kib: Dict[str, int] = {}
+    for line in lines:
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            kib[key] = int(parts[0])
+    private = kib.get("Private_Clean", 0) + kib.get("Private_Dirty", 0)
+    shared = kib.get("Shared_Clean", 0) + kib.get("Shared_Dirty", 0)
+    return {
+        "rss_mb": round(kib.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(kib.get("Pss", 0) / 1024, 1),
+        "uss_mb": round(private / 1024, 1),
+        "shared_mb": round(shared / 1024, 1),
+    }
+
+
+def memory_report(pids: Iterable[int]) -> Dict[str, Any]:
+    """Per-process memory_usage() plus the summed PSS (the real footprint of the group)."""
+    procs = {pid: usage for pid in pids if (usage := memory_usage(pid)) is not None}
+    return {
+        "processes": procs,
+        "total_pss_mb": round(sum(u["pss_mb"] for u in procs.values()), 1),
+        "total_uss_mb": round(sum(u["uss_mb"] for u in procs.values()), 1),
+    }
+
+
+def _serve(app: Any, sock: socket.socket, host: str, port: int) -> None:
+    # Uvicorn installs its own SIGTERM/SIGINT handlers; start from the defaults, not the master's.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, host=host, port=port, proxy_headers=True, forwarded_allow_ips="*")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app: Any, sock: socket.socket, host: str, port: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _serve(app, sock, host, port)
+        except BaseException:
+            logger.exception("worker %d failed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="ConstrucSafe BD API (prefork)")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000") or 8000))
+    ap.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY)
+    ap.add_argument("--no-freeze", action="store_true", help="skip gc.freeze() (for comparison runs)")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+
+    t0 = time.perf_counter()
+    app = preload(freeze=bool(settings.GC_FREEZE) and not args.no_freeze)
+    logger.info(
+        "master %d: KB loaded in %.0f ms, %d objects frozen",
+        os.getpid(), (time.perf_counter() - t0) * 1000.0, gc.get_freeze_count(),
+    )
+
+    sock = bind_socket(args.host, args.port)
+    workers: Set[int] = {_spawn(app, sock, args.host, args.port) for _ in range(max(1, args.workers))}
+    stopping = False
+
+    def stop(signum: int, _frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info("master %d: serving on %s:%d with workers %s", os.getpid(), args.host, args.port, sorted(workers))
+    logger.info("memory: %s", memory_report([os.getpid(), *workers]))
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not stopping:
+            logger.warning("worker %d exited with status %d; starting a replacement", pid, os.waitstatus_to_exitcode(status))
+            time.sleep(RESPAWN_DELAY_S)
+            if not stopping:
+                workers.add(_spawn(app, sock, args.host, args.port))
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
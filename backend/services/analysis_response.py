@@ -0,0 +1,274 @@
+"""Serializes /analyze responses straight to JSON bytes.
+
+The output is the same JSON document `AnalysisResponse(...).model_dump_json()` produces
+(same keys, same key order), without building pydantic objects per detection:
+
+  - detections from VisionAnalyzer are already normalized; they are shape-checked here and
+    only go through `DetectedViolation` when something looks off
+  - exact law bundles are encoded once per (LawMatcher, violation_id) and reused as
+    pre-serialized fragments
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.models.responses import DetectedViolation, LawReference, PenaltyProfile
+from backend.services.law_matcher import ClauseMatch, LawMatcher
+from backend.utils.fast_json import dumps, raw_array, raw_object
+
+
+DETECTED_FIELDS: Tuple[str, ...] = tuple(DetectedViolation.model_fields)
+LAW_FIELDS: Tuple[str, ...] = tuple(LawReference.model_fields)
+PENALTY_FIELDS: Tuple[str, ...] = tuple(PenaltyProfile.model_fields)
+
+_LAW_TYPES: Dict[str, type] = {k: str for k in LAW_FIELDS}
+_PENALTY_TYPES: Dict[str, type] = {k: (int if k in ("min_bdt", "max_bdt") else str) for k in PENALTY_FIELDS}
+
+_SEVERITIES = frozenset({"critical", "high", "medium", "low"})
+_CONFIDENCES = frozenset({"high", "medium", "low"})
+_SEV_RANK = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+_CONF_RANK = {"high": 3, "medium": 2, "low": 1}
+
+DISCLAIMER = (
+    "⚠️ AI-assisted analysis. Confirm with qualified safety professionals and official authorities. "
+    "Items under 'flagged_for_review' are hypotheses that require human verification; attached laws/penalties are conditional until confirmed."
+)
+DEFAULT_ASSUMPTION_NOTE = (
+    "This is an AI-assisted hypothesis. If confirmed by a human inspector, the attached laws and penalties would apply."
+)
+
+_EMPTY_BUNDLE = b'"laws":[],"penalties":[],"recommended_actions":[]'
+
+# LawMatcher -> {violation_id: bundle fragment or None (not an exact ID)}
+_fragments: "weakref.WeakKeyDictionary[LawMatcher, Dict[str, Optional[bytes]]]" = weakref.WeakKeyDictionary()
+_fragments_lock = threading.Lock()
+
+
+def _str_or_none(x: Any) -> Optional[str]:
+    return x if x is None or isinstance(x, str) else None
+
+
+def detected_violation_dict(v: Dict[str, Any]) -> Dict[str, Any]:
+    """DetectedViolation-shaped dict; falls back to full pydantic validation on unexpected input."""
+    vt = v.get("violation_type")
+    desc = v.get("description")
+    sev = v.get("severity")
+    conf = v.get("confidence")
+    loc = v.get("location")
+    parties = v.get("affected_parties")
+    if (
+        isinstance(vt, str)
+        and isinstance(desc, str)
+        and isinstance(loc, str)
+        and sev in _SEVERITIES
+        and conf in _CONFIDENCES
+        and isinstance(parties, list)
+        and all(isinstance(p, str) for p in parties)
+    ):
+        return {
+            "violation_type": vt,
+            "description": desc,
+            "severity": sev,
+            "confidence": conf,
+            "location": loc,
+            "affected_parties": parties,
+        }
+    return DetectedViolation(**{k: v.get(k) for k in DETECTED_FIELDS}).model_dump(mode="json")
+
+
+def _plain(d: Dict[str, Any], types: Dict[str, type]) -> bool:
+    # bool is an int subclass but not a valid int field value for pydantic's JSON output.
+    for k, t in types.items():
+        x = d.get(k)
+        if x is not None and (type(x) is bool or not isinstance(x, t)):
+            return False
+    return True
+
+
+def _law_dict(lr: Dict[str, Any]) -> Dict[str, Any]:
+    if _plain(lr, _LAW_TYPES):
+        return {k: lr.get(k) for k in LAW_FIELDS}
+    return LawReference(**lr).model_dump(mode="json")
+
+
+def _penalty_dict(p: Dict[str, Any]) -> Dict[str, Any]:
+    if _plain(p, _PENALTY_TYPES):
+        return {k: p.get(k) for k in PENALTY_FIELDS}
+    return PenaltyProfile(**p).model_dump(mode="json")
+
+
+def _encode_bundle(bundle: Dict[str, Any]) -> bytes:
+    laws = [_law_dict(lr) for lr in (bundle.get("laws") or []) if isinstance(lr, dict)]
+    penalties = [_penalty_dict(p) for p in (bundle.get("penalties") or []) if isinstance(p, dict)]
+    actions = [str(a) for a in (bundle.get("recommended_actions") or [])]
+    return (
+        b'"laws":' + dumps(laws) + b',"penalties":' + dumps(penalties) + b',"recommended_actions":' + dumps(actions)
+    )
+
+
+def _clause_fragment(matches: List[ClauseMatch]) -> bytes:
+    laws: List[Dict[str, Any]] = []
+    for m in matches:
+        interpretation_parts = [m.title]
+        if m.section:
+            interpretation_parts.append(f"Section: {m.section}")
+        if m.pdf_page is not None:
+            interpretation_parts.append(f"PDF page: {m.pdf_page}")
+        if m.gazette_page is not None:
+            interpretation_parts.append(f"Gazette page: {m.gazette_page}")
+        laws.append(
+            {
+                "source_id": m.source_catalog_id,
+                "citation": m.citation or m.title,
+                "interpretation": " | ".join([p for p in interpretation_parts if p]),
+                "confidence": str(round(float(m.score), 4)),
+            }
+        )
+    return b'"laws":' + dumps(laws) + b',"penalties":[],"recommended_actions":[]'
+
+
+def law_bundle_fragment(law_matcher: LawMatcher, dv: Dict[str, Any], include_laws: bool) -> bytes:
+    """`"laws":[..],"penalties":[..],"recommended_actions":[..]` for one detection.
+
+    Exact violation_id bundles are memoized per LawMatcher; otherwise the description is
+    matched against the clause library (top 3), as before.
+    """
+    if not include_laws:
+        return _EMPTY_BUNDLE
+
+    vt = dv["violation_type"]
+    with _fragments_lock:
+        per_matcher = _fragments.get(law_matcher)
+        if per_matcher is None:
+            per_matcher = {}
+            _fragments[law_matcher] = per_matcher
+    if vt in per_matcher:
+        frag = per_matcher[vt]
+    else:
+        exact = law_matcher.match_violation(vt)
+        frag = _encode_bundle(exact) if isinstance(exact, dict) else None
+        per_matcher[vt] = frag
+    if frag is not None:
+        return frag
+
+    matches = law_matcher.match_violation(dv.get("description") or vt, top_k=3)
+    if isinstance(matches, list) and matches and isinstance(matches[0], ClauseMatch):
+        return _clause_fragment(matches)
+    return _EMPTY_BUNDLE
+
+
+def warm_law_bundles(law_matcher: LawMatcher) -> int:
+    """Pre-encode every exact bundle so the first requests on a new KB don't pay for it."""
+    n = 0
+    for vid in law_matcher.get_all_violation_types():
+        law_bundle_fragment(law_matcher, {"violation_type": vid}, True)
+        n += 1
+    return n
+
+
+def _ui_summary(violations: List[Dict[str, Any]], flagged_count: int) -> Dict[str, Any]:
+    counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+    for dv in violations:
+        if dv["severity"] in counts:
+            counts[dv["severity"]] += 1
+    top = sorted(
+        violations,
+        key=lambda x: (_SEV_RANK.get(x["severity"], 0), _CONF_RANK.get(x["confidence"], 0)),
+        reverse=True,
+    )[:4]
+    return {
+        "critical_count": counts["critical"],
+        "high_count": counts["high"],
+        "medium_count": counts["medium"],
+        "low_count": counts["low"],
+        "top_priorities": [
+            {
+                "violation_type": t["violation_type"],
+                "severity": t["severity"],
+                "confidence": t["confidence"],
+                "location": t["location"],
+            }
+            for t in top
+        ],
+        "flagged_for_review_count": flagged_count,
+    }
+
+
+# (detection dict, law bundle fragment[, flag tail]) per item, ready to encode
+Enriched = Tuple[List[Tuple[Dict[str, Any], bytes]], List[Tuple[Dict[str, Any], bytes, Dict[str, Any]]]]
+
+
+def enrich_detections(
+    *,
+    law_matcher: LawMatcher,
+    raw_violations: List[Any],
+    raw_flagged: List[Any],
+    include_laws: bool,
+) -> Enriched:
+    """Normalize detections and look up their law bundle fragments (no encoding)."""
+    violations: List[Tuple[Dict[str, Any], bytes]] = []
+    for v in raw_violations:
+        if not isinstance(v, dict):
+            continue
+        dv = detected_violation_dict(v)
+        violations.append((dv, law_bundle_fragment(law_matcher, dv, include_laws)))
+
+    flagged: List[Tuple[Dict[str, Any], bytes, Dict[str, Any]]] = []
+    for v in raw_flagged:
+        if not isinstance(v, dict):
+            continue
+        dv = detected_violation_dict(v)
+        note = v.get("assumption_note")
+        tail = {
+            "flag_reason": str(v.get("flag_reason") or "Requires manual review."),
+            "requires_human_verification": bool(v.get("requires_human_verification", True)),
+            "assumption_note": note if isinstance(note, str) else DEFAULT_ASSUMPTION_NOTE,
+        }
+        flagged.append((dv, law_bundle_fragment(law_matcher, dv, include_laws), tail))
+    return violations, flagged
+
+
+def encode_analysis_body(
+    enriched: Enriched, *, image_id: str, timestamp: str, image_quality: Optional[str]
+) -> bytes:
+    """Encode the output of enrich_detections() as AnalysisResponse JSON bytes."""
+    violations, flagged = enriched
+    violation_items = [b'{"violation":' + dumps(dv) + b"," + frag + b"}" for dv, frag in violations]
+    flagged_items = [
+        b'{"violation":' + dumps(dv) + b"," + frag + b"," + dumps(tail)[1:] for dv, frag, tail in flagged
+    ]
+
+    return raw_object(
+        [
+            ("success", b"true"),
+            ("image_id", dumps(image_id)),
+            ("timestamp", dumps(timestamp)),
+            ("violations_found", dumps(len(violation_items))),
+            ("violations", raw_array(violation_items)),
+            ("flagged_found", dumps(len(flagged_items))),
+            ("flagged_for_review", raw_array(flagged_items)),
+            ("image_quality", dumps(_str_or_none(image_quality))),
+            ("ui_summary", dumps(_ui_summary([dv for dv, _ in violations], len(flagged_items)))),
+            ("disclaimer", dumps(DISCLAIMER)),
+        ]
+    )
+
+
+def build_analysis_body(
+    *,
+    law_matcher: LawMatcher,
+    raw_violations: List[Any],
+    raw_flagged: List[Any],
+    include_laws: bool,
+    image_id: str,
+    timestamp: str,
+    image_quality: Optional[str],
+) -> bytes:
+    """Encode a successful AnalysisResponse as JSON bytes."""
+    enriched = enrich_detections(
+        law_matcher=law_matcher, raw_violations=raw_violations, raw_flagged=raw_flagged, include_laws=include_laws
+    )
+    return encode_analysis_body(enriched, image_id=image_id, timestamp=timestamp, image_quality=image_quality)
@@ -4,14 +4,15 @@ import hashlib
 import json
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 from backend.config import settings
+from backend.utils.fast_json import dumps
 
 
 @dataclass
 class _Entry:
-    payload: Dict[str, Any]
+    payload: Union[Dict[str, Any], bytes]
     expires_at: float
 
 
@@ -44,9 +45,35 @@ class CacheStore:
                 self._redis = None
                 self._redis_enabled = False
 
-    def make_key(self, image_bytes: bytes, *, mode: str, include_laws: bool) -> str:
-        h = hashlib.sha256(image_bytes).hexdigest()
-        return f"analyze:{mode}:{int(include_laws)}:{h}"
+    @staticmethod
+    def _scope(mode: str, include_laws: bool, tiling: bool, kb_version: str) -> str:
+        variant = f"{mode}+tiles" if tiling else mode
+        kb = f"kb{kb_version}:" if kb_version else ""
+        return f"{variant}:{int(include_laws)}:{kb}"
+
+    def make_key(
+        self,
+        image_bytes: Optional[bytes],
+        *,
+        mode: str,
+        include_laws: bool,
+        tiling: bool = False,
+        digest: Optional[str] = None,
+        kb_version: str = "",
+    ) -> str:
+        """Cache key for an analysis; pass `digest` (sha256 hex) when the bytes were hashed upstream.
+
+        `kb_version` scopes entries to a laws.json snapshot (allowed IDs and law bundles come
+        from it), so a KB reload naturally misses old entries; they age out via TTL.
+        """
+        h = digest or hashlib.sha256(image_bytes or b"").hexdigest()
+        return f"analyze:{self._scope(mode, include_laws, tiling, kb_version)}{h}"
+
+    def make_upload_key(
+        self, sha256: str, *, mode: str, include_laws: bool, tiling: bool = False, kb_version: str = ""
+    ) -> str:
+        """Alias key for the raw upload hash (before decode/resize); see `get_alias`."""
+        return f"upload:{self._scope(mode, include_laws, tiling, kb_version)}{sha256}"
 
     @staticmethod
     def _safe_json_loads(raw: Any) -> Optional[Dict[str, Any]]:
@@ -64,21 +91,46 @@ class CacheStore:
         # Unexpected types (e.g., sets) => treat as cache miss
         return None
 
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
-        if self._redis_enabled and self._redis is not None:
-            raw = self._redis.get(key)
-            return self._safe_json_loads(raw)
-
+    def _mem_get(self, key: str) -> Optional[_Entry]:
         ent = self._mem.get(key)
         if not ent:
             return None
         if ent.expires_at < time.time():
             self._mem.pop(key, None)
             return None
+        return ent
+
+    @staticmethod
+    def _ttl(ttl_seconds: Optional[int]) -> int:
+        return getattr(settings, "CACHE_TTL_SECONDS", 300) if ttl_seconds is None else ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._redis_enabled and self._redis is not None:
+            raw = self._redis.get(key)
+            return self._safe_json_loads(raw)
+
+        ent = self._mem_get(key)
+        if ent is None:
+            return None
+        if isinstance(ent.payload, bytes):
+            return self._safe_json_loads(ent.payload)
         return ent.payload
 
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Cached JSON document as UTF-8 bytes (what the API sends), or None."""
+        if self._redis_enabled and self._redis is not None:
+            raw = self._redis.get(key)
+            return bytes(raw) if isinstance(raw, (bytes, bytearray)) and raw else None
+
+        ent = self._mem_get(key)
+        if ent is None:
+            return None
+        if isinstance(ent.payload, bytes):
+            return ent.payload
+        return dumps(ent.payload)
+
     def set(self, key: str, payload: Dict[str, Any], ttl_seconds: Optional[int] = None) -> None:
-        ttl = getattr(settings, "CACHE_TTL_SECONDS", 300) if ttl_seconds is None else ttl_seconds
+        ttl = self._ttl(ttl_seconds)
         if ttl <= 0:
             return
 
@@ -90,5 +142,25 @@ class CacheStore:
 
         self._mem[key] = _Entry(payload=payload, expires_at=time.time() + ttl)
 
+    def set_bytes(self, key: str, data: bytes, ttl_seconds: Optional[int] = None) -> None:
+        """Store an already-encoded JSON document; hits are served without decoding it."""
+        ttl = self._ttl(ttl_seconds)
+        if ttl <= 0:
+            return
+
+        if self._redis_enabled and self._redis is not None:
+            self._redis.setex(key, ttl, data)
+            return
+
+        self._mem[key] = _Entry(payload=bytes(data), expires_at=time.time() + ttl)
+
+    def get_alias(self, key: str) -> Optional[str]:
+        """The cache key an alias points to (e.g. raw upload hash -> processed-image key)."""
+        raw = self.get_bytes(key)
+        return raw.decode("utf-8") if raw else None
+
+    def set_alias(self, key: str, target: str, ttl_seconds: Optional[int] = None) -> None:
+        self.set_bytes(key, target.encode("utf-8"), ttl_seconds)
+
 
 cache_store = CacheStore()
@@ -0,0 +1,148 @@
+"""Offline KB bundle: one versioned JSON artifact with everything law browsing and search need.
+
+Sections (BUNDLE_FORMAT 1):
+
+  - keyed, diffed item by item: source_catalog, violations, authorities, penalties
+  - whole, replaced when changed: catalog (facet posting lists), search (SearchIndex
+    export) and analyzer (tokenizer tables, so clients tokenize exactly like the index)
+
+The full bundle is spliced from per-item bytes (shared with KBResponses) and compressed
+once per KB snapshot. Item hashes of the last BUNDLE_HISTORY snapshots are kept, so a
+client holding an older version can fetch only what changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from backend.services.kb_registry import KnowledgeBase
+from backend.services.kb_responses import kb_responses
+from backend.services.search_index import search_index
+from backend.utils.fast_json import dumps, raw_object
+from backend.utils.http_cache import PreEncodedBody
+from backend.utils.text import analyzer_tables
+
+BUNDLE_FORMAT = 1
+BUNDLE_HISTORY = 16
+
+KEYED_SECTIONS: Tuple[str, ...] = ("source_catalog", "violations", "authorities", "penalties")
+WHOLE_SECTIONS: Tuple[str, ...] = ("catalog", "search", "analyzer")
+
+# source_catalog entries also carry server-local file paths and file hashes.
+SOURCE_FIELDS: Tuple[str, ...] = ("source_id", "title", "type", "official_portal")
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """Content hashes of one bundle: per item for keyed sections, per section otherwise."""
+
+    version: str
+    items: Dict[str, Dict[str, str]]
+    whole: Dict[str, str]
+
+
+class KBBundle:
+    """The bundle of one KB snapshot, plus deltas from earlier snapshots on demand."""
+
+    def __init__(self, kb: KnowledgeBase) -> None:
+        lm = kb.law_matcher
+        responses = kb_responses(kb)
+        self.kb_version = kb.version
+        self.items: Dict[str, Dict[str, bytes]] = {
+            "source_catalog": {
+                str(s["source_id"]): dumps({f: s.get(f) for f in SOURCE_FIELDS}) for s in lm.get_source_catalog()
+            },
+            "violations": {vid: entry.body for vid, entry in responses.violations.items()},
+            "authorities": {aid: entry.body for aid, entry in responses.authorities.items()},
+            "penalties": dict(responses.penalties),
+        }
+        self.whole: Dict[str, bytes] = {
+            "catalog": dumps(lm.catalog_index()),
+            "search": dumps(search_index(lm).export()),
+            "analyzer": dumps(analyzer_tables()),
+        }
+        self.manifest = Manifest(
+            version=kb.version,
+            items={sec: {k: _digest(b) for k, b in by_key.items()} for sec, by_key in self.items.items()},
+            whole={sec: _digest(b) for sec, b in self.whole.items()},
+        )
+        self.full = PreEncodedBody.build(
+            raw_object(
+                [
+                    ("format", dumps(BUNDLE_FORMAT)),
+                    ("kb_version", dumps(kb.version)),
+                    *((sec, raw_object(self.items[sec].items())) for sec in KEYED_SECTIONS),
+                    *((sec, self.whole[sec]) for sec in WHOLE_SECTIONS),
+                ]
+            )
+        )
+        self._deltas: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def delta(self, base: Manifest) -> bytes:
+        """`{format, from, to, upsert, remove, replace}` turning bundle `base` into this one."""
+        body = self._deltas.get(base.version)
+        if body is not None:
+            return body
+
+        upsert: List[Tuple[str, bytes]] = []
+        remove: Dict[str, List[str]] = {}
+        for sec in KEYED_SECTIONS:
+            old = base.items.get(sec, {})
+            cur = self.manifest.items[sec]
+            changed = [(k, self.items[sec][k]) for k, d in cur.items() if old.get(k) != d]
+            if changed:
+                upsert.append((sec, raw_object(changed)))
+            gone = [k for k in old if k not in cur]
+            if gone:
+                remove[sec] = gone
+        replace = [(sec, self.whole[sec]) for sec in WHOLE_SECTIONS if base.whole.get(sec) != self.manifest.whole[sec]]
+
+        body = raw_object(
+            [
+                ("format", dumps(BUNDLE_FORMAT)),
+                ("from", dumps(base.version)),
+                ("to", dumps(self.kb_version)),
+                ("upsert", raw_object(upsert)),
+                ("remove", dumps(remove)),
+                ("replace", raw_object(replace)),
+            ]
+        )
+        with self._lock:
+            self._deltas[base.version] = body
+        return body
+
+
+_by_kb: "weakref.WeakKeyDictionary[KnowledgeBase, KBBundle]" = weakref.WeakKeyDictionary()
+_manifests: "OrderedDict[str, Manifest]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def kb_bundle(kb: KnowledgeBase) -> KBBundle:
+    """The bundle for `kb` (built on first use if the warmer hasn't run); its manifest joins the history."""
+    b = _by_kb.get(kb)
+    if b is None:
+        with _lock:
+            b = _by_kb.get(kb)
+            if b is None:
+                b = KBBundle(kb)
+                _by_kb[kb] = b
+                _manifests[kb.version] = b.manifest
+                _manifests.move_to_end(kb.version)
+                while len(_manifests) > BUNDLE_HISTORY:
+                    _manifests.popitem(last=False)
+    return b
+
+
+def manifest_for(version: str) -> Optional[Manifest]:
+    """Manifest of a recent KB version, or None if it was never built here or has aged out."""
+    return _manifests.get(version)
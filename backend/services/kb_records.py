@@ -0,0 +1,266 @@
+"""Compact in-memory records for the violation index.
+
+laws.json violations are converted once at load time into frozen, slotted records:
+
+  - enum-like strings (category, severity, authority/source IDs, confidences, penalty
+    profile IDs, notes) are interned, so every record shares one copy;
+  - lists become tuples, nested objects become records (`LegalReference`, `Enforcement`);
+  - long free text (descriptions, legal-text excerpts) lives in a separate `ViolationText`,
+    so the records behind catalog filters, lookups and the taxonomy stay small.
+
+Each record remembers its JSON key order (`layout`, one shared tuple per distinct key set)
+and keeps keys it doesn't model in `extra`, so `to_json()` rebuilds the laws.json object
+exactly. Only the API boundary (pre-encoded responses, the bundle, the search index build,
+catalog projections) converts back.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
+
+JsonObj = Dict[str, Any]
+Extra = Tuple[Tuple[str, Any], ...]
+
+_layouts: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+# Returned by a field converter for a value of an unexpected shape: the key goes to `extra`.
+_UNMODELLED = object()
+
+
+def _layout(obj: JsonObj) -> Tuple[str, ...]:
+    keys = tuple(sys.intern(k) for k in obj)
+    return _layouts.setdefault(keys, keys)
+
+
+class _Object(tuple):
+    """A nested JSON object without a record type: ((key, value), ...); thawed back to a dict."""
+
+    __slots__ = ()
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, dict):
+        return _Object((sys.intern(k), _freeze(v)) for k, v in value.items())
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, _Record):
+        return value.to_json()
+    if isinstance(value, _Object):
+        return {k: _thaw(v) for k, v in value}
+    if isinstance(value, tuple):
+        return [_thaw(x) for x in value]
+    return value
+
+
+def json_value(value: Any) -> Any:
+    """A record attribute (tuple, nested record, frozen object) back in its JSON form."""
+    return _thaw(value)
+
+
+def _sym(value: Any) -> Any:
+    """Interned when a string (IDs, categories, severities, ...); other values frozen."""
+    return sys.intern(value) if isinstance(value, str) else _freeze(value)
+
+
+def _syms(value: Any) -> Any:
+    """A list of IDs/labels as a tuple of interned strings."""
+    return tuple(_sym(x) for x in value) if isinstance(value, list) else _freeze(value)
+
+
+class _Record:
+    """JSON conversion for the record dataclasses below.
+
+    FIELDS maps a JSON key to (attribute, converter); TEXT lists JSON keys whose values
+    are stored outside the record and passed back to to_json(). Keys that aren't modelled,
+    or whose value has an unexpected shape, are kept verbatim in `extra`, so the typed
+    attributes always hold records, tuples or scalars.
+    """
+
+    __slots__ = ()
+    FIELDS: ClassVar[Dict[str, Tuple[str, Callable[[Any], Any]]]] = {}
+    TEXT: ClassVar[frozenset] = frozenset()
+
+    @classmethod
+    def _convert(cls, obj: JsonObj) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(record kwargs, text values) for `obj`; unmodelled or duplicate keys go to extra."""
+        values: Dict[str, Any] = {}
+        text: Dict[str, Any] = {}
+        extra: List[Tuple[str, Any]] = []
+        for k, v in obj.items():
+            if k in cls.TEXT:
+                text[k] = v
+                continue
+            spec = cls.FIELDS.get(k)
+            conv = spec[1](v) if spec is not None and spec[0] not in values else _UNMODELLED
+            if conv is _UNMODELLED:
+                extra.append((sys.intern(k), _freeze(v)))
+            else:
+                values[spec[0]] = conv
+        values["layout"] = _layout(obj)
+        values["extra"] = tuple(extra)
+        return values, text
+
+    def get(self, key: str, text: Any = None) -> Any:
+        """One JSON field (None when absent), without building the whole object."""
+        if key not in self.layout:  # type: ignore[attr-defined]
+            return None
+        if key in self.TEXT:
+            return text.get(key) if text is not None else None
+        for k, v in self.extra:  # type: ignore[attr-defined]
+            if k == key:
+                return _thaw(v)
+        return self._json_value(key, text)
+
+    def _json_value(self, key: str, text: Any) -> Any:
+        return _thaw(getattr(self, self.FIELDS[key][0]))
+
+    def to_json(self, text: Any = None) -> JsonObj:
+        return {k: self.get(k, text) for k in self.layout}  # type: ignore[attr-defined]
+
+
+@dataclass(frozen=True, slots=True)
+class LegalReference(_Record):
+    FIELDS: ClassVar[Dict[str, Tuple[str, Callable[[Any], Any]]]] = {
+        "source_id": ("source_id", _sym),
+        "citation": ("citation", _sym),
+        "interpretation": ("interpretation", _sym),
+        "confidence": ("confidence", _sym),
+        "page_start": ("page_start", _freeze),
+        "anchor": ("anchor", _freeze),
+    }
+    TEXT: ClassVar[frozenset] = frozenset(("relevant_text_excerpt",))
+
+    layout: Tuple[str, ...]
+    extra: Extra = ()
+    source_id: Optional[str] = None
+    citation: Optional[str] = None
+    interpretation: Optional[str] = None
+    confidence: Optional[str] = None
+    page_start: Optional[int] = None
+    anchor: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class Enforcement(_Record):
+    FIELDS: ClassVar[Dict[str, Tuple[str, Callable[[Any], Any]]]] = {
+        "primary_authority": ("primary_authority", _sym),
+        "secondary_authority": ("secondary_authority", _sym),
+    }
+
+    layout: Tuple[str, ...]
+    extra: Extra = ()
+    primary_authority: Optional[str] = None
+    secondary_authority: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ViolationText:
+    """Free text of one violation, kept apart from its record (see module docstring)."""
+
+    description_en: Optional[str] = None
+    description_bn: Optional[str] = None
+    description_raw: Optional[str] = None
+    # relevant_text_excerpt per legal reference, aligned with ViolationRecord.legal_references
+    excerpts: Tuple[Optional[str], ...] = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in ViolationRecord.TEXT else default
+
+
+def _enforcement(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return _UNMODELLED
+    values, _ = Enforcement._convert(value)
+    return Enforcement(**values)
+
+
+def _legal_refs(value: Any) -> Any:
+    # Converted to LegalReferences by ViolationRecord.from_json (excerpts go to ViolationText).
+    if not isinstance(value, list) or not all(isinstance(x, dict) for x in value):
+        return _UNMODELLED
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ViolationRecord(_Record):
+    """A canonical violation or DIFE checklist (micro) entry.
+
+    `violation_id` is `violation_id` or `micro_violation_id`; `legal_references` is
+    `legal_references` or `legal_references_enriched`.
+    """
+
+    FIELDS: ClassVar[Dict[str, Tuple[str, Callable[[Any], Any]]]] = {
+        "violation_id": ("violation_id", _sym),
+        "micro_violation_id": ("violation_id", _sym),
+        "display_name_en": ("display_name_en", _freeze),
+        "display_name_bn": ("display_name_bn", _freeze),
+        "category": ("category", _sym),
+        "severity": ("severity", _sym),
+        "affected_parties": ("affected_parties", _syms),
+        "visual_indicators": ("visual_indicators", _freeze),
+        "legal_references": ("legal_references", _legal_refs),
+        "legal_references_enriched": ("legal_references", _legal_refs),
+        "penalty_profiles": ("penalty_profiles", _syms),
+        "enforcement": ("enforcement", _enforcement),
+        "mapping_strategy": ("mapping_strategy", _sym),
+        "model_relevance": ("model_relevance", _sym),
+        "parent_violation_id": ("parent_violation_id", _sym),
+        "notes": ("notes", _sym),
+        # DIFE checklist entries
+        "micro_code": ("micro_code", _sym),
+        "inspection_domain": ("inspection_domain", _sym),
+        "source_type": ("source_type", _sym),
+        "confidence_level": ("confidence_level", _sym),
+        "recommended_action_hint": ("recommended_action_hint", _freeze),
+    }
+    TEXT: ClassVar[frozenset] = frozenset(("description_en", "description_bn", "description_raw"))
+
+    layout: Tuple[str, ...]
+    extra: Extra = ()
+    violation_id: Optional[str] = None
+    display_name_en: Optional[str] = None
+    display_name_bn: Optional[str] = None
+    category: Optional[str] = None
+    severity: Optional[str] = None
+    affected_parties: Any = None
+    visual_indicators: Any = None
+    legal_references: Tuple[LegalReference, ...] = ()
+    penalty_profiles: Any = None
+    enforcement: Optional[Enforcement] = None
+    mapping_strategy: Optional[str] = None
+    model_relevance: Optional[str] = None
+    parent_violation_id: Optional[str] = None
+    notes: Optional[str] = None
+    micro_code: Optional[str] = None
+    inspection_domain: Optional[str] = None
+    source_type: Optional[str] = None
+    confidence_level: Optional[str] = None
+    recommended_action_hint: Any = None
+
+    @property
+    def kind(self) -> str:
+        return "micro" if "micro_violation_id" in self.layout else "canonical"
+
+    @classmethod
+    def from_json(cls, obj: JsonObj) -> Tuple["ViolationRecord", ViolationText]:
+        values, text = cls._convert(obj)
+        refs: List[LegalReference] = []
+        excerpts: List[Optional[str]] = []
+        for ref in values.get("legal_references", ()):
+            ref_values, ref_text = LegalReference._convert(ref)
+            refs.append(LegalReference(**ref_values))
+            excerpts.append(ref_text.get("relevant_text_excerpt"))
+        values["legal_references"] = tuple(refs)
+        return cls(**values), ViolationText(**text, excerpts=tuple(excerpts))
+
+    def _json_value(self, key: str, text: Any) -> Any:
+        attr = self.FIELDS[key][0]
+        if attr == "legal_references" and isinstance(text, ViolationText):
+            return [r.to_json({"relevant_text_excerpt": x}) for r, x in zip(self.legal_references, text.excerpts)]
+        return _thaw(getattr(self, attr))
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.services.law_matcher import LawMatcher
+
+logger = logging.getLogger("constructsafe.kb")
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_BACKEND_DIR = _PROJECT_ROOT / "backend"
+_DEFAULT_PATH = _BACKEND_DIR / "data" / "laws.json"
+
+
+def resolve_laws_path(configured: Optional[str] = None) -> Path:
+    """LAWS_JSON_PATH: absolute, or relative to the project root (or backend/); default backend/data/laws.json."""
+    raw = (configured if configured is not None else getattr(settings, "LAWS_JSON_PATH", "")) or ""
+    if raw:
+        p = Path(raw)
+        if p.is_absolute():
+            return p
+        for base in (_PROJECT_ROOT, _BACKEND_DIR):
+            if (base / p).exists():
+                return base / p
+    return _DEFAULT_PATH
+
+
+@dataclass(frozen=True, eq=False)
+class KnowledgeBase:
+    """An immutable, fully indexed laws.json snapshot.
+
+    Requests take one snapshot at the start and use it throughout, so a reload never
+    changes the data under an in-flight request.
+    """
+
+    version: str  # short content hash; used in cache keys and (later) ETags
+    content_hash: str  # sha256 of the file bytes
+    law_matcher: LawMatcher
+    source_path: str
+    loaded_at: float
+    build_ms: float
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "content_hash": self.content_hash,
+            "source_path": self.source_path,
+            "loaded_at": self.loaded_at,
+            "build_ms": round(self.build_ms, 1),
+            "violations": len(self.law_matcher.get_all_violation_types()),
+        }
+
+
+def build_knowledge_base(
+    path: Path, warmers: Tuple[Callable[[KnowledgeBase], None], ...] = (), *, pause_s: float = 0.0
+) -> KnowledgeBase:
+    """Read, hash, parse and index laws.json, then run warmers (all off the request path).
+
+    With `pause_s`, sleeps that long after each step (parse, index, every warmer), releasing
+    the GIL so requests served meanwhile run uncontended between steps.
+    """
+    t0 = time.perf_counter()
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    doc = json.loads(data)
+    if pause_s:
+        time.sleep(pause_s)
+    kb = KnowledgeBase(
+        version=digest[:16],
+        content_hash=digest,
+        law_matcher=LawMatcher(data=doc),
+        source_path=str(path),
+        loaded_at=time.time(),
+        build_ms=0.0,
+    )
+    for warm in warmers:
+        if pause_s:
+            time.sleep(pause_s)
+        warm(kb)
+    object.__setattr__(kb, "build_ms", (time.perf_counter() - t0) * 1000.0)
+    return kb
+
+
+class KBRegistry:
+    """Holds the current KnowledgeBase and swaps in new versions atomically.
+
+    - `current()` is a plain attribute read (lock-free on the request path); the first call
+      loads synchronously.
+    - `reload()` builds the next snapshot in a background thread and swaps the reference
+      only when indexes and warmers are done; an identical content hash is a no-op and a
+      broken file keeps the current version (see `status()["last_error"]`). The build is
+      CPU-bound and shares the GIL with request handling, so it yields between steps
+      (KB_RELOAD_PAUSE_MS).
+    - `start_watcher()` polls the file's mtime/size and reloads on change.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or resolve_laws_path()
+        self._current: Optional[KnowledgeBase] = None
+        self._init_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._warmers: List[Callable[[KnowledgeBase], None]] = []
+        self._stat: Optional[Tuple[int, int]] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._reload_thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+
+    def add_warmer(self, fn: Callable[[KnowledgeBase], None]) -> None:
+        """Called with each new snapshot before it becomes current (precompute caches here)."""
+        self._warmers.append(fn)
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def current(self) -> KnowledgeBase:
+        kb = self._current
+        if kb is not None:
+            return kb
+        with self._init_lock:
+            if self._current is None:
+                self._stat = self._file_stat()
+                self._current = build_knowledge_base(self.path, tuple(self._warmers))
+                logger.info("Loaded KB %s from %s", self._current.version, self.path)
+            return self._current
+
+    def _reload_now(self, force: bool) -> bool:
+        with self._reload_lock:
+            # Record the stat first: a half-written file is retried on its next change, not every poll.
+            self._stat = self._file_stat()
+            try:
+                kb = build_knowledge_base(
+                    self.path, tuple(self._warmers), pause_s=max(0, settings.KB_RELOAD_PAUSE_MS) / 1000.0
+                )
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error("KB reload failed, keeping %s: %s", self._current and self._current.version, e)
+                return False
+            self.last_error = None
+            old = self._current
+            if old is not None and old.content_hash == kb.content_hash and not force:
+                return False
+            self._current = kb  # atomic reference swap
+            self.reloads += 1
+            logger.info("KB swapped %s -> %s (%.0f ms)", old and old.version, kb.version, kb.build_ms)
+            return True
+
+    def reload(self, *, force: bool = False, wait: bool = False) -> Dict[str, Any]:
+        """Start a background reload (or run it inline with wait=True); returns status."""
+        self.current()
+        if wait:
+            swapped = self._reload_now(force)
+            return {**self.status(), "swapped": swapped}
+
+        t = self._reload_thread
+        if t is None or not t.is_alive():
+            t = threading.Thread(target=self._reload_now, args=(force,), name="constructsafe-kb-reload", daemon=True)
+            self._reload_thread = t
+            t.start()
+        return {**self.status(), "reload_started": True}
+
+    def _watch(self, interval_s: float) -> None:
+        me = threading.current_thread()
+        while not self._stop.wait(interval_s) and self._watcher is me:
+            stat = self._file_stat()
+            if stat is not None and stat != self._stat:
+                self._reload_now(force=False)
+
+    def start_watcher(self, interval_s: float) -> None:
+        if interval_s <= 0 or self._watcher is not None:
+            return
+        self.current()
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval_s,), name="constructsafe-kb-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        kb = self._current
+        return {
+            "current": kb.info() if kb is not None else None,
+            "reloads": self.reloads,
+            "reloading": bool(self._reload_thread and self._reload_thread.is_alive()),
+            "watching": self._watcher is not None,
+            "last_error": self.last_error,
+        }
+
+
+kb_registry = KBRegistry()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Dict, Optional
+
+from backend.services.kb_registry import KnowledgeBase
+from backend.utils.fast_json import dumps
+from backend.utils.http_cache import PreEncodedBody
+
+
+class KBResponses:
+    """Pre-encoded bodies for the static /laws endpoints of one KB snapshot.
+
+    Built once per snapshot (as a KB warmer, off the request path): the violations list,
+    the catalog facets, every violation detail and every authority, each with ETag and
+    gzip/br variants.
+    """
+
+    def __init__(self, kb: KnowledgeBase) -> None:
+        lm = kb.law_matcher
+        self.kb_version = kb.version
+        self.violations_list = PreEncodedBody.build(dumps({"violations": lm.get_all_violation_types()}))
+        self.catalog_facets = PreEncodedBody.build(
+            dumps({"facets": lm.catalog_facets(), "fields": list(lm.catalog_fields())})
+        )
+        self.violations: Dict[str, PreEncodedBody] = {}
+        for vid in lm.get_all_violation_types():
+            details = lm.get_violation_details(vid)
+            if details:
+                self.violations[vid] = PreEncodedBody.build(dumps(details))
+        # Plain encoded penalty profiles: only embedded in batch responses.
+        self.penalties: Dict[str, bytes] = {}
+        for pid in lm.get_all_penalty_profile_ids():
+            self.penalties[pid] = dumps(lm.get_penalty_profile(pid))
+        self.authorities: Dict[str, PreEncodedBody] = {}
+        for aid in lm.get_all_authority_ids():
+            info = lm.get_authority_info(aid)
+            if info:
+                self.authorities[aid] = PreEncodedBody.build(dumps(info))
+
+    def violation(self, violation_id: str) -> Optional[PreEncodedBody]:
+        return self.violations.get((violation_id or "").strip())
+
+    def authority(self, authority_id: str) -> Optional[PreEncodedBody]:
+        return self.authorities.get((authority_id or "").strip())
+
+
+_by_kb: "weakref.WeakKeyDictionary[KnowledgeBase, KBResponses]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def kb_responses(kb: KnowledgeBase) -> KBResponses:
+    """Pre-encoded bodies for `kb` (built on first use if the warmer hasn't run)."""
+    r = _by_kb.get(kb)
+    if r is None:
+        with _lock:
+            r = _by_kb.get(kb)
+            if r is None:
+                r = KBResponses(kb)
+                _by_kb[kb] = r
+    return r
@@ -4,12 +4,21 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from backend.services.kb_records import ViolationRecord, ViolationText, json_value
+from backend.utils.text import tokenize
 
 
 JsonObj = Dict[str, Any]
 JsonCollection = Union[List[Any], Dict[str, Any], None]
 
+# Top-level laws.json sections converted to ViolationRecords (the raw lists are not kept)
+VIOLATION_SECTIONS: Tuple[str, ...] = ("canonical_violations", "micro_violations")
+
+# Catalog filters backed by secondary indexes (facet -> normalized value -> sorted IDs)
+CATALOG_FACETS: Tuple[str, ...] = ("kind", "category", "severity", "authority", "source_id")
+
 
 @dataclass(frozen=True)
 class ClauseMatch:
@@ -44,21 +53,40 @@ class LawMatcher:
       - get_violation()
     """
 
-    def __init__(self, laws_file: str = "data/laws.json", laws_path: Optional[str] = None):
-        filepath = laws_path or laws_file
-        self._raw: JsonObj = self._load_laws(filepath)
-
-        # Index violations (canonical + micro)
-        self._violations_index: Dict[str, JsonObj] = {}
+    def __init__(
+        self,
+        laws_file: str = "data/laws.json",
+        laws_path: Optional[str] = None,
+        data: Optional[JsonObj] = None,
+    ):
+        # `data`: an already-parsed laws.json document (the KB registry hashes and parses once)
+        if data is not None:
+            if not isinstance(data, dict):
+                raise ValueError("laws.json root must be a JSON object")
+            self._raw: JsonObj = data
+        else:
+            self._raw = self._load_laws(laws_path or laws_file)
+
+        # Index violations (canonical + micro) as compact records; free text kept alongside
+        self._violations_index: Dict[str, ViolationRecord] = {}
+        self._violation_text: Dict[str, ViolationText] = {}
         for v in self._iter_dict_items(self._raw.get("canonical_violations")):
             vid = v.get("violation_id")
             if isinstance(vid, str) and vid.strip():
-                self._violations_index[vid.strip()] = v
+                self._add_violation(vid.strip(), v)
 
+        # DIFE checklist entries are keyed by micro_violation_id
+        self._micro_ids: set = set()
         for v in self._iter_dict_items(self._raw.get("micro_violations")):
-            vid = v.get("violation_id")
-            if isinstance(vid, str) and vid.strip():
-                self._violations_index[vid.strip()] = v
+            vid = v.get("micro_violation_id") or v.get("violation_id")
+            if isinstance(vid, str) and vid.strip() and vid.strip() not in self._violations_index:
+                self._add_violation(vid.strip(), v)
+                self._micro_ids.add(vid.strip())
+        self._raw = {k: v for k, v in self._raw.items() if k not in VIOLATION_SECTIONS}
+
+        self._sorted_ids: Tuple[str, ...] = tuple(sorted(self._violations_index))
+        self._build_catalog_indexes()
+        self._build_taxonomy()
 
         # Authorities (normalize weird keys like "ju   urisdiction")
         self._authorities_index: Dict[str, JsonObj] = {}
@@ -92,8 +120,6 @@ class LawMatcher:
         if isinstance(cl, list):
             self._clause_library = [x for x in cl if isinstance(x, dict)]
 
-        # Tokenization helper
-        self._word_re = re.compile(r"[a-z0-9]+")
 
     # ---------------------------------------------------------------------
     # Internal helpers
@@ -111,6 +137,11 @@ class LawMatcher:
             raise ValueError("laws.json root must be a JSON object")
         return data
 
+    def _add_violation(self, vid: str, v: JsonObj) -> None:
+        record, text = ViolationRecord.from_json(v)
+        self._violations_index[vid] = record
+        self._violation_text[vid] = text
+
     def _iter_dict_items(self, value: JsonCollection) -> Iterable[JsonObj]:
         if isinstance(value, list):
             for x in value:
@@ -125,9 +156,110 @@ class LawMatcher:
         return
 
     def _tokenize(self, text: str) -> List[str]:
-        if not text:
-            return []
-        return self._word_re.findall(text.lower())
+        # English + Bengali, normalized and stemmed (shared with the search index)
+        return tokenize(text)
+
+    @staticmethod
+    def _facet_key(value: Any) -> str:
+        # Categories come in mixed case ("PPE" / "ppe"); filters match case-insensitively.
+        return " ".join(value.split()).casefold() if isinstance(value, str) else ""
+
+    def _facet_values(self, facet: str, v: ViolationRecord) -> List[str]:
+        if facet == "category":
+            return [self._facet_key(v.category)]
+        if facet == "severity":
+            return [self._facet_key(v.severity)]
+        if facet == "authority":
+            # "RAJUK/DNCC/DSCC/DIFE (context-dependent)" -> rajuk, dncc, dscc, dife
+            enf = v.enforcement
+            if enf is None:
+                return []
+            out: List[str] = []
+            for raw in (enf.primary_authority, enf.secondary_authority):
+                if isinstance(raw, str):
+                    raw = re.sub(r"\(.*?\)", " ", raw)
+                    out.extend(self._facet_key(x) for x in re.split(r"[/,;&]", raw))
+            return out
+        if facet == "source_id":
+            return [self._facet_key(lr.source_id) for lr in v.legal_references]
+        if facet == "kind":
+            return [v.kind]
+        return []
+
+    def _build_catalog_indexes(self) -> None:
+        index: Dict[str, Dict[str, List[str]]] = {f: {} for f in CATALOG_FACETS}
+        fields: set = set()
+        for vid in self._sorted_ids:  # sorted, so every posting list is sorted too
+            v = self._violations_index[vid]
+            fields.update(v.layout)
+            for facet in CATALOG_FACETS:
+                for key in dict.fromkeys(self._facet_values(facet, v)):
+                    if key:
+                        index[facet].setdefault(key, []).append(vid)
+        self._catalog_ids: Dict[str, Dict[str, Tuple[str, ...]]] = {
+            f: {k: tuple(ids) for k, ids in sorted(by_key.items())} for f, by_key in index.items()
+        }
+        self._catalog_sets: Dict[str, Dict[str, FrozenSet[str]]] = {
+            f: {k: frozenset(ids) for k, ids in by_key.items()} for f, by_key in self._catalog_ids.items()
+        }
+        self._catalog_fields: Tuple[str, ...] = tuple(sorted(fields))
+
+    def _build_taxonomy(self) -> None:
+        """Parent/child adjacency, ancestor closure, levels and subtrees from parent_violation_id.
+
+        A parent that isn't a known violation, or an edge that would close a cycle, is
+        ignored (the entry becomes a root). Subtrees are slices of one preorder walk.
+        """
+        parent: Dict[str, str] = {}
+        for vid in self._sorted_ids:
+            p = self._violations_index[vid].parent_violation_id
+            if isinstance(p, str) and p.strip() in self._violations_index and p.strip() != vid:
+                parent[vid] = p.strip()
+
+        # Ancestors, nearest first; resolved once per chain.
+        ancestors: Dict[str, Tuple[str, ...]] = {}
+        for vid in self._sorted_ids:
+            chain: List[str] = []
+            seen: set = set()
+            cur: Optional[str] = vid
+            while cur is not None and cur not in ancestors:
+                if cur in seen:
+                    del parent[chain[-1]]  # cycle: cut the closing edge
+                    cur = None
+                    break
+                chain.append(cur)
+                seen.add(cur)
+                cur = parent.get(cur)
+            base: Tuple[str, ...] = () if cur is None else (cur, *ancestors[cur])
+            for node in reversed(chain):
+                ancestors[node] = base
+                base = (node, *base)
+
+        children: Dict[str, List[str]] = {}
+        for vid in self._sorted_ids:  # sorted, so every child list is sorted too
+            if vid in parent:
+                children.setdefault(parent[vid], []).append(vid)
+
+        order: List[str] = []
+        span: Dict[str, Tuple[int, int]] = {}
+        for root in (vid for vid in self._sorted_ids if vid not in parent):
+            stack: List[Tuple[str, bool]] = [(root, False)]
+            while stack:
+                node, done = stack.pop()
+                if done:
+                    span[node] = (span[node][0], len(order))
+                    continue
+                span[node] = (len(order), -1)
+                order.append(node)
+                stack.append((node, True))
+                stack.extend((c, False) for c in reversed(children.get(node, ())))
+
+        self._parent: Dict[str, str] = parent
+        self._ancestors: Dict[str, Tuple[str, ...]] = ancestors
+        self._children: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in children.items()}
+        self._subtrees: Dict[str, Tuple[str, ...]] = {vid: tuple(order[a:b]) for vid, (a, b) in span.items()}
+        self._taxonomy_roots: Tuple[str, ...] = tuple(vid for vid in self._sorted_ids if vid not in parent)
+        self._model_ids: Dict[Tuple[str, int], Tuple[Tuple[str, ...], FrozenSet[str]]] = {}
 
     @staticmethod
     def _normalize_authority(a: JsonObj) -> JsonObj:
@@ -237,11 +369,166 @@ class LawMatcher:
     def get_all_violation_types(self) -> List[str]:
         return sorted(self._violations_index.keys())
 
+    def get_all_authority_ids(self) -> List[str]:
+        return sorted(self._authorities_index.keys())
+
+    def catalog_ids(self, filters: Optional[Dict[str, Optional[str]]] = None) -> Tuple[str, ...]:
+        """
+        Sorted violation IDs matching every given facet filter (see CATALOG_FACETS).
+
+        Walks the smallest posting list and checks membership in the others, so the
+        cost follows the result size, not the number of violations.
+        """
+        active = [(f, self._facet_key(val)) for f, val in (filters or {}).items() if val]
+        if not active:
+            return self._sorted_ids
+        postings: List[Tuple[str, ...]] = []
+        sets: List[FrozenSet[str]] = []
+        for facet, key in active:
+            if facet not in self._catalog_ids:
+                raise ValueError(f"Unknown catalog filter: {facet}")
+            ids = self._catalog_ids[facet].get(key)
+            if not ids:
+                return ()
+            postings.append(ids)
+            sets.append(self._catalog_sets[facet][key])
+        smallest = min(range(len(postings)), key=lambda i: len(postings[i]))
+        others = [s for i, s in enumerate(sets) if i != smallest]
+        if not others:
+            return postings[smallest]
+        return tuple(vid for vid in postings[smallest] if all(vid in s for s in others))
+
+    def catalog_facets(self) -> Dict[str, Dict[str, int]]:
+        """Filter values with their violation counts, per facet."""
+        return {f: {k: len(ids) for k, ids in by_key.items()} for f, by_key in self._catalog_ids.items()}
+
+    def catalog_index(self) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+        """Sorted violation IDs per facet value (the posting lists behind catalog_ids)."""
+        return self._catalog_ids
+
+    def catalog_fields(self) -> Tuple[str, ...]:
+        """Top-level violation fields available for catalog projection."""
+        return self._catalog_fields
+
+    # ── Taxonomy (parent_violation_id) ──
+
+    def parent_of(self, violation_id: str) -> Optional[str]:
+        return self._parent.get((violation_id or "").strip())
+
+    def children_of(self, violation_id: str) -> Tuple[str, ...]:
+        return self._children.get((violation_id or "").strip(), ())
+
+    def ancestors_of(self, violation_id: str) -> Tuple[str, ...]:
+        """Ancestor IDs, nearest first (empty for roots and unknown IDs)."""
+        return self._ancestors.get((violation_id or "").strip(), ())
+
+    def taxonomy_level(self, violation_id: str) -> int:
+        """0 for roots, 1 for their children, ..."""
+        return len(self.ancestors_of(violation_id))
+
+    def subtree(self, violation_id: str) -> Tuple[str, ...]:
+        """The violation and all its descendants in preorder (children sorted); () if unknown."""
+        return self._subtrees.get((violation_id or "").strip(), ())
+
+    def taxonomy_roots(self) -> Tuple[str, ...]:
+        return self._taxonomy_roots
+
+    def rollup_target(self, violation_id: str, level: int = 0) -> Optional[str]:
+        """The violation's ancestor at `level` (itself if it sits at or above it); None if unknown."""
+        vid = (violation_id or "").strip()
+        anc = self._ancestors.get(vid)
+        if anc is None:
+            return None
+        depth = len(anc)
+        return vid if level >= depth else anc[depth - 1 - max(0, level)]
+
+    def rollup(self, violation_ids: Iterable[str], level: int = 0) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Group detected IDs under their ancestor at `level`: ({target: [detected, ...]}, unknown IDs).
+
+        Duplicates are kept (each detection counts); unknown IDs are returned separately.
+        """
+        groups: Dict[str, List[str]] = {}
+        unknown: List[str] = []
+        for raw in violation_ids:
+            target = self.rollup_target(raw, level)
+            if target is None:
+                unknown.append(raw)
+            else:
+                groups.setdefault(target, []).append((raw or "").strip())
+        return groups, unknown
+
+    def model_ids(self, relevance: str = "vision", max_level: int = -1) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+        """IDs offered to a model: violations tagged `model_relevance == relevance`, as-is or,
+        with `max_level` >= 0, those deeper replaced by their ancestor at that level. Sorted
+        IDs + a set for membership checks; computed once per (relevance, max_level) and snapshot.
+        """
+        key = (relevance, max_level)
+        cached = self._model_ids.get(key)
+        if cached is None:
+            ids = {
+                (self.rollup_target(vid, max_level) if max_level >= 0 else None) or vid
+                for vid, v in self._violations_index.items()
+                if v.model_relevance == relevance
+            }
+            cached = (tuple(sorted(ids)), frozenset(ids))
+            self._model_ids[key] = cached
+        return cached
+
+    def is_micro_violation(self, violation_id: str) -> bool:
+        return (violation_id or "").strip() in self._micro_ids
+
+    def get_clause_library(self) -> List[JsonObj]:
+        return self._clause_library
+
+    def get_source_catalog(self) -> List[JsonObj]:
+        return [x for x in self._iter_dict_items(self._raw.get("source_catalog")) if x.get("source_id")]
+
     def get_violation_details(self, violation_id: str) -> Optional[JsonObj]:
+        """The violation's laws.json object (rebuilt from its record; for API responses)."""
+        if not violation_id:
+            return None
+        key = violation_id.strip()
+        v = self._violations_index.get(key)
+        return v.to_json(self._violation_text.get(key)) if v is not None else None
+
+    def get_violation_record(self, violation_id: str) -> Optional[ViolationRecord]:
         if not violation_id:
             return None
         return self._violations_index.get(violation_id.strip())
 
+    def violation_fields(self, violation_id: str, fields: Iterable[str]) -> JsonObj:
+        """Selected top-level fields of a violation in JSON form (None for missing ones)."""
+        key = (violation_id or "").strip()
+        v = self._violations_index.get(key)
+        if v is None:
+            return {f: None for f in fields}
+        text = self._violation_text.get(key)
+        return {f: v.get(f, text) for f in fields}
+
+    def authority_ids_for(self, violation_id: str) -> List[str]:
+        """Known authority IDs named in a violation's enforcement block (composites split)."""
+        v = self.get_violation_record(violation_id)
+        if not v:
+            return []
+        by_key = {self._facet_key(aid): aid for aid in self._authorities_index}
+        return [by_key[k] for k in dict.fromkeys(self._facet_values("authority", v)) if k in by_key]
+
+    def penalty_profile_ids_for(self, violation_id: str) -> List[str]:
+        """IDs of the shared penalty profiles a violation references."""
+        v = self.get_violation_record(violation_id)
+        if not v:
+            return []
+        refs = [p.strip() for p in (v.penalty_profiles or ()) if isinstance(p, str)]
+        return [pid for pid in dict.fromkeys(refs) if pid in self._penalties_index]
+
+    def get_penalty_profile(self, penalty_profile_id: str) -> Optional[JsonObj]:
+        if not penalty_profile_id:
+            return None
+        return self._penalties_index.get(penalty_profile_id.strip())
+
+    def get_all_penalty_profile_ids(self) -> List[str]:
+        return sorted(self._penalties_index.keys())
+
     def get_authority_info(self, authority_id: str) -> Optional[JsonObj]:
         if not authority_id:
             return None
@@ -281,19 +568,18 @@ class LawMatcher:
             return None
 
         laws: List[JsonObj] = []
-        for lr in (v.get("legal_references") or []):
-            if isinstance(lr, dict):
-                laws.append(
-                    {
-                        "source_id": lr.get("source_id"),
-                        "citation": lr.get("citation"),
-                        "interpretation": lr.get("interpretation"),
-                        "confidence": lr.get("confidence"),
-                    }
-                )
+        for lr in v.legal_references:
+            laws.append(
+                {
+                    "source_id": lr.source_id,
+                    "citation": lr.citation,
+                    "interpretation": lr.interpretation,
+                    "confidence": lr.confidence,
+                }
+            )
 
         penalties: List[JsonObj] = []
-        for item in (v.get("penalty_profiles") or []):
+        for item in (json_value(v.penalty_profiles) or []):
             if isinstance(item, str):
                 pid = item.strip()
                 p = self._penalties_index.get(pid)
@@ -308,18 +594,18 @@ class LawMatcher:
                     penalties.append(self._normalize_penalty_profile("UNKNOWN", item))
 
         recommended: List[str] = []
-        enf = v.get("enforcement")
-        if isinstance(enf, dict):
-            pa = enf.get("primary_authority")
+        enf = v.enforcement
+        if enf is not None:
+            pa = enf.primary_authority
             if isinstance(pa, str) and pa.strip():
                 recommended.append(f"Notify/coordinate with: {pa.strip()}")
 
         return {
-            "violation_id": v.get("violation_id"),
-            "display_name_en": v.get("display_name_en"),
-            "display_name_bn": v.get("display_name_bn"),
-            "category": v.get("category"),
-            "severity": v.get("severity"),
+            "violation_id": key,
+            "display_name_en": v.display_name_en,
+            "display_name_bn": v.display_name_bn,
+            "category": v.category,
+            "severity": v.severity,
             "laws": laws,
             "penalties": penalties,
             "recommended_actions": recommended,
@@ -402,10 +688,10 @@ class LawMatcher:
             out.append(
                 {
                     "violation_id": vid,
-                    "display_name_en": v.get("display_name_en"),
-                    "display_name_bn": v.get("display_name_bn"),
-                    "category": v.get("category"),
-                    "severity": v.get("severity"),
+                    "display_name_en": v.display_name_en,
+                    "display_name_bn": v.display_name_bn,
+                    "category": v.category,
+                    "severity": v.severity,
                 }
             )
         out.sort(key=lambda x: str(x.get("violation_id", "")))
@@ -421,14 +707,15 @@ class LawMatcher:
         return self._match_violation_id(violation_type)
 
     def get_violation(self, violation_id: str) -> Optional[JsonObj]:
-        v = self.get_violation_details(violation_id)
+        v = self.get_violation_record(violation_id)
         if not v:
             return None
+        vid = violation_id.strip()
         return {
-            "violation_id": v.get("violation_id"),
-            "title": v.get("display_name_en") or v.get("display_name_bn") or v.get("violation_id"),
-            "display_name_en": v.get("display_name_en"),
-            "display_name_bn": v.get("display_name_bn"),
-            "category": v.get("category"),
-            "severity": v.get("severity"),
+            "violation_id": vid,
+            "title": v.display_name_en or v.display_name_bn or vid,
+            "display_name_en": v.display_name_en,
+            "display_name_bn": v.display_name_bn,
+            "category": v.category,
+            "severity": v.severity,
         }
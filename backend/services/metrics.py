@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds): sub-ms stages (cache lookup, enrichment) up to slow model calls.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_float(x: float) -> str:
+    if x == float("inf"):
+        return "+Inf"
+    return repr(float(x))
+
+
+class Counter:
+    """Monotonic counter with labels (Prometheus text exposition)."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, v in items:
+            lines.append(f"{self.name}{_fmt_labels(self.label_names, key)} {_fmt_float(v)}")
+        return lines
+
+
+@dataclass
+class _HistState:
+    counts: List[int]
+    total: float = 0.0
+    n: int = 0
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (Prometheus text exposition)."""
+
+    def __init__(
+        self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, _HistState] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            st = self._values.get(key)
+            if st is None:
+                st = _HistState(counts=[0] * (len(self.buckets) + 1))
+                self._values[key] = st
+            st.counts[idx] += 1
+            st.total += value
+            st.n += 1
+
+    def count(self, **labels: Any) -> int:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        st = self._values.get(key)
+        return st.n if st else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, _HistState(list(v.counts), v.total, v.n)) for k, v in self._values.items())
+        for key, st in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), st.counts):
+                cumulative += c
+                le = 'le="' + _fmt_float(bound) + '"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.label_names, key)} {_fmt_float(st.total)}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.label_names, key)} {st.n}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        m = Counter(name, help_text, labels)
+        self._metrics.append(m)
+        return m
+
+    def histogram(
+        self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        m = Histogram(name, help_text, labels, buckets)
+        self._metrics.append(m)
+        return m
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+REQUEST_SECONDS = metrics.histogram(
+    "constructsafe_request_seconds", "HTTP request latency until response start.", ("method", "route", "status")
+)
+STAGE_SECONDS = metrics.histogram(
+    "constructsafe_stage_seconds", "Per-stage latency inside /analyze.", ("stage", "mode")
+)
+CACHE_HITS = metrics.counter("constructsafe_cache_hits_total", "Analyze responses served from cache.", ("mode",))
+UPLOAD_HASH_HITS = metrics.counter(
+    "constructsafe_cache_upload_hash_hits_total",
+    "Cache hits found by the raw upload hash, before any image decoding.",
+    ("mode",),
+)
+CACHE_MISSES = metrics.counter("constructsafe_cache_misses_total", "Analyze cache lookups that missed.", ("mode",))
+RATE_LIMITED = metrics.counter("constructsafe_rate_limited_total", "Requests rejected with 429.", ("mode",))
+MODEL_ERRORS = metrics.counter("constructsafe_model_errors_total", "Vision model calls that failed.", ("mode",))
+
+
+# ---------------------------------------------------------------------
+# Per-request stage timings
+# ---------------------------------------------------------------------
+
+
+@dataclass
+class RequestTimings:
+    started: float = field(default_factory=time.perf_counter)
+    stages: List[Tuple[str, float]] = field(default_factory=list)
+    labels: Dict[str, str] = field(default_factory=dict)
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Stage name -> total ms (stages that ran more than once, e.g. per tile, are summed)."""
+        out: Dict[str, float] = {}
+        for name, seconds in self.stages:
+            out[name] = out.get(name, 0.0) + seconds * 1000.0
+        return out
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("constructsafe_request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def set_label(key: str, value: Any) -> None:
+    t = _current.get()
+    if t is not None:
+        t.labels[key] = str(value)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block; records into the request's timings and the stage histogram."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        t = _current.get()
+        mode = ""
+        if t is not None:
+            t.stages.append((name, dt))
+            mode = t.labels.get("mode", "")
+        STAGE_SECONDS.observe(dt, stage=name, mode=mode)
+
+
+class TimingMiddleware:
+    """Collects per-stage timings for each request and exposes them as headers.
+
+    Adds `Server-Timing` (browser devtools format) and `X-Timing` (stage=ms list) to the
+    response and records the request latency histogram.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._templates: Optional[List[Tuple[Any, str]]] = None
+
+    def _route_templates(self, scope: Any) -> List[Tuple[Any, str]]:
+        if self._templates is None:
+            from starlette.routing import compile_path
+
+            app = scope.get("app")
+            paths: List[str] = [getattr(r, "path_format", "") for r in getattr(app, "routes", [])]
+            try:
+                paths.extend(app.openapi().get("paths", {}).keys())
+            except Exception:
+                pass
+            self._templates = [(compile_path(p)[0], p) for p in dict.fromkeys(paths) if p]
+        return self._templates
+
+    def _route_label(self, scope: Any) -> str:
+        """Path template for the histogram label (bounded cardinality; never the raw path)."""
+        path = scope.get("path", "")
+        route = scope.get("route")
+        regex = getattr(route, "path_regex", None)
+        if regex is not None and regex.match(path):
+            return route.path
+        for regex, template in self._route_templates(scope):
+            if regex.match(path):
+                return template
+        return "unmatched"
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def timed_send(message: Any) -> None:
+            if message.get("type") == "http.response.start":
+                total = time.perf_counter() - timings.started
+                stages = timings.summary_ms()
+                server_timing = ", ".join(f"{k};dur={v:.2f}" for k, v in stages.items())
+                server_timing = (server_timing + ", " if server_timing else "") + f"total;dur={total * 1000:.2f}"
+                x_timing = ",".join(f"{k}={v:.2f}" for k, v in stages.items())
+                headers = list(message.get("headers") or [])
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                if x_timing:
+                    headers.append((b"x-timing", x_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+
+                REQUEST_SECONDS.observe(
+                    total,
+                    method=scope.get("method", ""),
+                    route=self._route_label(scope),
+                    status=message.get("status", 0),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from backend.config import settings
+from backend.services.metrics import current_timings
+from backend.utils.admin import ADMIN_HEADER, is_admin_token
+
+# One frame as (file basename, function, line); a stack is root -> leaf.
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+# How far back the sampler keeps raw samples; slower requests get a truncated profile.
+SAMPLE_WINDOW_S = 60.0
+MAX_STACK_DEPTH = 64
+TOP_N = 25
+
+
+@dataclass
+class RequestProfile:
+    id: int
+    kind: str  # "sampled" | "cprofile"
+    method: str
+    path: str
+    query: str
+    status: int
+    duration_ms: float
+    started_at: float
+    stages_ms: Dict[str, float] = field(default_factory=dict)
+    samples: int = 0
+    top_self: List[Dict[str, Any]] = field(default_factory=list)
+    top_cumulative: List[Dict[str, Any]] = field(default_factory=list)
+    folded: str = ""  # flamegraph.pl / speedscope "collapsed stacks"
+    stats_text: str = ""  # cProfile only: pstats report
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 2),
+            "started_at": self.started_at,
+            "samples": self.samples,
+            "stages_ms": {k: round(v, 2) for k, v in self.stages_ms.items()},
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            "top_self": self.top_self,
+            "top_cumulative": self.top_cumulative,
+            "folded": self.folded,
+            "stats_text": self.stats_text,
+        }
+
+
+class ProfileStore:
+    """Bounded ring buffer of captured profiles (oldest dropped first)."""
+
+    def __init__(self, maxlen: int) -> None:
+        self._lock = threading.Lock()
+        self._items: Deque[RequestProfile] = deque(maxlen=max(1, maxlen))
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._items.append(profile)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._items))
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            for p in self._items:
+                if p.id == profile_id:
+                    return p
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+def _walk(frame: Any) -> Stack:
+    out: List[Frame] = []
+    while frame is not None and len(out) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        out.append((os.path.basename(code.co_filename), code.co_name, frame.f_lineno))
+        frame = frame.f_back
+    out.reverse()
+    return tuple(out)
+
+
+class StackSampler:
+    """Samples the stacks of threads with requests in flight.
+
+    A single daemon thread wakes every `interval_s` while at least one request is running
+    and records (timestamp, thread id, stack) into a time-bounded deque. A slow request
+    later takes the samples of its own thread inside its [start, end] window.
+
+    Requests share the event-loop thread, so a window can include other requests'
+    coroutines; time spent waiting on the model/network shows up as the loop idling in
+    `selectors.select`.
+    """
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = max(0.001, interval_s)
+        maxlen = int(SAMPLE_WINDOW_S / self.interval_s)
+        self._samples: Deque[Tuple[float, int, Stack]] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._active: Dict[int, int] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    t = threading.Thread(target=self._run, name="constructsafe-profiler", daemon=True)
+                    t.start()
+                    self._thread = t
+
+    def begin(self, tid: int) -> None:
+        self._ensure_started()
+        with self._lock:
+            self._active[tid] = self._active.get(tid, 0) + 1
+        self._wake.set()
+
+    def end(self, tid: int) -> None:
+        with self._lock:
+            n = self._active.get(tid, 0) - 1
+            if n > 0:
+                self._active[tid] = n
+            else:
+                self._active.pop(tid, None)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                tids = [t for t in self._active if t != own]
+            if not tids:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            for tid in tids:
+                frame = frames.get(tid)
+                if frame is not None:
+                    self._samples.append((now, tid, _walk(frame)))
+            del frames
+            time.sleep(self.interval_s)
+
+    def window(self, tid: int, start: float, end: float) -> List[Stack]:
+        return [stack for ts, t, stack in list(self._samples) if t == tid and start <= ts <= end]
+
+
+def _frame_label(f: Frame) -> str:
+    return f"{f[0]}:{f[1]}"
+
+
+def summarize_stacks(stacks: List[Stack]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], str]:
+    """Top functions by self/cumulative samples plus folded stacks (one 'a;b;c count' per line)."""
+    self_counts: Dict[str, int] = {}
+    cum_counts: Dict[str, int] = {}
+    folded: Dict[str, int] = {}
+    for stack in stacks:
+        if not stack:
+            continue
+        labels = [_frame_label(f) for f in stack]
+        leaf = f"{labels[-1]}:{stack[-1][2]}"
+        self_counts[leaf] = self_counts.get(leaf, 0) + 1
+        for name in set(labels):
+            cum_counts[name] = cum_counts.get(name, 0) + 1
+        key = ";".join(labels)
+        folded[key] = folded.get(key, 0) + 1
+
+    total = max(1, len(stacks))
+
+    def top(counts: Dict[str, int]) -> List[Dict[str, Any]]:
+        items = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]
+        return [{"function": k, "samples": v, "pct": round(100.0 * v / total, 1)} for k, v in items]
+
+    folded_text = "\n".join(f"{k} {v}" for k, v in sorted(folded.items(), key=lambda kv: kv[1], reverse=True))
+    return top(self_counts), top(cum_counts), folded_text
+
+
+def _cprofile_report(prof: cProfile.Profile) -> Tuple[List[Dict[str, Any]], str]:
+    out = io.StringIO()
+    st = pstats.Stats(prof, stream=out)
+    st.sort_stats("cumulative").print_stats(40)
+    rows: List[Dict[str, Any]] = []
+    raw = getattr(st, "stats", {})
+    ranked = sorted(raw.items(), key=lambda kv: kv[1][3], reverse=True)[:TOP_N]
+    for (filename, line, func), (_cc, ncalls, tottime, cumtime, _callers) in ranked:
+        rows.append(
+            {
+                "function": f"{os.path.basename(filename)}:{func}:{line}",
+                "calls": ncalls,
+                "tottime_ms": round(tottime * 1000.0, 3),
+                "cumtime_ms": round(cumtime * 1000.0, 3),
+            }
+        )
+    return rows, out.getvalue()
+
+
+class RequestProfiler:
+    """Holds profiler settings, the sampler and the profile ring buffer."""
+
+    def __init__(self) -> None:
+        self.threshold_ms: float = float(getattr(settings, "SLOW_REQUEST_PROFILE_MS", 0) or 0)
+        interval_ms = float(getattr(settings, "PROFILE_SAMPLE_INTERVAL_MS", 5) or 5)
+        self.sampler = StackSampler(interval_ms / 1000.0)
+        self.store = ProfileStore(int(getattr(settings, "PROFILE_BUFFER_SIZE", 20) or 20))
+        # cProfile hooks are per thread and cannot nest: one explicit profile at a time.
+        self.cprofile_lock = threading.Lock()
+
+    @property
+    def sampling_enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+
+request_profiler = RequestProfiler()
+
+
+def _wants_profile(scope: Any) -> bool:
+    qs = parse_qs((scope.get("query_string") or b"").decode("latin-1"))
+    if (qs.get("profile") or [""])[0] not in ("1", "true", "yes"):
+        return False
+    for k, v in scope.get("headers") or []:
+        if k == ADMIN_HEADER.encode("latin-1"):
+            return is_admin_token(v.decode("latin-1"))
+    return False
+
+
+class ProfilerMiddleware:
+    """Captures request profiles into `request_profiler.store`.
+
+    - SLOW_REQUEST_PROFILE_MS > 0: every request is covered by the stack sampler; requests
+      slower than the threshold keep their samples as a "sampled" profile.
+    - `?profile=1` with a valid X-Admin-Token: the request runs under cProfile (one at a
+      time; concurrent asks fall back to sampling). The response carries `X-Profile-Id`.
+    """
+
+    def __init__(self, app: Any, profiler: Optional[RequestProfiler] = None) -> None:
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = self.profiler
+        explicit = _wants_profile(scope)
+        sampling = profiler.sampling_enabled or explicit
+        if not sampling:
+            await self.app(scope, receive, send)
+            return
+
+        prof: Optional[cProfile.Profile] = None
+        if explicit and profiler.cprofile_lock.acquire(blocking=False):
+            prof = cProfile.Profile()
+
+        profile_id = profiler.store.next_id() if explicit else 0
+        status = 0
+
+        async def profiled_send(message: Any) -> None:
+            nonlocal status
+            if message.get("type") == "http.response.start":
+                status = int(message.get("status", 0))
+                if explicit:
+                    headers = list(message.get("headers") or [])
+                    headers.append((b"x-profile-id", str(profile_id).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        tid = threading.get_ident()
+        started_wall = time.time()
+        t0 = time.perf_counter()
+        if prof is None:
+            profiler.sampler.begin(tid)
+        else:
+            prof.enable()
+        try:
+            await self.app(scope, receive, profiled_send)
+        finally:
+            t1 = time.perf_counter()
+            if prof is None:
+                profiler.sampler.end(tid)
+            else:
+                prof.disable()
+                profiler.cprofile_lock.release()
+
+            duration_ms = (t1 - t0) * 1000.0
+            if explicit or duration_ms >= profiler.threshold_ms:
+                timings = current_timings()
+                record = RequestProfile(
+                    id=profile_id or profiler.store.next_id(),
+                    kind="cprofile" if prof is not None else "sampled",
+                    method=scope.get("method", ""),
+                    path=scope.get("path", ""),
+                    query=(scope.get("query_string") or b"").decode("latin-1"),
+                    status=status,
+                    duration_ms=duration_ms,
+                    started_at=started_wall,
+                    stages_ms=timings.summary_ms() if timings is not None else {},
+                )
+                if prof is not None:
+                    record.top_cumulative, record.stats_text = _cprofile_report(prof)
+                else:
+                    stacks = profiler.sampler.window(tid, t0, t1)
+                    record.samples = len(stacks)
+                    record.top_self, record.top_cumulative, record.folded = summarize_stacks(stacks)
+                profiler.store.add(record)
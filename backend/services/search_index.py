@@ -0,0 +1,238 @@
+"""Unified multi-field text search over one knowledge-base snapshot.
+
+One inverted index covers canonical violations (English and Bengali fields), DIFE
+checklist (micro) entries and BNBC clauses; both languages go through the same tokenizer
+(backend/utils/text.py). Scoring is BM25F: per-field term frequencies are
+length-normalized, weighted (FIELD_WEIGHTS), summed and saturated, then multiplied by the
+term's IDF. All of that is computed when the index is built, so a query only walks the
+posting lists of its terms.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.services.law_matcher import LawMatcher
+from backend.utils.text import tokenize
+
+KINDS: Tuple[str, ...] = ("violation", "micro", "clause")
+
+# Field weights per document kind; a field missing from an entry simply contributes nothing.
+FIELD_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "violation": {
+        "display_name_en": 3.0,
+        "display_name_bn": 3.0,
+        "visual_indicators": 2.0,
+        "category": 1.5,
+        "description_en": 1.0,
+        "description_bn": 1.0,
+    },
+    "micro": {
+        "inspection_domain": 2.0,
+        "visual_indicators_hint": 2.0,
+        "legal_interpretation": 1.5,
+        "description_raw": 1.0,
+        "recommended_action_hint": 1.0,
+        "legal_citation": 0.5,
+    },
+    "clause": {
+        "title": 3.0,
+        "keywords": 2.5,
+        "relevant_text_excerpt": 1.0,
+        "citation": 0.5,
+    },
+}
+
+K1 = 1.2
+B = 0.75
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str
+    id: str
+    title: str
+    score: float
+    violation_ids: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "id": self.id,
+            "title": self.title,
+            "score": round(self.score, 4),
+            "violation_ids": list(self.violation_ids),
+        }
+
+
+@dataclass(frozen=True)
+class _Doc:
+    kind: str
+    id: str
+    title: str
+    violation_ids: Tuple[str, ...]
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return " ".join(x for x in value if isinstance(x, str))
+    return ""
+
+
+# laws.json fields each violation kind's documents are built from (see LawMatcher.violation_fields)
+_SOURCE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "violation": tuple(FIELD_WEIGHTS["violation"]),
+    "micro": (
+        "inspection_domain",
+        "micro_code",
+        "visual_indicators_hint",
+        "legal_references_enriched",
+        "description_raw",
+        "recommended_action_hint",
+    ),
+}
+
+
+def _violation_fields(v: Dict[str, Any]) -> Dict[str, str]:
+    return {f: _text(v.get(f)) for f in FIELD_WEIGHTS["violation"]}
+
+
+def _micro_fields(v: Dict[str, Any]) -> Dict[str, str]:
+    refs = [lr for lr in (v.get("legal_references_enriched") or []) if isinstance(lr, dict)]
+    return {
+        "inspection_domain": _text(v.get("inspection_domain")),
+        "visual_indicators_hint": _text(v.get("visual_indicators_hint")),
+        "legal_interpretation": " ".join(_text(lr.get("interpretation")) for lr in refs),
+        "description_raw": _text(v.get("description_raw")),
+        "recommended_action_hint": _text(v.get("recommended_action_hint")),
+        "legal_citation": " ".join(_text(lr.get("citation")) for lr in refs),
+    }
+
+
+def _clause_fields(c: Dict[str, Any]) -> Dict[str, str]:
+    return {f: _text(c.get(f)) for f in FIELD_WEIGHTS["clause"]}
+
+
+class SearchIndex:
+    """Precomputed BM25F inverted index: term -> ((doc, score), ...)."""
+
+    def __init__(self, docs: List[_Doc], postings: Dict[str, Tuple[Tuple[int, float], ...]]) -> None:
+        self._docs = docs
+        self._postings = postings
+
+    @classmethod
+    def build(cls, law_matcher: LawMatcher) -> "SearchIndex":
+        entries: List[Tuple[_Doc, Dict[str, str]]] = []
+        for vid in law_matcher.get_all_violation_types():
+            micro = law_matcher.is_micro_violation(vid)
+            v = law_matcher.violation_fields(vid, _SOURCE_FIELDS["micro" if micro else "violation"])
+            if micro:
+                domain = _text(v.get("inspection_domain")).replace("_", " ").title()
+                code = _text(v.get("micro_code"))
+                title = f"{domain} ({code})" if code else domain or vid
+                entries.append((_Doc("micro", vid, title, (vid,)), _micro_fields(v)))
+            else:
+                title = _text(v.get("display_name_en")) or vid
+                entries.append((_Doc("violation", vid, title, (vid,)), _violation_fields(v)))
+        for c in law_matcher.get_clause_library():
+            cid = _text(c.get("clause_id"))
+            if not cid:
+                continue
+            title = " — ".join(x for x in (_text(c.get("citation")), _text(c.get("title"))) if x)
+            mapped = tuple(x.strip() for x in (c.get("mapped_violation_ids") or []) if isinstance(x, str) and x.strip())
+            entries.append((_Doc("clause", cid, title or cid, mapped), _clause_fields(c)))
+
+        # Per-field token counts and average field lengths (per kind, as fields differ by kind).
+        tfs: List[Dict[str, Counter]] = []
+        lengths: Dict[Tuple[str, str], List[int]] = {}
+        for doc, fields in entries:
+            per_field = {}
+            for name, text in fields.items():
+                tokens = tokenize(text)
+                per_field[name] = Counter(tokens)
+                lengths.setdefault((doc.kind, name), []).append(len(tokens))
+            tfs.append(per_field)
+        avg = {k: (sum(v) / len(v)) or 1.0 for k, v in lengths.items()}
+
+        # BM25F pseudo term frequency per (term, doc).
+        weighted: Dict[str, Dict[int, float]] = {}
+        for i, ((doc, _), per_field) in enumerate(zip(entries, tfs)):
+            weights = FIELD_WEIGHTS[doc.kind]
+            for name, counts in per_field.items():
+                if not counts:
+                    continue
+                norm = 1.0 - B + B * (sum(counts.values()) / avg[(doc.kind, name)])
+                w = weights.get(name, 1.0) / norm
+                for term, tf in counts.items():
+                    by_doc = weighted.setdefault(term, {})
+                    by_doc[i] = by_doc.get(i, 0.0) + w * tf
+
+        n = len(entries)
+        postings: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+        for term, by_doc in weighted.items():
+            idf = math.log(1.0 + (n - len(by_doc) + 0.5) / (len(by_doc) + 0.5))
+            postings[term] = tuple((i, idf * tf / (K1 + tf)) for i, tf in sorted(by_doc.items()))
+        return cls([doc for doc, _ in entries], postings)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def export(self) -> Dict[str, Any]:
+        """Documents and posting lists as JSON-ready lists (for the offline KB bundle)."""
+        return {
+            "docs": [[d.kind, d.id, d.title, list(d.violation_ids)] for d in self._docs],
+            "postings": {term: [[i, round(score, 6)] for i, score in posts] for term, posts in self._postings.items()},
+        }
+
+    def search(self, query: str, top_k: int = 10, kinds: Optional[Iterable[str]] = None) -> List[SearchHit]:
+        """Top `top_k` documents for `query`, optionally restricted to some KINDS."""
+        acc: Dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            for i, score in self._postings.get(term, ()):
+                acc[i] = acc.get(i, 0.0) + score
+        if not acc:
+            return []
+        allowed = frozenset(kinds) if kinds else None
+        docs = self._docs
+        candidates: Iterable[Tuple[int, float]] = acc.items()
+        if allowed is not None:
+            candidates = ((i, s) for i, s in candidates if docs[i].kind in allowed)
+        best = heapq.nlargest(max(1, top_k), candidates, key=lambda kv: kv[1])
+        return [SearchHit(docs[i].kind, docs[i].id, docs[i].title, s, docs[i].violation_ids) for i, s in best]
+
+
+_by_matcher: "weakref.WeakKeyDictionary[LawMatcher, SearchIndex]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def search_index(law_matcher: LawMatcher) -> SearchIndex:
+    """The index for `law_matcher` (built on first use if the KB warmer hasn't run)."""
+    idx = _by_matcher.get(law_matcher)
+    if idx is None:
+        with _lock:
+            idx = _by_matcher.get(law_matcher)
+            if idx is None:
+                idx = SearchIndex.build(law_matcher)
+                _by_matcher[law_matcher] = idx
+    return idx
+
+
+def validate_kinds(kinds: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    if not kinds:
+        return None
+    unknown = [k for k in kinds if k not in KINDS]
+    if unknown:
+        raise ValueError(f"Unknown kind(s): {', '.join(unknown)}. Expected: {', '.join(KINDS)}")
+    return tuple(kinds)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import math
 import threading
 import time
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, timedelta
 from typing import Dict, Tuple
 
 from fastapi import HTTPException, Request
@@ -21,6 +22,12 @@ class _IpState:
     day_count: int
 
 
+def _seconds_until_tomorrow(now: float) -> int:
+    # Same calendar as the daily reset (date.today(), local time).
+    midnight = datetime.combine(date.fromtimestamp(now) + timedelta(days=1), datetime.min.time())
+    return max(1, math.ceil(midnight.timestamp() - now))
+
+
 class UsageLimiter:
     """Simple per-IP limiter.
 
@@ -73,6 +80,7 @@ class UsageLimiter:
                         "message": "Too many requests from this IP. Try again shortly.",
                         "limit_per_minute": settings.RATE_LIMIT_PER_IP,
                     },
+                    headers={"Retry-After": str(max(1, math.ceil(st.minute_start + 60 - now)))},
                 )
 
             if st.day_count + cost > settings.DAILY_QUOTA_PER_IP:
@@ -83,6 +91,7 @@ class UsageLimiter:
                         "message": "Daily quota exceeded for this IP. Try again tomorrow.",
                         "daily_quota": settings.DAILY_QUOTA_PER_IP,
                     },
+                    headers={"Retry-After": str(_seconds_until_tomorrow(now))},
                 )
 
             st.minute_count += cost
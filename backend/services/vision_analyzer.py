@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import base64
+import asyncio
 import json
-from typing import Any, Dict, List
+import threading
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 from backend.config import settings
 from backend.services.law_matcher import LawMatcher
-from backend.utils.image_processing import assess_image_quality
+from backend.services.metrics import stage
+from backend.utils.image_processing import ImageTile, assess_image_quality, image_data_url
 
 
 # ---- Prompt imports (supports both older/newer layouts) ----
@@ -36,7 +39,8 @@ SENSITIVE_VIOLATIONS = {
     "UNDERAGE_HOIST_OPERATOR",
 }
 
-# Curated high-visual-detectability list (keeps prompt small and reduces hallucination risk).
+# Curated high-visual-detectability list: the default set of IDs offered to the model
+# (VISION_ALLOWED_IDS=curated), and always part of the taxonomy policy.
 # IMPORTANT: IDs must exist in laws.json.
 PRIORITY_VIOLATIONS = [
     # PPE
@@ -72,6 +76,178 @@ PRIORITY_VIOLATIONS = [
     "CHILD_LABOUR_ON_SITE", "CHILD_LABOUR_HAZARDOUS_TASK", "UNDERAGE_HOIST_OPERATOR",
 ]
 
+ALLOWED_ID_POLICIES = ("curated", "taxonomy", "all")
+
+_allowed_by_lm: "weakref.WeakKeyDictionary[LawMatcher, Dict[str, Tuple[Tuple[str, ...], FrozenSet[str]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_allowed_lock = threading.Lock()
+
+
+def allowed_violation_ids(
+    law_matcher: LawMatcher, policy: Optional[str] = None, max_level: Optional[int] = None
+) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """IDs the model may report (prompt order / schema enum) and the same IDs as a set.
+
+    - curated (default): PRIORITY_VIOLATIONS that exist in the KB
+    - taxonomy: the curated IDs plus every violation with model_relevance "vision"
+      (replaced by their ancestor at VISION_TAXONOMY_MAX_LEVEL when that is >= 0)
+    - all: every violation
+
+    SENSITIVE_VIOLATIONS in the KB are always offered, so the flag-for-review path stays
+    reachable; an empty result falls back to every violation. Precomputed once per KB
+    snapshot, so building a VisionAnalyzer per request costs a dict lookup.
+    """
+    policy = (policy or getattr(settings, "VISION_ALLOWED_IDS", "") or "curated").lower()
+    if policy not in ALLOWED_ID_POLICIES:
+        policy = "curated"
+    if max_level is None:
+        max_level = int(getattr(settings, "VISION_TAXONOMY_MAX_LEVEL", -1))
+    key = f"{policy}:{max_level}"
+    cached = _allowed_by_lm.get(law_matcher, {}).get(key)
+    if cached is not None:
+        return cached
+
+    all_ids = law_matcher.get_all_violation_types()
+    ids: List[str] = []
+    if policy != "all":
+        known = set(all_ids)
+        ids = [v for v in PRIORITY_VIOLATIONS if v in known]
+        ids += sorted(v for v in SENSITIVE_VIOLATIONS if v in known and v not in ids)
+        if policy == "taxonomy":
+            seen = set(ids)
+            ids += [v for v in law_matcher.model_ids("vision", max_level)[0] if v not in seen]
+    if not ids:
+        ids = list(all_ids)
+    result = (tuple(ids), frozenset(ids))
+    with _allowed_lock:
+        _allowed_by_lm.setdefault(law_matcher, {})[key] = result
+    return result
+
+
+# Max confirmed violations returned per analysis (per image, or per merged tile set)
+MAX_ITEMS_BY_MODE = {"fast": 6, "accurate": 12}
+
+_SEVERITY_RANK = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+_CONFIDENCE_RANK = {"high": 3, "medium": 2, "low": 1}
+_QUALITY_MULTIPLIER = {"good": 1.0, "moderate": 1.10, "poor": 1.25}
+
+
+def _detection_rank(record: Dict[str, Any]) -> Tuple[int, int, float]:
+    return (
+        _SEVERITY_RANK.get(str(record.get("severity")), 0),
+        _CONFIDENCE_RANK.get(str(record.get("confidence")), 0),
+        float(record.get("raw_confidence_score") or 0.0),
+    )
+
+
+def _norm_location(loc: Any) -> str:
+    return " ".join(str(loc or "").lower().split()) or "unknown"
+
+
+Box = Tuple[float, float, float, float]
+
+# Location words the model uses -> third of the tile along that axis (0 = left/top).
+_COLUMN_WORDS = {"left": 0, "right": 2}
+_ROW_WORDS = {"top": 0, "upper": 0, "background": 0, "bottom": 2, "lower": 2, "foreground": 2}
+_CENTER_WORDS = {"center", "centre", "middle", "central"}
+
+
+def location_region(location: Any, box: Tuple[int, int, int, int]) -> Box:
+    """Region of the full photo a crop's location text points at, from the crop's `box`.
+
+    "left foreground" in a crop is the left third / bottom third of that crop's box; an
+    axis the text doesn't mention (or text like "near the scaffold") spans the whole crop.
+    """
+    words = set(_norm_location(location).replace("-", " ").replace(",", " ").split())
+    cols = sorted({_COLUMN_WORDS[w] for w in words if w in _COLUMN_WORDS})
+    rows = sorted({_ROW_WORDS[w] for w in words if w in _ROW_WORDS})
+    if words & _CENTER_WORDS:
+        cols = cols or [1]
+        rows = rows or [1]
+    left, top, right, bottom = box
+    cw, rh = (right - left) / 3.0, (bottom - top) / 3.0
+    x0, x1 = (left + cols[0] * cw, left + (cols[-1] + 1) * cw) if cols else (left, right)
+    y0, y1 = (top + rows[0] * rh, top + (rows[-1] + 1) * rh) if rows else (top, bottom)
+    return (x0, y0, x1, y1)
+
+
+def _touches(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def merge_tile_detections(
+    results: Sequence[Tuple[ImageTile, Dict[str, Any]]], *, max_items: int
+) -> Dict[str, Any]:
+    """Merge per-tile analyzer outputs into one result.
+
+    Each crop detection is placed on the full photo (`location_region` of the crop's box),
+    and detections of the same violation_type whose regions overlap or touch collapse into
+    one, so a hazard in the overlap between crops is reported once while the same hazard in
+    separate parts of the photo is kept. Overview detections only survive when no crop
+    reported that violation_type, since crops localize better. The strongest record
+    (severity, confidence) of each group wins.
+    """
+    ok = [(t, r) for t, r in results if isinstance(r, dict) and r.get("success")]
+    if not ok:
+        first = next((r for _, r in results if isinstance(r, dict)), {}) or {}
+        return {
+            "success": False,
+            "violations": [],
+            "flagged_for_review": [],
+            "image_quality": first.get("image_quality", "unknown"),
+            "error": first.get("error") or "All tiles failed.",
+        }
+
+    image_quality = "unknown"
+    for t, r in ok:
+        if t.is_overview:
+            image_quality = str(r.get("image_quality") or "unknown")
+            break
+
+    merged: Dict[str, List[Dict[str, Any]]] = {"violations": [], "flagged_for_review": []}
+    for key in merged:
+        # violation_type -> groups of ([regions], strongest record)
+        from_tiles: Dict[str, List[Tuple[List[Box], Dict[str, Any]]]] = {}
+        from_overview: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for tile, r in ok:
+            for v in r.get(key) or []:
+                if not isinstance(v, dict) or not isinstance(v.get("violation_type"), str):
+                    continue
+                rec = dict(v)
+                if tile.is_overview:
+                    k = (rec["violation_type"], _norm_location(rec.get("location")))
+                    if k not in from_overview or _detection_rank(rec) > _detection_rank(from_overview[k]):
+                        from_overview[k] = rec
+                    continue
+                region = location_region(rec.get("location"), tile.box)
+                rec["location"] = f"{rec.get('location') or 'unknown'} ({tile.label} of photo)"
+                groups = from_tiles.setdefault(rec["violation_type"], [])
+                regions, best = [region], rec
+                for g in [g for g in groups if any(_touches(region, b) for b in g[0])]:
+                    groups.remove(g)
+                    regions += g[0]
+                    if _detection_rank(g[1]) >= _detection_rank(best):
+                        best = g[1]
+                groups.append((regions, best))
+
+        out = [best for groups in from_tiles.values() for _, best in groups]
+        out += [rec for (vt, _), rec in from_overview.items() if vt not in from_tiles]
+        merged[key] = out
+
+    confirmed = sorted(merged["violations"], key=_detection_rank, reverse=True)[:max_items]
+    flagged = sorted(merged["flagged_for_review"], key=_detection_rank, reverse=True)
+
+    return {
+        "success": True,
+        "violations": confirmed,
+        "flagged_for_review": flagged,
+        "image_quality": image_quality,
+        "tiles_analyzed": len(ok),
+        "tiles_failed": len(results) - len(ok),
+        "error": None,
+    }
+
 
 class VisionAnalyzer:
     """OpenAI vision-based analyzer.
@@ -86,7 +262,7 @@ class VisionAnalyzer:
       }
     """
 
-    def __init__(self) -> None:
+    def __init__(self, law_matcher: Optional[LawMatcher] = None) -> None:
         self.api_key: str = getattr(settings, "OPENAI_API_KEY", "") or ""
 
         self.model_fast: str = (
@@ -100,11 +276,10 @@ class VisionAnalyzer:
             or "gpt-4o"
         )
 
-        self.law_matcher = LawMatcher(laws_file="data/laws.json")
-        all_ids = set(self.law_matcher.get_all_violation_types())
-
-        curated = [v for v in PRIORITY_VIOLATIONS if v in all_ids]
-        self.allowed_ids: List[str] = curated if curated else sorted(all_ids)
+        # Pass the current KB's matcher to avoid re-reading laws.json per instance.
+        self.law_matcher = law_matcher or LawMatcher(laws_file="data/laws.json")
+        self.allowed_ids, self._allowed_set = allowed_violation_ids(self.law_matcher)
+        self._schema_format: Optional[Dict[str, Any]] = None
 
     async def analyze_image(self, image_bytes: bytes, mode: str = "fast") -> Dict[str, Any]:
         if not self.api_key:
@@ -119,24 +294,13 @@ class VisionAnalyzer:
         model = self.model_fast if mode == "fast" else self.model_accurate
 
         # Image quality heuristic
-        q = assess_image_quality(image_bytes)
+        with stage("quality"):
+            q = assess_image_quality(image_bytes)
         image_quality = str(q.get("quality") or "unknown")
         warnings = q.get("warnings") or []
         metrics = q.get("metrics") or {}
 
-        # Adjust thresholds based on quality
-        quality_multiplier = {
-            "good": 1.0,
-            "moderate": 1.10,
-            "poor": 1.25,
-        }.get(image_quality, 1.10)
-
-        # Base thresholds by mode
-        base_standard = 0.50 if mode == "fast" else 0.45
-        base_critical = 0.70
-        base_sensitive = 0.90
-
-        max_items = 6 if mode == "fast" else 12
+        max_items = MAX_ITEMS_BY_MODE.get(mode, MAX_ITEMS_BY_MODE["accurate"])
 
         prompt = self._build_prompt(
             max_items=max_items,
@@ -147,28 +311,31 @@ class VisionAnalyzer:
             from openai import AsyncOpenAI  # type: ignore
 
             client = AsyncOpenAI(api_key=self.api_key)
-            b64 = base64.b64encode(image_bytes).decode("utf-8")
 
-            resp = await client.chat.completions.create(
-                model=model,
-                temperature=0,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64}"}},
-                        ],
-                    },
-                ],
-            )
+            with stage("model_call"):
+                resp = await client.chat.completions.create(
+                    model=model,
+                    temperature=0,
+                    response_format=self._response_format(),
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": prompt},
+                                {"type": "image_url", "image_url": {"url": image_data_url(image_bytes)}},
+                            ],
+                        },
+                    ],
+                )
 
             content = resp.choices[0].message.content or "{}"
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
+            data = self._loads_json_lenient(content)
+            if data is None:
+                # Cheap text-only retry on the fast model instead of re-sending the image.
+                with stage("model_repair"):
+                    data = await self._repair_json(client, content)
+            if data is None:
                 return {
                     "success": False,
                     "violations": [],
@@ -177,75 +344,9 @@ class VisionAnalyzer:
                     "error": "Model did not return valid JSON.",
                 }
 
-            raw = data.get("violations", [])
-            if not isinstance(raw, list):
-                raw = []
-
-            confirmed: List[Dict[str, Any]] = []
-            flagged: List[Dict[str, Any]] = []
-
-            for v in raw:
-                if not isinstance(v, dict):
-                    continue
-
-                vt_any = v.get("violation_type")
-                if not isinstance(vt_any, str):
-                    continue
-                vt = vt_any.strip()
-                if vt not in self.allowed_ids:
-                    continue
-
-                score = self._parse_score(v.get("confidence_score", v.get("confidence", 0.0)))
-
-                severity = self._normalize_severity(v.get("severity"))
-                if severity not in {"low", "medium", "high", "critical"}:
-                    severity = self._severity_from_score(score)
-
-                # Threshold based on type
-                if vt in SENSITIVE_VIOLATIONS:
-                    threshold = min(base_sensitive * quality_multiplier, 0.99)
-                elif severity == "critical":
-                    threshold = min(base_critical * quality_multiplier, 0.99)
-                else:
-                    threshold = min(base_standard * quality_multiplier, 0.99)
-
-                desc_any = v.get("description", "")
-                description = desc_any.strip() if isinstance(desc_any, str) else ""
-                loc_any = v.get("location", "unknown")
-                location = loc_any.strip() if isinstance(loc_any, str) and loc_any.strip() else "unknown"
-                ap = self._parse_affected_parties(v.get("affected_parties", ["workers"]))
-
-                record: Dict[str, Any] = {
-                    "violation_type": vt,
-                    "severity": severity,
-                    "confidence": self._confidence_level_from_score(score),
-                    "description": description or "(no description)",
-                    "location": location,
-                    "affected_parties": ap,
-                }
-
-                if score >= threshold:
-                    confirmed.append(record)
-                elif vt in SENSITIVE_VIOLATIONS and score >= 0.50:
-                    # Flag sensitive items for manual verification (router will attach laws + penalties)
-                    flagged.append(
-                        {
-                            **record,
-                            "flag_reason": (
-                                f"Potential {vt} detected with {score:.0%} model confidence. "
-                                f"Image quality={image_quality}. Requires human verification before confirmation."
-                            ),
-                            "requires_human_verification": True,
-                            "assumption_note": (
-                                "This is an AI-assisted hypothesis. If a human inspector confirms this violation, "
-                                "the attached law citations and penalties would apply."
-                            ),
-                            "raw_confidence_score": round(score, 4),
-                        }
-                    )
-
-                if len(confirmed) >= max_items:
-                    break
+            confirmed, flagged = self._collect_detections(
+                data.get("violations", []), mode=mode, image_quality=image_quality, max_items=max_items
+            )
 
             return {
                 "success": True,
@@ -264,6 +365,188 @@ class VisionAnalyzer:
                 "error": f"{type(e).__name__}: {e}",
             }
 
+    # ---------------------------------------------------------------------
+    # Structured output
+    # ---------------------------------------------------------------------
+
+    def _response_format(self) -> Dict[str, Any]:
+        """json_schema (strict) with an enum of allowed IDs, or legacy json_object mode."""
+        if not getattr(settings, "OPENAI_STRUCTURED_OUTPUTS", 1):
+            return {"type": "json_object"}
+        if self._schema_format is None:
+            item = {
+                "type": "object",
+                "properties": {
+                    "violation_type": {"type": "string", "enum": list(self.allowed_ids)},
+                    "confidence_score": {"type": "number"},
+                    "severity": {"type": "string", "enum": ["low", "medium", "high", "critical"]},
+                    "description": {"type": "string"},
+                    "location": {"type": "string"},
+                    "affected_parties": {"type": "array", "items": {"type": "string"}},
+                    "evidence_clarity": {"type": "string", "enum": ["clear", "partial", "uncertain"]},
+                },
+                "required": [
+                    "violation_type", "confidence_score", "severity", "description",
+                    "location", "affected_parties", "evidence_clarity",
+                ],
+                "additionalProperties": False,
+            }
+            self._schema_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "site_violations",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {"violations": {"type": "array", "items": item}},
+                        "required": ["violations"],
+                        "additionalProperties": False,
+                    },
+                },
+            }
+        return self._schema_format
+
+    @staticmethod
+    def _loads_json_lenient(content: str) -> Optional[Dict[str, Any]]:
+        """json.loads, then a local repair (strip code fences / surrounding prose) before giving up."""
+        for candidate in (content, content[content.find("{"): content.rfind("}") + 1]):
+            if not candidate:
+                continue
+            try:
+                data = json.loads(candidate)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(data, dict):
+                return data
+        return None
+
+    async def _repair_json(self, client: Any, content: str) -> Optional[Dict[str, Any]]:
+        try:
+            resp = await client.chat.completions.create(
+                model=self.model_fast,
+                temperature=0,
+                max_tokens=1500,
+                response_format=self._response_format(),
+                messages=[
+                    {"role": "system", "content": "Repair the user's text into valid JSON matching the schema. Output JSON only."},
+                    {"role": "user", "content": content[:8000]},
+                ],
+            )
+        except Exception:
+            return None
+        return self._loads_json_lenient(resp.choices[0].message.content or "")
+
+    def _collect_detections(
+        self, raw: Any, *, mode: str, image_quality: str, max_items: int
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Single pass over model items: set-based ID filter, normalization and thresholding.
+
+        Schema-conforming values take the fast branch; anything else falls back to the
+        lenient `_parse_*` helpers so json_object mode keeps working.
+        """
+        confirmed: List[Dict[str, Any]] = []
+        flagged: List[Dict[str, Any]] = []
+        if not isinstance(raw, list):
+            return confirmed, flagged
+
+        # Adjust thresholds based on quality; base thresholds by mode
+        quality_multiplier = _QUALITY_MULTIPLIER.get(image_quality, 1.10)
+        standard_t = min((0.50 if mode == "fast" else 0.45) * quality_multiplier, 0.99)
+        critical_t = min(0.70 * quality_multiplier, 0.99)
+        sensitive_t = min(0.90 * quality_multiplier, 0.99)
+
+        allowed = self._allowed_set
+        sensitive = SENSITIVE_VIOLATIONS
+
+        for v in raw:
+            if not isinstance(v, dict):
+                continue
+
+            vt = v.get("violation_type")
+            if not isinstance(vt, str):
+                continue
+            if vt not in allowed:
+                vt = vt.strip()
+                if vt not in allowed:
+                    continue
+
+            score_any = v.get("confidence_score", v.get("confidence", 0.0))
+            if type(score_any) is float and 0.0 <= score_any <= 1.0:
+                score = score_any
+            else:
+                score = self._parse_score(score_any)
+
+            severity = v.get("severity")
+            if not isinstance(severity, str) or severity not in _SEVERITY_RANK:
+                severity = self._normalize_severity(severity)
+
+            # Threshold based on type
+            if vt in sensitive:
+                threshold = sensitive_t
+            elif severity == "critical":
+                threshold = critical_t
+            else:
+                threshold = standard_t
+
+            desc_any = v.get("description", "")
+            description = desc_any.strip() if isinstance(desc_any, str) else ""
+            loc_any = v.get("location", "unknown")
+            location = loc_any.strip() if isinstance(loc_any, str) and loc_any.strip() else "unknown"
+
+            record: Dict[str, Any] = {
+                "violation_type": vt,
+                "severity": severity,
+                "confidence": self._confidence_level_from_score(score),
+                "description": description or "(no description)",
+                "location": location,
+                "affected_parties": self._parse_affected_parties(v.get("affected_parties", ["workers"])),
+            }
+
+            if score >= threshold:
+                confirmed.append(record)
+            elif vt in sensitive and score >= 0.50:
+                # Flag sensitive items for manual verification (router will attach laws + penalties)
+                flagged.append(
+                    {
+                        **record,
+                        "flag_reason": (
+                            f"Potential {vt} detected with {score:.0%} model confidence. "
+                            f"Image quality={image_quality}. Requires human verification before confirmation."
+                        ),
+                        "requires_human_verification": True,
+                        "assumption_note": (
+                            "This is an AI-assisted hypothesis. If a human inspector confirms this violation, "
+                            "the attached law citations and penalties would apply."
+                        ),
+                        "raw_confidence_score": round(score, 4),
+                    }
+                )
+
+            if len(confirmed) >= max_items:
+                break
+
+        return confirmed, flagged
+
+    async def analyze_tiles(self, tiles: Sequence[ImageTile], mode: str = "fast") -> Dict[str, Any]:
+        """Analyze an overview + crops concurrently and merge the detections.
+
+        Crops are sent as separate requests (bounded by TILE_CONCURRENCY) so a slow
+        tile does not serialize the others; see `merge_tile_detections` for dedup rules.
+        """
+        sem = asyncio.Semaphore(max(1, int(getattr(settings, "TILE_CONCURRENCY", 4) or 4)))
+
+        async def _one(tile: ImageTile) -> Tuple[ImageTile, Dict[str, Any]]:
+            async with sem:
+                try:
+                    return tile, await self.analyze_image(tile.image_bytes, mode=mode)
+                except Exception as e:
+                    return tile, {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        results = await asyncio.gather(*[_one(t) for t in tiles])
+        return merge_tile_detections(
+            results, max_items=MAX_ITEMS_BY_MODE.get(mode, MAX_ITEMS_BY_MODE["accurate"])
+        )
+
     def _build_prompt(self, *, max_items: int, quality_hint: str) -> str:
         allowed_ids_json = json.dumps(self.allowed_ids, ensure_ascii=False, indent=2)
         return USER_PROMPT_TEMPLATE.format(
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from backend.config import settings
+
+ADMIN_HEADER = "x-admin-token"
+
+
+def admin_token() -> str:
+    return getattr(settings, "ADMIN_TOKEN", "") or ""
+
+
+def is_admin_token(value: Optional[str]) -> bool:
+    """Constant-time check of a caller-supplied token; always False when ADMIN_TOKEN is unset."""
+    expected = admin_token()
+    if not expected or not value:
+        return False
+    return hmac.compare_digest(value.encode("utf-8"), expected.encode("utf-8"))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """FastAPI dependency for /admin routes."""
+    if not admin_token():
+        raise HTTPException(status_code=404, detail="Admin API is disabled (ADMIN_TOKEN not set)")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from backend.config import settings
+from backend.utils.compression import STATIC_PREFERENCE, choose_encoding, precompress
+
+
+@dataclass(frozen=True)
+class PreEncodedBody:
+    """A JSON body encoded once, with its strong ETag and compressed variants."""
+
+    body: bytes
+    etag: str  # quoted strong validator of the identity body
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # {"br"|"zstd"|"gzip": bytes}
+
+    @classmethod
+    def build(cls, body: bytes) -> "PreEncodedBody":
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', encoded=precompress(body))
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        # Each content-coding is its own representation, so it gets its own strong tag.
+        return self.etag if not coding else f'{self.etag[:-1]}-{coding}"'
+
+
+def cache_control() -> str:
+    max_age = int(getattr(settings, "LAWS_CACHE_MAX_AGE_S", 300) or 0)
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+def _client_tags(if_none_match: str):
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        yield tag.strip('"')
+
+
+def etag_matches(if_none_match: Optional[str], entry: PreEncodedBody) -> bool:
+    """If-None-Match (weak comparison, RFC 9110 13.1.2) against any representation of `entry`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = entry.etag.strip('"')
+    for tag in _client_tags(if_none_match):
+        if tag == base or (tag.startswith(base + "-") and tag[len(base) + 1:] in entry.encoded):
+            return True
+    return False
+
+
+def validator_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison against a single (possibly weak) ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = etag[2:] if etag.startswith("W/") else etag
+    return base.strip('"') in set(_client_tags(if_none_match))
+
+
+def conditional_response(request: Request, entry: PreEncodedBody) -> Response:
+    """304 when the client's validator matches; otherwise the best pre-encoded variant."""
+    coding = choose_encoding(request.headers.get("accept-encoding"), entry.encoded, STATIC_PREFERENCE)
+    headers = {"Cache-Control": cache_control(), "Vary": "Accept-Encoding", "ETag": entry.etag_for(coding)}
+
+    if etag_matches(request.headers.get("if-none-match"), entry):
+        return Response(status_code=304, headers=headers)
+
+    if coding:
+        headers["Content-Encoding"] = coding
+        return Response(content=entry.encoded[coding], media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,159 @@
+"""Tokenizer for English and Bengali text (search index and clause matching).
+
+Every step is driven by the tables below, so adding a script, a spelling variant or a
+suffix is a table edit:
+
+  1. NFC, then SEQUENCE_FOLDS / CHAR_FOLDS: one spelling for nukta letters, two-part vowel
+     signs, khanda ta, long/short i and u, candrabindu, Bengali digits and joiners
+  2. lowercase, split into runs of WORD_RANGES characters (Bengali vowel signs and virama
+     stay inside the word)
+  3. drop STOPWORDS, then strip at most one suffix (ENGLISH_SUFFIXES / BENGALI_SUFFIXES)
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+# Multi-character spellings folded before the per-character table.
+SEQUENCE_FOLDS: Tuple[Tuple[str, str], ...] = (
+    ("\u09c7\u09be", "\u09cb"),  # e-kar + aa-kar -> o-kar
+    ("\u09c7\u09d7", "\u09cc"),  # e-kar + au length mark -> au-kar
+    ("\u09a4\u09cd\u200d", "\u09ce"),  # ta + virama + ZWJ -> khanda ta
+)
+
+# Single characters: precomposed nukta letters to base + nukta, vowel-length folding,
+# nasalization dropped, digits to ASCII, joiners removed. (NFC already covers some of
+# these; the table keeps the result independent of how the input was normalized.)
+CHAR_FOLDS: Dict[int, str] = {
+    0x09DC: "\u09a1\u09bc",  # RRA -> DDA + nukta
+    0x09DD: "\u09a2\u09bc",  # RHA -> DDHA + nukta
+    0x09DF: "\u09af\u09bc",  # YYA -> YA + nukta
+    0x09C0: "\u09bf",  # ii-kar -> i-kar
+    0x09C2: "\u09c1",  # uu-kar -> u-kar
+    0x0988: "\u0987",  # II -> I
+    0x098A: "\u0989",  # UU -> U
+    0x0981: "",  # candrabindu
+    0x200C: "",  # ZWNJ
+    0x200D: "",  # ZWJ
+    **{0x09E6 + d: str(d) for d in range(10)},  # Bengali digits
+}
+
+# Characters that form words: (first, last) code points.
+WORD_RANGES: Tuple[Tuple[str, str], ...] = (
+    ("0", "9"),
+    ("a", "z"),
+    ("\u0980", "\u09ff"),  # Bengali block, including vowel signs, virama and nukta
+)
+
+# Tried longest-first; (suffix, replacement). A stem must keep MIN_STEM characters.
+ENGLISH_SUFFIXES: Tuple[Tuple[str, str], ...] = (
+    ("sses", "ss"),
+    ("ies", "y"),
+    ("ing", ""),
+    ("ed", ""),
+    ("es", ""),
+    ("s", ""),
+)
+BENGALI_SUFFIXES: Tuple[Tuple[str, str], ...] = (
+    ("গুলোতে", ""),
+    ("গুলোর", ""),
+    ("গুলো", ""),
+    ("গুলি", ""),
+    ("দেরকে", ""),
+    ("দের", ""),
+    ("েরা", ""),
+    ("ের", ""),
+    ("টির", ""),
+    ("টি", ""),
+    ("টা", ""),
+    ("কে", ""),
+    ("রা", ""),
+    ("\u09af\u09bc", ""),  # য়
+    ("ে", ""),
+)
+MIN_STEM = 3
+
+STOPWORDS_EN = (
+    "a an and are as be by for from in into is it its no not of on or that the their this to with without"
+)
+STOPWORDS_BN = "এবং ও বা এই এ যে কিন্তু থেকে জন্য সাথে মধ্যে করে হয় হবে"
+
+
+def normalize(text: str) -> str:
+    """Case- and spelling-folded text (steps 1-2, before splitting)."""
+    text = unicodedata.normalize("NFC", text)
+    for seq, repl in SEQUENCE_FOLDS:
+        if seq in text:
+            text = text.replace(seq, repl)
+    return text.translate(CHAR_FOLDS).lower()
+
+
+_WORD_RE = re.compile("[" + "".join(f"{re.escape(a)}-{re.escape(b)}" for a, b in WORD_RANGES) + "]+")
+_BENGALI_START, _BENGALI_END = "\u0980", "\u09ff"
+_VIRAMA = "\u09cd"
+
+
+def _is_bengali(token: str) -> bool:
+    return _BENGALI_START <= token[0] <= _BENGALI_END
+
+
+def stem(token: str) -> str:
+    """Strip at most one inflectional suffix; short words are left alone."""
+    if _is_bengali(token):
+        for suffix, repl in BENGALI_SUFFIXES:
+            if token.endswith(suffix):
+                base = token[: -len(suffix)] + repl
+                if len(base) >= MIN_STEM and not base.endswith(_VIRAMA):
+                    return base
+                break
+        return token
+    if token.isdigit():
+        return token
+    for suffix, repl in ENGLISH_SUFFIXES:
+        if token.endswith(suffix):
+            base = token[: -len(suffix)] + repl
+            # harness, status, analysis: a trailing s after s/u/i is not a plural.
+            if suffix == "s" and token[-2:-1] in ("s", "u", "i"):
+                break
+            if len(base) >= MIN_STEM:
+                token = base
+            break
+    # damage / damaged / damages all end up as "damag"
+    if len(token) > MIN_STEM and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def _stopwords() -> FrozenSet[str]:
+    words = f"{STOPWORDS_EN} {STOPWORDS_BN}"
+    return frozenset(_WORD_RE.findall(normalize(words)))
+
+
+STOPWORDS: FrozenSet[str] = _stopwords()
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized, stopword-free, stemmed tokens of English and Bengali text."""
+    if not text:
+        return []
+    return [stem(t) for t in _WORD_RE.findall(normalize(text)) if t not in STOPWORDS]
+
+
+def analyzer_tables() -> Dict[str, Any]:
+    """The tables above as JSON, so offline clients can tokenize exactly like the index.
+
+    The rules that are code rather than tables (at most one suffix, MIN_STEM, no stem
+    ending in a virama, the English s/u/i plural exception and the trailing-e fold) must
+    be mirrored by the client.
+    """
+    return {
+        "sequence_folds": [list(pair) for pair in SEQUENCE_FOLDS],
+        "char_folds": {chr(cp): repl for cp, repl in CHAR_FOLDS.items()},
+        "word_ranges": [list(pair) for pair in WORD_RANGES],
+        "english_suffixes": [list(pair) for pair in ENGLISH_SUFFIXES],
+        "bengali_suffixes": [list(pair) for pair in BENGALI_SUFFIXES],
+        "min_stem": MIN_STEM,
+        "stopwords": sorted(STOPWORDS),
+    }
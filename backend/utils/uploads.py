@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Iterable, Optional
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from backend.config import settings
+from backend.utils.image_processing import sniff_image_mime
+
+CHUNK_SIZE = 64 * 1024
+
+# Multipart framing (boundaries, part headers, small form fields) on top of the file itself.
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def max_upload_bytes() -> int:
+    return int(getattr(settings, "MAX_IMAGE_SIZE_MB", 10) or 10) * 1024 * 1024
+
+
+def _too_large_detail(limit: int) -> dict:
+    return {
+        "error": "upload_too_large",
+        "message": f"Image exceeds the {limit // (1024 * 1024)} MB limit.",
+        "max_bytes": limit,
+    }
+
+
+@dataclass
+class SpooledUpload:
+    """An upload that stays in Starlette's spooled temp file instead of a bytes copy.
+
+    `file` is positioned at 0 and can be passed straight to Pillow.
+    """
+
+    file: BinaryIO
+    size: int
+    mime: str
+    sha256: str
+    filename: str
+
+
+async def read_upload(file: UploadFile, *, max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Walks the upload in CHUNK_SIZE pieces without materializing it:
+      - sniffs the image type from the first chunk (400 if not JPEG/PNG/WEBP)
+      - keeps a running size and aborts with 413 as soon as the limit is crossed
+      - hashes incrementally (sha256 of the raw upload)
+    """
+    limit = max_upload_bytes() if max_bytes is None else int(max_bytes)
+    if file.size is not None and file.size > limit:
+        raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+
+    await file.seek(0)
+    first = await file.read(CHUNK_SIZE)
+    mime = sniff_image_mime(first)
+    if not first or mime is None:
+        raise HTTPException(status_code=400, detail="Invalid image format or size")
+
+    h = hashlib.sha256(first)
+    size = len(first)
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+        h.update(chunk)
+
+    await file.seek(0)
+    return SpooledUpload(
+        file=file.file,
+        size=size,
+        mime=mime,
+        sha256=h.hexdigest(),
+        filename=file.filename or "upload.jpg",
+    )
+
+
+class UploadLimitMiddleware:
+    """Rejects oversized uploads before the multipart parser spools them.
+
+    - Content-Length above the limit -> 413 without reading the body.
+    - Bodies without Content-Length are counted as they stream; crossing the limit raises
+      HTTPException(413) out of `receive`, which FastAPI's body parsing re-raises as-is.
+    """
+
+    def __init__(self, app: Any, paths: Iterable[str]) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope.get("type") != "http" or scope.get("method") != "POST" or scope.get("path") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_upload_bytes()
+        for k, v in scope.get("headers") or []:
+            if k == b"content-length":
+                if v.isdigit() and int(v) > limit + _MULTIPART_OVERHEAD:
+                    resp = JSONResponse(status_code=413, content={"detail": _too_large_detail(limit)})
+                    await resp(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Any:
+            nonlocal received
+            message = await receive()
+            if message.get("type") == "http.request":
+                received += len(message.get("body") or b"")
+                if received > limit + _MULTIPART_OVERHEAD:
+                    raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
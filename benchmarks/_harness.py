@@ -0,0 +1,121 @@
+"""Shared helpers for the benchmark scripts: stats, run metadata and result files.
+
+Results are written to benchmarks/results/<name>-<UTC timestamp>.json (gitignored) and
+can be diffed with `python benchmarks/compare.py OLD.json NEW.json`.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+try:
+    import resource  # POSIX only
+except Exception:  # pragma: no cover
+    resource = None  # type: ignore
+
+
+def bench_env() -> None:
+    """Environment defaults for in-process runs; must be applied before importing `backend`.
+
+    Lifts the per-IP limits (every in-process request comes from one address) and sets a
+    placeholder API key so the analyzer reaches the (faked) model client.
+    """
+    os.environ.setdefault("RATE_LIMIT_PER_IP", "1000000")
+    os.environ.setdefault("DAILY_QUOTA_PER_IP", "1000000")
+    os.environ.setdefault("OPENAI_API_KEY", "bench-fake-key")
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return float(sorted_values[k])
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """Milliseconds: count, mean, p50/p95/p99, max."""
+    vals = sorted(seconds)
+    n = len(vals)
+    return {
+        "count": n,
+        "mean_ms": round(sum(vals) / n * 1000.0, 3) if n else 0.0,
+        "p50_ms": round(percentile(vals, 50) * 1000.0, 3),
+        "p95_ms": round(percentile(vals, 95) * 1000.0, 3),
+        "p99_ms": round(percentile(vals, 99) * 1000.0, 3),
+        "max_ms": round(vals[-1] * 1000.0, 3) if n else 0.0,
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run_metadata() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(name: str, payload: Dict[str, Any], out: str = "") -> pathlib.Path:
+    """Write `payload` (plus run metadata) as JSON; returns the file path."""
+    if out:
+        path = pathlib.Path(out)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = RESULTS_DIR / f"{name}-{stamp}.json"
+    doc = {"benchmark": name, "meta": run_metadata(), **payload}
+    path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    return path
+
+
+def time_call(fn: Callable[[], Any], *, repeat: int = 5, number: int = 1) -> Dict[str, float]:
+    """Best/median per-call ms over `repeat` rounds of `number` calls (timeit-style)."""
+    rounds: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - t0) / number)
+    rounds.sort()
+    return {
+        "best_ms": round(rounds[0] * 1000.0, 4),
+        "median_ms": round(rounds[len(rounds) // 2] * 1000.0, 4),
+        "repeat": repeat,
+        "number": number,
+    }
@@ -0,0 +1,146 @@
+"""Encode time vs upload size vs detection parity for model-upload encodings.
+
+Usage:
+    python benchmarks/bench_image_encoding.py [--fixtures tests/test_images] [--repeat 5] [--json out.json]
+
+Each fixture (plus synthetic photos at common phone resolutions) is resized to
+IMAGE_MAX_SIDE and encoded with several configurations. For each we report:
+  - encode_ms:    median encode time (resize excluded)
+  - b64_kb:       base64 payload inlined in the OpenAI request
+  - upload_ms:    payload time on a 1 Mbit/s (3G-class) uplink
+  - psnr_db:      fidelity vs the baseline (quality 85 + optimize)
+  - quality_ok:   assess_image_quality() bucket identical to baseline
+
+No model is called offline, so "detection parity" is measured through the two signals
+the analyzer actually consumes besides the pixels: the quality bucket (which scales the
+confidence thresholds) and pixel fidelity (PSNR >= ~35 dB is visually lossless for
+PPE-scale objects).
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import json
+import math
+import pathlib
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+
+from backend.utils.image_processing import assess_image_quality, encode_image  # noqa: E402
+
+UPLINK_BYTES_PER_S = 1_000_000 / 8
+
+CONFIGS: List[Tuple[str, Dict[str, Any]]] = [
+    ("baseline q85+optimize", {"quality": 85, "optimize": True}),
+    ("fast q85", {"quality": 85, "optimize": False}),
+    ("target 200KB", {"quality": 85, "optimize": False, "target_bytes": 200 * 1024}),
+    ("target 120KB", {"quality": 85, "optimize": False, "target_bytes": 120 * 1024}),
+    ("webp q80", {"quality": 80, "optimize": False, "image_format": "webp"}),
+    ("webp target 120KB", {"quality": 80, "optimize": False, "image_format": "webp", "target_bytes": 120 * 1024}),
+]
+
+
+def _synthetic(w: int, h: int, seed: int) -> Image.Image:
+    """Textured scene with small high-contrast shapes (stand-ins for helmets/vests)."""
+    img = Image.effect_noise((w, h), 40 + seed * 5).convert("RGB")
+    img = img.filter(ImageFilter.GaussianBlur(1.5))
+    d = ImageDraw.Draw(img)
+    step = max(24, w // 40)
+    for i in range(0, w, step):
+        y = (i * 7 + seed * 131) % max(1, h - 30)
+        d.rectangle([i, y, i + step // 3, y + step // 2], fill=(230, 200, 20))
+        d.ellipse([i, y - 10, i + 10, y], fill=(240, 240, 240))
+    return img
+
+
+def _fixtures(folder: pathlib.Path) -> List[Tuple[str, Image.Image]]:
+    out: List[Tuple[str, Image.Image]] = []
+    for p in sorted(folder.glob("*")):
+        if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"}:
+            out.append((p.name, Image.open(p).convert("RGB")))
+    out.append(("synthetic_4000x3000", _synthetic(4000, 3000, 1)))
+    out.append(("synthetic_3000x4000", _synthetic(3000, 4000, 2)))
+    return out
+
+
+def _fit(img: Image.Image, max_side: int) -> Image.Image:
+    w, h = img.size
+    scale = min(1.0, max_side / float(max(w, h)))
+    return img.resize((int(w * scale), int(h * scale))) if scale < 1.0 else img
+
+
+def _psnr(a: Image.Image, b: Image.Image) -> float:
+    diff = Image.frombytes("L", a.size, bytes(abs(x - y) for x, y in zip(a.convert("L").tobytes(), b.convert("L").tobytes())))
+    hist = diff.histogram()
+    n = float(a.size[0] * a.size[1])
+    mse = sum(count * (value ** 2) for value, count in enumerate(hist)) / n
+    return float("inf") if mse == 0 else 10 * math.log10(255.0 ** 2 / mse)
+
+
+def run(fixtures: pathlib.Path, repeat: int, max_side: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for name, src in _fixtures(fixtures):
+        img = _fit(src, max_side)
+        baseline_bytes = encode_image(img, **CONFIGS[0][1])
+        baseline_img = Image.open(io.BytesIO(baseline_bytes)).convert("RGB")
+        baseline_q = assess_image_quality(baseline_bytes).get("quality")
+
+        for label, kwargs in CONFIGS:
+            times = []
+            data = b""
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                data = encode_image(img, **kwargs)
+                times.append((time.perf_counter() - t0) * 1000)
+            b64_len = len(base64.b64encode(data))
+            decoded = Image.open(io.BytesIO(data)).convert("RGB")
+            rows.append(
+                {
+                    "fixture": name,
+                    "config": label,
+                    "encode_ms": round(statistics.median(times), 2),
+                    "bytes": len(data),
+                    "b64_kb": round(b64_len / 1024, 1),
+                    "upload_ms": round(b64_len / UPLINK_BYTES_PER_S * 1000, 1),
+                    "psnr_db": round(_psnr(baseline_img, decoded), 2),
+                    "quality_ok": assess_image_quality(data).get("quality") == baseline_q,
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--fixtures", default=str(ROOT / "tests" / "test_images"))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--max-side", type=int, default=1024)
+    ap.add_argument("--json", dest="json_out", default="")
+    args = ap.parse_args()
+
+    rows = run(pathlib.Path(args.fixtures), args.repeat, args.max_side)
+
+    header = f"{'fixture':<22} {'config':<22} {'encode_ms':>9} {'b64_kb':>8} {'upload_ms':>9} {'psnr_db':>8} {'quality_ok':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['fixture']:<22} {r['config']:<22} {r['encode_ms']:>9} {r['b64_kb']:>8} "
+            f"{r['upload_ms']:>9} {r['psnr_db']:>8} {str(r['quality_ok']):>10}"
+        )
+
+    if args.json_out:
+        pathlib.Path(args.json_out).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Micro-benchmarks for the CPU-bound pieces behind the API.
+
+Usage:
+    python benchmarks/bench_micro.py [--repeat 7] [--only lawmatcher images] [--out results.json]
+
+  lawmatcher  construction (laws.json load + indexes), clause search (match_violation_text),
+              violation lookup by ID, per-detection law bundle (get_laws_for_violation)
+  images      validate_image, resize_image (model upload encode), assess_image_quality,
+              image_data_url, on a 12 MP and a 2 MP photo
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+from typing import Any, Dict, List
+
+from _harness import save_results, time_call
+
+from PIL import Image, ImageFilter
+
+from backend.services.law_matcher import LawMatcher
+from backend.utils.image_processing import (
+    assess_image_quality,
+    image_data_url,
+    resize_image,
+    validate_image,
+)
+
+CLAUSE_QUERIES = [
+    "workers without helmets on scaffolding",
+    "no guard rail at roof edge",
+    "exposed electrical wiring near water",
+    "excavation without shoring",
+]
+
+
+def _photo(width: int, height: int) -> bytes:
+    img = Image.effect_noise((width, height), 40).convert("RGB").filter(ImageFilter.GaussianBlur(1.2))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def bench_lawmatcher(repeat: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    rows.append({"name": "lawmatcher.construct", **time_call(lambda: LawMatcher(laws_file="data/laws.json"), repeat=repeat)})
+
+    lm = LawMatcher(laws_file="data/laws.json")
+    ids = lm.get_all_violation_types()
+    sample_ids = ids[:: max(1, len(ids) // 50)]
+
+    def search() -> None:
+        for q in CLAUSE_QUERIES:
+            lm.match_violation_text(q, top_k=5)
+
+    def lookup() -> None:
+        for vid in sample_ids:
+            lm.get_violation_details(vid)
+
+    def bundle() -> None:
+        for vid in sample_ids:
+            lm.get_laws_for_violation(vid)
+
+    rows.append({"name": f"lawmatcher.match_text x{len(CLAUSE_QUERIES)}", **time_call(search, repeat=repeat, number=5)})
+    rows.append({"name": f"lawmatcher.get_violation_details x{len(sample_ids)}", **time_call(lookup, repeat=repeat, number=20)})
+    rows.append({"name": f"lawmatcher.get_laws_for_violation x{len(sample_ids)}", **time_call(bundle, repeat=repeat, number=20)})
+    return rows
+
+
+def bench_images(repeat: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for label, (w, h) in (("12mp", (4000, 3000)), ("2mp", (1600, 1200))):
+        data = _photo(w, h)
+        processed = resize_image(data)
+        rows.append({"name": f"images.validate_image[{label}]", **time_call(lambda: validate_image(data), repeat=repeat)})
+        rows.append({"name": f"images.resize_image[{label}]", **time_call(lambda: resize_image(data), repeat=repeat)})
+        rows.append(
+            {"name": f"images.assess_image_quality[{label}]", **time_call(lambda: assess_image_quality(processed), repeat=repeat)}
+        )
+        rows.append(
+            {"name": f"images.image_data_url[{label}]", **time_call(lambda: image_data_url(processed), repeat=repeat, number=10)}
+        )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--only", nargs="+", default=["lawmatcher", "images"], choices=["lawmatcher", "images"])
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/micro-<ts>.json)")
+    args = ap.parse_args()
+
+    rows: List[Dict[str, Any]] = []
+    if "lawmatcher" in args.only:
+        rows.extend(bench_lawmatcher(args.repeat))
+    if "images" in args.only:
+        rows.extend(bench_images(args.repeat))
+
+    for r in rows:
+        print(f"{r['name']:<48} best={r['best_ms']:>10} ms  median={r['median_ms']:>10} ms")
+
+    path = save_results("micro", {"config": {"repeat": args.repeat}, "rows": rows}, args.out)
+    print(f"saved {path}")
+
+
+if __name__ == "__main__":
+    main()
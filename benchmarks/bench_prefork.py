@@ -0,0 +1,191 @@
+"""GC pause time and per-worker memory of the prefork server, with and without gc.freeze().
+
+Usage:
+    python benchmarks/bench_prefork.py [--workers 4] [--requests 400] [--churn 20000] [--out results.json]
+
+GC pauses: a fresh interpreter per mode preloads the KB like backend/server.py, then
+runs `--churn` simulated requests (a few hundred short-lived containers and a search each) while
+timing every collection through gc.callbacks, and finally times explicit full collections.
+Frozen objects are skipped by the collector, so gen-2 pauses no longer scale with the KB.
+
+Memory: starts `python -m backend.server` per mode (and plain `uvicorn --workers`, where
+each worker loads its own KB, as the baseline), sends `--requests` KB reads spread over
+the workers, then reports RSS/PSS/USS per process from /proc/<pid>/smaps_rollup (Linux
+only). Summed PSS is what the worker group really costs; USS is what each worker adds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import deque
+from typing import Any, Dict, List
+
+from _harness import ROOT, latency_summary, save_results
+
+MODES = ("no-freeze", "freeze")
+ROWS_PER_REQUEST = 300
+# `uvicorn --workers`: every worker imports the app and builds its own KB (nothing shared).
+MEMORY_MODES = ("uvicorn", *MODES)
+
+PATHS = (
+    "/api/v1/laws/catalog?limit=200",
+    "/api/v1/laws/search?q=helmet+harness&top_k=10",
+    "/api/v1/laws/search?q=%E0%A6%B9%E0%A7%87%E0%A6%B2%E0%A6%AE%E0%A7%87%E0%A6%9F",
+    "/api/v1/laws/bundle",
+)
+
+
+def gc_child(freeze: bool, churn: int) -> Dict[str, Any]:
+    """Runs in a fresh interpreter (see --gc-child): preload, churn, report pauses."""
+    import gc
+
+    from backend.server import preload
+    from backend.services.kb_registry import kb_registry
+    from backend.services.search_index import search_index
+
+    preload(freeze=freeze)
+    kb = kb_registry.current()
+    idx = search_index(kb.law_matcher)
+
+    pauses: Dict[int, List[float]] = {0: [], 1: [], 2: []}
+    started: Dict[str, float] = {}
+
+    def on_gc(phase: str, info: Dict[str, int]) -> None:
+        if phase == "start":
+            started["t"] = time.perf_counter()
+        else:
+            pauses[info["generation"]].append(time.perf_counter() - started.pop("t", time.perf_counter()))
+
+    gc.callbacks.append(on_gc)
+    t0 = time.perf_counter()
+    cache: "deque[Any]" = deque(maxlen=20)
+    for i in range(churn):
+        # One "request": a few hundred containers alive until the response is built; every
+        # 10th result survives in a bounded cache, so older generations keep filling up.
+        rows = [{"i": j, "tags": [str(j), "x"]} for j in range(ROWS_PER_REQUEST)]
+        rows.append({"hits": idx.search("helmet harness", top_k=3)})
+        if i % 10 == 0:
+            cache.append(rows)
+    churn_s = time.perf_counter() - t0
+    gc.callbacks.remove(on_gc)
+
+    full: List[float] = []
+    for _ in range(10):
+        t = time.perf_counter()
+        gc.collect()
+        full.append(time.perf_counter() - t)
+
+    return {
+        "frozen_objects": gc.get_freeze_count(),
+        "tracked_objects": len(gc.get_objects()),
+        "churn_s": round(churn_s, 3),
+        "pauses": {f"gen{g}": latency_summary(v) for g, v in pauses.items()},
+        "full_collect": latency_summary(full),
+    }
+
+
+def run_gc(mode: str, churn: int) -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, __file__, "--gc-child", mode, "--churn", str(churn)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as f:
+            return [int(x) for x in f.read().split()]
+    except OSError:
+        return []
+
+
+def run_memory(mode: str, workers: int, requests: int) -> Dict[str, Any]:
+    from backend.server import memory_report
+
+    port = _free_port()
+    if mode == "uvicorn":
+        cmd = [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--workers", str(workers)]
+    else:
+        cmd = [sys.executable, "-m", "backend.server", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    if mode == "no-freeze":
+        cmd.append("--no-freeze")
+    env = {**os.environ, "KB_WATCH_INTERVAL_S": "0", "RATE_LIMIT_PER_IP": "1000000"}
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                urllib.request.urlopen(base + "/health", timeout=1).read()
+                break
+            except OSError:
+                if time.monotonic() > deadline or proc.poll() is not None:
+                    raise RuntimeError(f"server did not start ({mode})")
+                time.sleep(0.2)
+        # New connection per request so the kernel spreads them over the workers.
+        for i in range(requests):
+            urllib.request.urlopen(base + PATHS[i % len(PATHS)], timeout=10).read()
+        time.sleep(0.5)
+        report = memory_report([proc.pid, *_children(proc.pid)])
+        report["master"] = report["processes"].pop(proc.pid, None)
+        report["workers"] = list(report.pop("processes").values())
+        return report
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--churn", type=int, default=20_000, help="simulated requests in the GC run")
+    ap.add_argument("--skip-memory", action="store_true", help="GC pauses only (no server processes)")
+    ap.add_argument("--gc-child", choices=MODES, help=argparse.SUPPRESS)
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/prefork-<ts>.json)")
+    args = ap.parse_args()
+
+    if args.gc_child:
+        print(json.dumps(gc_child(args.gc_child == "freeze", args.churn)))
+        return
+
+    gc_results = {mode: run_gc(mode, args.churn) for mode in MODES}
+    for mode, r in gc_results.items():
+        g2, full = r["pauses"]["gen2"], r["full_collect"]
+        print(f"{mode:<10} tracked {r['tracked_objects']:>8}  frozen {r['frozen_objects']:>8}  "
+              f"gen2 pauses {g2['count']:>3} p50 {g2['p50_ms']:>7.2f} ms max {g2['max_ms']:>7.2f} ms  "
+              f"gc.collect() p50 {full['p50_ms']:>7.2f} ms")
+
+    mem_results: Dict[str, Any] = {}
+    if not args.skip_memory and sys.platform.startswith("linux"):
+        for mode in MEMORY_MODES:
+            rep = mem_results[mode] = run_memory(mode, args.workers, args.requests)
+            per = ", ".join(f"{w['pss_mb']}/{w['uss_mb']}" for w in rep["workers"])
+            print(f"{mode:<10} master pss {rep['master']['pss_mb'] if rep['master'] else '?'} MB  "
+                  f"workers pss/uss [{per}] MB  total pss {rep['total_pss_mb']} MB")
+
+    payload = {
+        "config": {"workers": args.workers, "requests": args.requests, "churn": args.churn},
+        "gc": gc_results,
+        "memory": mem_results,
+    }
+    print(f"saved {save_results('prefork', payload, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
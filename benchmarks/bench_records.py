@@ -0,0 +1,126 @@
+"""Memory and access speed of the violation index: raw laws.json dicts vs ViolationRecords.
+
+Usage:
+    python benchmarks/bench_records.py [--repeat 7] [--out results.json]
+
+Memory: for each layout, a fresh interpreter parses laws.json and keeps only the violation
+index (the parsed dicts, or the records + separated text with the dicts dropped), then
+reports the live heap (tracemalloc) and the RSS growth over the bare interpreter.
+Access: the lookups the catalog indexes, the bundle and the analyzer make per violation
+(category, severity, primary authority, source IDs, penalty profile IDs), timed over every
+violation, plus the cost of rebuilding JSON at the API boundary (to_json).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+from _harness import ROOT, save_results, time_call
+
+from backend.services.kb_records import ViolationRecord, ViolationText
+
+LAWS = ROOT / "backend" / "data" / "laws.json"
+LAYOUTS = ("dicts", "records")
+
+
+def _violations(doc: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    out = [(v["violation_id"], v) for v in doc.get("canonical_violations") or []]
+    out += [(v["micro_violation_id"], v) for v in doc.get("micro_violations") or []]
+    return out
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def memory_child(layout: str) -> Dict[str, Any]:
+    """Runs in a fresh interpreter (see --memory-child)."""
+    raw = LAWS.read_bytes()
+    gc.collect()
+    rss0 = _rss_kb()
+    tracemalloc.start()
+    doc = json.loads(raw)
+    if layout == "dicts":
+        index: Any = dict(_violations(doc))
+    else:
+        index = {vid: ViolationRecord.from_json(v) for vid, v in _violations(doc)}
+    del doc
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"violations": len(index), "heap_mb": round(heap / 2**20, 2), "rss_growth_mb": round((_rss_kb() - rss0) / 1024, 1)}
+
+
+def _dict_access(index: Dict[str, Dict[str, Any]]) -> None:
+    for v in index.values():
+        v.get("category")
+        v.get("severity")
+        enf = v.get("enforcement")
+        if isinstance(enf, dict):
+            enf.get("primary_authority")
+        for lr in v.get("legal_references") or v.get("legal_references_enriched") or ():
+            lr.get("source_id")
+        for p in v.get("penalty_profiles") or ():
+            pass
+
+
+def _record_access(index: Dict[str, Tuple[ViolationRecord, ViolationText]]) -> None:
+    for v, _ in index.values():
+        v.category
+        v.severity
+        enf = v.enforcement
+        if enf is not None:
+            enf.primary_authority
+        for lr in v.legal_references:
+            lr.source_id
+        for p in v.penalty_profiles or ():
+            pass
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--memory-child", choices=LAYOUTS, help=argparse.SUPPRESS)
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/records-<ts>.json)")
+    args = ap.parse_args()
+
+    if args.memory_child:
+        print(json.dumps(memory_child(args.memory_child)))
+        return
+
+    memory: Dict[str, Any] = {}
+    for layout in LAYOUTS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--memory-child", layout], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        memory[layout] = json.loads(out.stdout.strip().splitlines()[-1])
+        m = memory[layout]
+        print(f"{layout:<8} {m['violations']} violations  heap {m['heap_mb']:>6.2f} MB  RSS +{m['rss_growth_mb']:>5.1f} MB")
+
+    doc = json.loads(LAWS.read_bytes())
+    dicts = dict(_violations(doc))
+    records = {vid: ViolationRecord.from_json(v) for vid, v in _violations(doc)}
+    access = {
+        "dicts": time_call(lambda: _dict_access(dicts), repeat=args.repeat, number=20),
+        "records": time_call(lambda: _record_access(records), repeat=args.repeat, number=20),
+        "to_json": time_call(lambda: [r.to_json(t) for r, t in records.values()], repeat=args.repeat, number=5),
+    }
+    for name, t in access.items():
+        print(f"{name:<8} best {t['best_ms']:>8.3f} ms   median {t['median_ms']:>8.3f} ms   (all violations)")
+
+    payload = {"config": {"repeat": args.repeat}, "memory": memory, "access": access}
+    print(f"saved {save_results('records', payload, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
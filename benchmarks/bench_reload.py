@@ -0,0 +1,107 @@
+"""Request latency while the knowledge base hot-reloads in the same process.
+
+Usage:
+    python benchmarks/bench_reload.py [--seconds 4] [--out results.json]
+
+A fresh interpreter per mode loads the KB, then an asyncio loop serves simulated requests
+(a search plus event-loop turns, like a cheap /laws read, 1 ms apart) while a background thread
+reloads the KB back to back (force=True), as the registry's reload thread would on a change:
+
+  idle      no reloads (baseline)
+  unpaced   reloads without pauses (KB_RELOAD_PAUSE_MS=0)
+  paced     the registry default: KB_RELOAD_PAUSE_MS between build steps
+
+The build is CPU-bound Python and holds the GIL; what's reported is how much of it leaks
+into the latency of requests served meanwhile (p99/max per mode, plus reload build time).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+from _harness import ROOT, latency_summary, save_results
+
+MODES = ("idle", "unpaced", "paced")
+IDLE_S = 0.001  # gap between simulated requests
+
+
+def reload_child(mode: str, seconds: float) -> Dict[str, Any]:
+    """Runs in a fresh interpreter (see --child)."""
+    import backend.main  # noqa: F401  (registers the warmers)
+    from backend.services.kb_registry import kb_registry
+    from backend.services.search_index import search_index
+
+    kb_registry.current()
+    builds: List[float] = []
+    stop = threading.Event()
+
+    def reload_loop() -> None:
+        while not stop.is_set():
+            kb_registry.reload(force=True, wait=True)
+            builds.append(kb_registry.current().build_ms / 1000.0)
+            stop.wait(0.05)
+
+    async def serve() -> List[float]:
+        lat: List[float] = []
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            search_index(kb_registry.current().law_matcher).search("helmet harness", top_k=5)
+            await asyncio.sleep(0)
+            # The next request "arrives" 1 ms later: waking up means getting the GIL back.
+            await asyncio.sleep(IDLE_S)
+            lat.append(time.perf_counter() - t0 - IDLE_S)
+        return lat
+
+    t = threading.Thread(target=reload_loop, daemon=True)
+    if mode != "idle":
+        t.start()
+    lat = asyncio.run(serve())
+    stop.set()
+    if t.is_alive():
+        t.join()
+    return {"reloads": len(builds), "requests": latency_summary(lat), "build": latency_summary(builds)}
+
+
+def run_mode(mode: str, seconds: float) -> Dict[str, Any]:
+    env = {**os.environ, "KB_WATCH_INTERVAL_S": "0"}
+    if mode == "unpaced":
+        env["KB_RELOAD_PAUSE_MS"] = "0"
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--seconds", str(seconds)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--seconds", type=float, default=4.0)
+    ap.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/reload-<ts>.json)")
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(reload_child(args.child, args.seconds)))
+        return
+
+    results = {mode: run_mode(mode, args.seconds) for mode in MODES}
+    for mode, r in results.items():
+        q, b = r["requests"], r["build"]
+        print(f"{mode:<8} requests {q['count']:>6}  p50 {q['p50_ms']:>6.2f} ms  p99 {q['p99_ms']:>6.2f} ms  "
+              f"max {q['max_ms']:>6.1f} ms   reloads {r['reloads']:>3}  build p50 {b['p50_ms']:>6.0f} ms")
+
+    payload = {"config": {"seconds": args.seconds}, "modes": results}
+    print(f"saved {save_results('reload', payload, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Query latency of the unified search index (GET /api/v1/laws/search without HTTP).
+
+Usage:
+    python benchmarks/bench_search.py [--rounds 200] [--top-k 10] [--budget-ms 1.0] [--out results.json]
+
+Builds the index once (as the KB warmer does), then times every English and Bengali query
+for `--rounds` rounds and reports per-query and per-language latency percentiles. Exits
+non-zero when the p99 over all queries exceeds `--budget-ms`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Any, Dict, List
+
+from _harness import latency_summary, save_results
+
+from backend.services.law_matcher import LawMatcher
+from backend.services.search_index import SearchIndex
+
+QUERIES_EN = [
+    "helmet",
+    "guardrail scaffold",
+    "worker at height without harness",
+    "excavation barricade shoring",
+    "fire extinguisher blocked",
+    "confined space gas test ventilation",
+    "electrical cable open distribution board",
+    "crane suspended load over public road",
+    "safety",  # long posting lists
+    "zzzz no such term",
+]
+
+QUERIES_BN = [
+    "হেলমেট",
+    "খোলা প্রান্তে রেলিং",
+    "উচ্চতায় কাজ সেফটি নেট নেই",
+    "খননকাজে ব্যারিকেড",
+    "অগ্নি নির্বাপক",
+    "শ্রমিকদের ঝুঁকিপূর্ণ কাজ",
+]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rounds", type=int, default=200)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--budget-ms", type=float, default=1.0)
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/search-<ts>.json)")
+    args = ap.parse_args()
+
+    lm = LawMatcher(laws_file="data/laws.json")
+    t0 = time.perf_counter()
+    idx = SearchIndex.build(lm)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    print(f"index: {len(idx)} documents, {idx.vocabulary_size} terms, built in {build_ms:.1f} ms")
+
+    rows: List[Dict[str, Any]] = []
+    by_lang: Dict[str, List[float]] = {"en": [], "bn": []}
+    for lang, queries in (("en", QUERIES_EN), ("bn", QUERIES_BN)):
+        for q in queries:
+            samples = []
+            for _ in range(args.rounds):
+                t = time.perf_counter()
+                idx.search(q, top_k=args.top_k)
+                samples.append(time.perf_counter() - t)
+            by_lang[lang] += samples
+            r = {"query": q, "lang": lang, **latency_summary(samples)}
+            rows.append(r)
+            print(f"{q:<42} p50 {r['p50_ms']:>7.3f} ms   p99 {r['p99_ms']:>7.3f} ms")
+
+    languages = {lang: latency_summary(samples) for lang, samples in by_lang.items()}
+    overall = latency_summary(by_lang["en"] + by_lang["bn"])
+    ok = overall["p99_ms"] <= args.budget_ms
+    for lang, summary in languages.items():
+        print(f"{'all ' + lang + ' queries':<42} p50 {summary['p50_ms']:>7.3f} ms   p99 {summary['p99_ms']:>7.3f} ms")
+    print(f"{'all queries':<42} p50 {overall['p50_ms']:>7.3f} ms   p99 {overall['p99_ms']:>7.3f} ms  "
+          f"({'within' if ok else 'OVER'} {args.budget_ms} ms budget)")
+
+    payload = {
+        "config": {"rounds": args.rounds, "top_k": args.top_k, "budget_ms": args.budget_ms},
+        "index": {"documents": len(idx), "terms": idx.vocabulary_size, "build_ms": round(build_ms, 1)},
+        "overall": overall,
+        "languages": languages,
+        "rows": rows,
+    }
+    print(f"saved {save_results('search', payload, args.out)}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
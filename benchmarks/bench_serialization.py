@@ -0,0 +1,152 @@
+"""Serialization time per /analyze response: pydantic path vs pre-encoded fast path.
+
+Usage:
+    python benchmarks/bench_serialization.py [--repeat 7] [--out results.json]
+
+  legacy miss   build DetectedViolation/LawReference/PenaltyProfile/ViolationWithLaw objects,
+                model_dump() for the cache, then FastAPI's response_model round trip
+                (validate + jsonable_encoder + json.dumps)
+  fast miss     build_analysis_body(): plain dicts + memoized law bundle fragments -> bytes
+  legacy hit    AnalysisResponse(**cached) + the same response_model round trip
+  fast hit      stored bytes sent as-is (cache_store.get_bytes)
+
+Sizes follow the model caps: fast=6 and accurate=12 detections, plus 2 flagged.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any, Dict, List
+
+from _harness import save_results, time_call
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.models.responses import (
+    AnalysisResponse,
+    DetectedViolation,
+    FlaggedViolationWithLaw,
+    LawReference,
+    PenaltyProfile,
+    ViolationWithLaw,
+)
+from backend.services.analysis_response import DISCLAIMER, build_analysis_body
+from backend.services.cache_store import CacheStore
+from backend.services.law_matcher import LawMatcher
+from backend.services.vision_analyzer import PRIORITY_VIOLATIONS
+from backend.utils import fast_json
+
+
+def _detections(ids: List[str], n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "violation_type": ids[i % len(ids)],
+            "severity": ("critical", "high", "medium", "low")[i % 4],
+            "confidence": ("high", "medium", "low")[i % 3],
+            "description": "Worker at height without fall protection near the slab edge.",
+            "location": "upper left",
+            "affected_parties": ["workers", "public"],
+        }
+        for i in range(n)
+    ]
+
+
+def _legacy_build(lm: LawMatcher, violations: List[Dict[str, Any]], flagged: List[Dict[str, Any]]) -> AnalysisResponse:
+    def bundle(dv: DetectedViolation):
+        exact = lm.match_violation(dv.violation_type)
+        if isinstance(exact, dict):
+            return (
+                [LawReference(**lr) for lr in exact.get("laws") or []],
+                [PenaltyProfile(**p) for p in exact.get("penalties") or []],
+                exact.get("recommended_actions") or [],
+            )
+        return [], [], []
+
+    v_out = []
+    for v in violations:
+        dv = DetectedViolation(**v)
+        laws, penalties, actions = bundle(dv)
+        v_out.append(ViolationWithLaw(violation=dv, laws=laws, penalties=penalties, recommended_actions=actions))
+    f_out = []
+    for v in flagged:
+        dv = DetectedViolation(**v)
+        laws, penalties, actions = bundle(dv)
+        f_out.append(
+            FlaggedViolationWithLaw(
+                violation=dv, laws=laws, penalties=penalties, recommended_actions=actions, flag_reason="review"
+            )
+        )
+    return AnalysisResponse(
+        success=True,
+        image_id="bench",
+        timestamp="2026-01-01T00:00:00+00:00",
+        violations_found=len(v_out),
+        violations=v_out,
+        flagged_found=len(f_out),
+        flagged_for_review=f_out,
+        image_quality="good",
+        ui_summary={},
+        disclaimer=DISCLAIMER,
+    )
+
+
+def _response_model_roundtrip(resp: AnalysisResponse) -> bytes:
+    # What FastAPI does with `response_model=AnalysisResponse` before JSONResponse renders it.
+    validated = AnalysisResponse.model_validate(resp.model_dump())
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/serialization-<ts>.json)")
+    args = ap.parse_args()
+
+    lm = LawMatcher(laws_file="data/laws.json")
+    ids = [v for v in PRIORITY_VIOLATIONS if lm.get_violation_details(v)]
+    cache = CacheStore()
+    rows: List[Dict[str, Any]] = []
+    print(f"json backend: {'orjson' if fast_json.orjson is not None else 'stdlib'}")
+
+    for label, n in (("fast", 6), ("accurate", 12)):
+        violations = _detections(ids, n)
+        flagged = [{**d, "flag_reason": "review"} for d in _detections(ids[::-1], 2)]
+
+        def legacy_miss() -> bytes:
+            resp = _legacy_build(lm, violations, flagged)
+            resp.model_dump()
+            return _response_model_roundtrip(resp)
+
+        def fast_miss() -> bytes:
+            return build_analysis_body(
+                law_matcher=lm,
+                raw_violations=violations,
+                raw_flagged=flagged,
+                include_laws=True,
+                image_id="bench",
+                timestamp="2026-01-01T00:00:00+00:00",
+                image_quality="good",
+            )
+
+        cached_payload = _legacy_build(lm, violations, flagged).model_dump()
+        cache.set_bytes(f"bench:{label}", fast_miss())
+
+        def legacy_hit() -> bytes:
+            return _response_model_roundtrip(AnalysisResponse(**cached_payload))
+
+        def fast_hit() -> bytes:
+            return cache.get_bytes(f"bench:{label}") or b""
+
+        size = len(fast_miss())
+        for name, fn in (("legacy_miss", legacy_miss), ("fast_miss", fast_miss), ("legacy_hit", legacy_hit), ("fast_hit", fast_hit)):
+            r = {"name": f"{name}[{label}]", "body_kb": round(size / 1024, 1), **time_call(fn, repeat=args.repeat, number=200)}
+            rows.append(r)
+            print(f"{r['name']:<24} {r['median_ms']:>9} ms/response  ({r['body_kb']} KB)")
+
+    path = save_results("serialization", {"config": {"repeat": args.repeat}, "rows": rows}, args.out)
+    print(f"saved {path}")
+
+
+if __name__ == "__main__":
+    main()
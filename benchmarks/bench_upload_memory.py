@@ -0,0 +1,130 @@
+"""Peak Python heap per concurrent /analyze upload: legacy read-everything path vs spooled path.
+
+Usage:
+    python benchmarks/bench_upload_memory.py [--size-mb 8] [--concurrency 1 8 32] [--json out.json]
+
+Both pipelines start from the same Starlette-style UploadFile (SpooledTemporaryFile,
+1 MB in memory then disk) and hold their references across a simulated model call,
+exactly like the route does:
+
+  legacy:  await file.read() -> validate(bytes) -> resize(bytes(copy)) -> b64 str + f-string
+  spooled: read_upload() (chunked size check + sniff + hash) -> validate/resize from the
+           spooled file in place -> image_data_url() (single base64 pass)
+
+Measured with tracemalloc, which tracks Python-level allocations (bytes/str copies).
+Pillow's decoded pixel buffers are C allocations and are identical in both paths.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageFilter  # noqa: E402
+from starlette.datastructures import UploadFile  # noqa: E402
+
+from backend.utils.image_processing import image_data_url, resize_image, validate_image  # noqa: E402
+from backend.utils.uploads import read_upload  # noqa: E402
+
+MODEL_LATENCY_S = 0.05
+
+
+def _make_jpeg(size_mb: float) -> bytes:
+    side = 2000
+    while True:
+        img = Image.effect_noise((side, side * 3 // 4), 50).convert("RGB").filter(ImageFilter.GaussianBlur(0.6))
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=95)
+        if out.tell() >= size_mb * 1024 * 1024 or side >= 8000:
+            return out.getvalue()
+        side = int(side * 1.25)
+
+
+def _upload(data: bytes) -> UploadFile:
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(data)
+    spool.seek(0)
+    return UploadFile(spool, size=len(data), filename="site.jpg")
+
+
+async def _legacy(file: UploadFile) -> int:
+    image_bytes = await file.read()
+    img = Image.open(io.BytesIO(image_bytes))
+    img.verify()
+    raw = bytes(image_bytes)
+    processed = resize_image(Image.open(io.BytesIO(raw)))
+    b64 = base64.b64encode(processed).decode("utf-8")
+    url = f"data:image/jpeg;base64,{b64}"
+    await asyncio.sleep(MODEL_LATENCY_S)
+    return len(url) + len(image_bytes)
+
+
+async def _spooled(file: UploadFile) -> int:
+    upload = await read_upload(file, max_bytes=64 * 1024 * 1024)
+    validate_image(upload.file)
+    processed = resize_image(upload.file)
+    url = image_data_url(processed)
+    await asyncio.sleep(MODEL_LATENCY_S)
+    return len(url) + upload.size
+
+
+async def _run(fn: Callable[[UploadFile], Any], data: bytes, concurrency: int) -> Dict[str, Any]:
+    files = [_upload(data) for _ in range(concurrency)]
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    await asyncio.gather(*[fn(f) for f in files])
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for f in files:
+        f.file.close()
+    return {
+        "concurrency": concurrency,
+        "peak_mb": round((peak - base) / (1024 * 1024), 2),
+        "peak_mb_per_upload": round((peak - base) / (1024 * 1024) / concurrency, 2),
+        "wall_s": round(elapsed, 3),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size-mb", type=float, default=8.0)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--json", dest="json_out", default="")
+    args = ap.parse_args()
+
+    data = _make_jpeg(args.size_mb)
+    print(f"upload size: {len(data) / (1024 * 1024):.2f} MB")
+
+    rows: List[Dict[str, Any]] = []
+    for c in args.concurrency:
+        for name, fn in (("legacy", _legacy), ("spooled", _spooled)):
+            r = asyncio.run(_run(fn, data, c))
+            r["path"] = name
+            rows.append(r)
+            print(
+                f"{name:<8} concurrency={c:<3} peak={r['peak_mb']:>8} MB "
+                f"per_upload={r['peak_mb_per_upload']:>6} MB wall={r['wall_s']}s"
+            )
+
+    if args.json_out:
+        pathlib.Path(args.json_out).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
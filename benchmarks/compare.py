@@ -0,0 +1,73 @@
+"""Compare two benchmark result files (load_test.py or bench_micro.py output).
+
+Usage:
+    python benchmarks/compare.py BASELINE.json CANDIDATE.json [--threshold 10] [--fail-on-regression]
+
+Prints per-metric deltas. A metric regresses when it gets worse by more than
+`--threshold` percent (latency/time up, throughput down); with --fail-on-regression
+the exit code is 1 if anything regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+from typing import Any, Dict, Iterator, Tuple
+
+# (key, metric name, value, higher_is_better)
+Row = Tuple[str, str, float, bool]
+
+
+def _rows(doc: Dict[str, Any]) -> Iterator[Row]:
+    for cell in doc.get("cells") or []:
+        key = f"{cell['scenario']} c={cell['concurrency']}"
+        yield key, "throughput_rps", float(cell["throughput_rps"]), True
+        for m in ("p50_ms", "p95_ms", "p99_ms"):
+            yield key, m, float(cell["latency"][m]), False
+        if cell.get("peak_rss_mb") is not None:
+            yield key, "peak_rss_mb", float(cell["peak_rss_mb"]), False
+    for row in doc.get("rows") or []:
+        yield row["name"], "median_ms", float(row["median_ms"]), False
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("baseline")
+    ap.add_argument("candidate")
+    ap.add_argument("--threshold", type=float, default=10.0, help="percent change counted as a regression")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    args = ap.parse_args()
+
+    base_doc = json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8"))
+    cand_doc = json.loads(pathlib.Path(args.candidate).read_text(encoding="utf-8"))
+    if base_doc.get("benchmark") != cand_doc.get("benchmark"):
+        print(f"warning: comparing {base_doc.get('benchmark')} with {cand_doc.get('benchmark')}")
+
+    base = {(k, m): (v, hib) for k, m, v, hib in _rows(base_doc)}
+    regressions = 0
+    print(f"baseline  {base_doc.get('meta', {}).get('git')}  {base_doc.get('meta', {}).get('timestamp')}")
+    print(f"candidate {cand_doc.get('meta', {}).get('git')}  {cand_doc.get('meta', {}).get('timestamp')}")
+    for key, metric, new, higher_is_better in _rows(cand_doc):
+        if (key, metric) not in base:
+            print(f"{key:<48} {metric:<15} {'(new)':>12} {new:>12.3f}")
+            continue
+        old, _ = base[(key, metric)]
+        change = ((new - old) / old * 100.0) if old else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "  improved"
+        print(f"{key:<48} {metric:<15} {old:>12.3f} {new:>12.3f} {change:>+8.1f}%{flag}")
+
+    if regressions:
+        print(f"{regressions} metric(s) regressed by more than {args.threshold}%")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
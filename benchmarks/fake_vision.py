@@ -0,0 +1,119 @@
+"""In-process stand-in for the OpenAI vision API, used by the load test.
+
+Installs a fake `openai.AsyncOpenAI` so `/analyze` runs its real pipeline (upload read,
+validation, resize, quality check, data URL, JSON parsing, law enrichment) while the
+model call itself is a configurable sleep:
+
+  latency_ms / jitter_ms  per-call delay (uniform jitter, +/-)
+  failure_rate            fraction of calls that raise (route answers 503)
+  invalid_json_rate       fraction of calls returning truncated JSON (exercises repair)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+
+class FakeModelError(RuntimeError):
+    pass
+
+
+@dataclass
+class FakeVisionBackend:
+    latency_ms: float = 800.0
+    jitter_ms: float = 200.0
+    failure_rate: float = 0.0
+    invalid_json_rate: float = 0.0
+    violations_per_reply: int = 3
+    seed: int = 0
+    calls: int = 0
+    failures: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+    _violation_ids: List[str] = field(init=False, repr=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def _reply(self) -> str:
+        if not self._violation_ids:
+            from backend.services.kb_registry import kb_registry
+            from backend.services.vision_analyzer import allowed_violation_ids
+
+            # The IDs the analyzer offers the model (VISION_ALLOWED_IDS policy).
+            self._violation_ids = list(allowed_violation_ids(kb_registry.current().law_matcher)[0])
+        k = min(self.violations_per_reply, len(self._violation_ids))
+        with self._lock:
+            picked = self._rng.sample(self._violation_ids, k)
+        return json.dumps(
+            {
+                "violations": [
+                    {
+                        "violation_type": vid,
+                        "confidence_score": 0.9,
+                        "severity": "high",
+                        "description": "Synthetic detection from the benchmark backend.",
+                        "location": "center",
+                        "affected_parties": ["workers"],
+                        "evidence_clarity": "clear",
+                    }
+                    for vid in picked
+                ]
+            }
+        )
+
+    async def complete(self, **kwargs: Any) -> Any:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+            fail = self._rng.random() < self.failure_rate
+            broken = self._rng.random() < self.invalid_json_rate
+        await asyncio.sleep(delay)
+        if fail:
+            with self._lock:
+                self.failures += 1
+            raise FakeModelError("injected model failure")
+
+        # Text-only repair calls (no image part) always succeed.
+        is_repair = all(isinstance(m.get("content"), str) for m in kwargs.get("messages") or [])
+        content = self._reply()
+        if broken and not is_repair:
+            content = content[: len(content) // 2]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def client_factory(self) -> Callable[..., Any]:
+        backend = self
+
+        class _FakeAsyncOpenAI:
+            def __init__(self, api_key: Optional[str] = None, **_: Any) -> None:
+                self.chat = SimpleNamespace(completions=SimpleNamespace(create=backend.complete))
+
+        return _FakeAsyncOpenAI
+
+    def install(self) -> Callable[[], None]:
+        """Patch `openai.AsyncOpenAI`; returns a function that restores the original."""
+        import openai
+
+        original = openai.AsyncOpenAI
+        openai.AsyncOpenAI = self.client_factory()  # type: ignore[misc]
+
+        def restore() -> None:
+            openai.AsyncOpenAI = original  # type: ignore[misc]
+
+        return restore
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "failure_rate": self.failure_rate,
+            "invalid_json_rate": self.invalid_json_rate,
+            "calls": self.calls,
+            "failures": self.failures,
+        }
@@ -0,0 +1,238 @@
+"""Offline load test: the FastAPI app in-process against a fake vision backend.
+
+Usage:
+    python benchmarks/load_test.py [--scenarios analyze match_text violations]
+        [--concurrency 1 8 32] [--requests 200] [--latency-ms 800] [--jitter-ms 200]
+        [--failure-rate 0.0] [--invalid-json-rate 0.0] [--cache-hit-ratio 0.0]
+        [--tracemalloc] [--out results.json]
+
+Requests go through httpx's ASGITransport (no sockets, no server process), so results
+measure the application itself: middleware, upload handling, image work, law lookups
+and serialization. The OpenAI client is replaced by `fake_vision.FakeVisionBackend`.
+
+Each (scenario, concurrency) cell reports throughput, p50/p95/p99 latency, status
+counts, mean per-stage time (from X-Timing) and memory. Results are saved as JSON under
+benchmarks/results/ for `compare.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import itertools
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from _harness import bench_env, latency_summary, peak_rss_mb, save_results
+
+bench_env()
+
+import httpx  # noqa: E402
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+
+from backend.main import app  # noqa: E402
+from fake_vision import FakeVisionBackend  # noqa: E402
+
+MATCH_TEXT_QUERIES = [
+    "workers without helmets on scaffolding",
+    "no guard rail at roof edge",
+    "exposed electrical wiring near water",
+    "excavation without shoring",
+    "missing safety net below work platform",
+    "blocked emergency exit with building materials",
+    "welding without eye protection",
+    "unsecured ladder on uneven ground",
+]
+
+
+def _base_photo(width: int, height: int) -> Image.Image:
+    # Blurred noise compresses like a real site photo (not like a flat test card).
+    return Image.effect_noise((width, height), 40).convert("RGB").filter(ImageFilter.GaussianBlur(1.2))
+
+
+def _image_pool(count: int, width: int, height: int) -> List[bytes]:
+    """`count` distinct JPEGs (a stamped marker per image) so each one misses the cache."""
+    base = _base_photo(width, height)
+    pool: List[bytes] = []
+    for i in range(count):
+        img = base.copy()
+        draw = ImageDraw.Draw(img)
+        draw.rectangle((8, 8, 8 + 24, 8 + 24), fill=((i * 37) % 256, (i * 91) % 256, (i // 256) % 256))
+        draw.text((40, 10), f"bench-{i}", fill=(255, 255, 255))
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=90)
+        pool.append(out.getvalue())
+    return pool
+
+
+RequestFn = Callable[[httpx.AsyncClient, int], Any]
+
+
+def _scenario_violations() -> RequestFn:
+    async def run(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get("/api/v1/laws/violations")
+
+    return run
+
+
+def _scenario_match_text() -> RequestFn:
+    async def run(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        q = MATCH_TEXT_QUERIES[i % len(MATCH_TEXT_QUERIES)]
+        return await client.get("/api/v1/laws/match-text", params={"text": q, "top_k": 5})
+
+    return run
+
+
+def _scenario_analyze(images: List[bytes], cache_hit_ratio: float, mode: str) -> RequestFn:
+    # The first image is the "hot" one; a fixed fraction of requests reuses it.
+    period = int(round(1.0 / cache_hit_ratio)) if cache_hit_ratio > 0 else 0
+
+    async def run(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        data = images[0] if period and i % period == 0 else images[1 + i % (len(images) - 1)]
+        files = {"file": (f"site-{i}.jpg", data, "image/jpeg")}
+        return await client.post("/api/v1/analyze", params={"mode": mode, "include_laws": "true"}, files=files)
+
+    return run
+
+
+def _parse_x_timing(value: Optional[str]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in (value or "").split(","):
+        name, _, ms = part.partition("=")
+        if name and ms:
+            try:
+                out[name.strip()] = float(ms)
+            except ValueError:
+                pass
+    return out
+
+
+async def _run_cell(fn: RequestFn, *, concurrency: int, requests: int, trace: bool) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    stage_totals: Dict[str, Tuple[float, int]] = {}
+    errors = 0
+    counter = itertools.count()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while True:
+                i = next(counter)
+                if i >= requests:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    resp = await fn(client, i)
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+                key = str(resp.status_code)
+                statuses[key] = statuses.get(key, 0) + 1
+                for name, ms in _parse_x_timing(resp.headers.get("x-timing")).items():
+                    total, n = stage_totals.get(name, (0.0, 0))
+                    stage_totals[name] = (total + ms, n + 1)
+
+        if trace:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        t_start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        wall = time.perf_counter() - t_start
+        traced_peak = None
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            traced_peak = round(peak / (1024 * 1024), 2)
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "latency": latency_summary(latencies),
+        "status": statuses,
+        "client_errors": errors,
+        "stage_mean_ms": {k: round(t / n, 3) for k, (t, n) in sorted(stage_totals.items())},
+        "traced_peak_mb": traced_peak,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument(
+        "--scenarios", nargs="+", default=["analyze", "match_text", "violations"],
+        choices=["analyze", "match_text", "violations"],
+    )
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--requests", type=int, default=200, help="requests per (scenario, concurrency) cell")
+    ap.add_argument("--mode", default="fast", choices=["fast", "accurate"])
+    ap.add_argument("--latency-ms", type=float, default=800.0)
+    ap.add_argument("--jitter-ms", type=float, default=200.0)
+    ap.add_argument("--failure-rate", type=float, default=0.0)
+    ap.add_argument("--invalid-json-rate", type=float, default=0.0)
+    ap.add_argument("--cache-hit-ratio", type=float, default=0.0, help="fraction of analyze requests reusing one image")
+    ap.add_argument("--image-size", type=int, nargs=2, default=[1600, 1200], metavar=("W", "H"))
+    ap.add_argument("--tracemalloc", action="store_true", help="also report traced Python heap peak (slower)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="", help="result file (default: benchmarks/results/loadtest-<ts>.json)")
+    args = ap.parse_args()
+
+    backend = FakeVisionBackend(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        invalid_json_rate=args.invalid_json_rate,
+        seed=args.seed,
+    )
+    restore = backend.install()
+
+    cells: List[Dict[str, Any]] = []
+    try:
+        for scenario in args.scenarios:
+            for c in args.concurrency:
+                if scenario == "analyze":
+                    images = _image_pool(args.requests + 1, *args.image_size)
+                    fn = _scenario_analyze(images, args.cache_hit_ratio, args.mode)
+                elif scenario == "match_text":
+                    fn = _scenario_match_text()
+                else:
+                    fn = _scenario_violations()
+
+                r = asyncio.run(_run_cell(fn, concurrency=c, requests=args.requests, trace=args.tracemalloc))
+                r["scenario"] = scenario
+                cells.append(r)
+                lat = r["latency"]
+                print(
+                    f"{scenario:<11} c={c:<3} rps={r['throughput_rps']:>8} p50={lat['p50_ms']:>9}ms "
+                    f"p95={lat['p95_ms']:>9}ms p99={lat['p99_ms']:>9}ms status={r['status']} "
+                    f"rss={r['peak_rss_mb']}MB"
+                )
+    finally:
+        restore()
+
+    path = save_results(
+        "loadtest",
+        {
+            "config": {
+                "requests": args.requests,
+                "mode": args.mode,
+                "cache_hit_ratio": args.cache_hit_ratio,
+                "image_size": args.image_size,
+            },
+            "fake_backend": backend.stats(),
+            "cells": cells,
+        },
+        args.out,
+    )
+    print(f"saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Optional
 import streamlit as st
 
 from utils.source_catalog import source_title, source_portal_url
-from utils.ui import get_api_client
+from utils.ui import get_api_client, get_local_kb
 from utils.i18n import t, t_severity, t_confidence
 
 _SEV_COLORS = {
@@ -62,8 +62,15 @@ def _extract_authority_id(action: str) -> Optional[str]:
     return None
 
 
-@st.cache_data(show_spinner=False, ttl=3600)
 def _get_authority_info(authority_id: str) -> Optional[Dict[str, Any]]:
+    local_kb = get_local_kb()
+    if local_kb is not None:
+        return local_kb.authority(authority_id)
+    return _fetch_authority_info(authority_id)
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _fetch_authority_info(authority_id: str) -> Optional[Dict[str, Any]]:
     try:
         client = get_api_client()
         return client.get_authority(authority_id)
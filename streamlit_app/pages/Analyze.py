@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import io
+from collections import OrderedDict
+from typing import Optional
 
 import streamlit as st
 from PIL import Image
@@ -31,19 +34,46 @@ st.markdown(
 for key, default in [
     ("uploaded_image_bytes", None),
     ("uploaded_image_name", None),
+    ("uploaded_image_id", None),
+    ("uploaded_image_digest", None),
     ("analysis_result", None),
+    ("analysis_cache", None),
 ]:
     if key not in st.session_state:
         st.session_state[key] = default
 
+# Preview sizes (max width, max height) and how many decoded thumbnails stay cached.
+PREVIEW_BOX = (900, 450)
+FULL_VIEW_BOX = (2048, 2048)
+THUMBNAIL_CACHE_ENTRIES = 32
+# Successful analyses kept per session, keyed by (content hash, mode, include_laws).
+RESULT_CACHE_ENTRIES = 16
 
-def _resize_for_preview(img: Image.Image, max_w: int = 900, max_h: int = 450) -> Image.Image:
-    w, h = img.size
-    scale = min(max_w / max(w, 1), max_h / max(h, 1), 1.0)
-    if scale >= 1.0:
-        return img
-    new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
-    return img.resize(new_size, Image.Resampling.LANCZOS)
+
+@st.cache_data(show_spinner=False, max_entries=THUMBNAIL_CACHE_ENTRIES)
+def _thumbnail(digest: str, max_w: int, max_h: int, _image_bytes: bytes) -> Optional[bytes]:
+    """JPEG of the upload fitted to max_w x max_h, or None if it can't be decoded.
+
+    Keyed by the content hash (`_image_bytes` is not hashed by Streamlit), so reruns and
+    re-uploads of the same photo reuse it. JPEGs are decoded at a reduced scale (`draft`)
+    instead of full resolution.
+    """
+    try:
+        img = Image.open(io.BytesIO(_image_bytes))
+        img.draft("RGB", (max_w, max_h))
+        img = img.convert("RGB")
+        img.thumbnail((max_w, max_h), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=90)
+        return out.getvalue()
+    except Exception:
+        return None
+
+
+def _result_cache() -> "OrderedDict[tuple, dict]":
+    if st.session_state.analysis_cache is None:
+        st.session_state.analysis_cache = OrderedDict()
+    return st.session_state.analysis_cache
 
 
 _SEV_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
@@ -87,13 +117,21 @@ with left:
 
 with right:
     if uploaded_file is not None:
-        image_bytes = uploaded_file.read()
-        st.session_state.uploaded_image_bytes = image_bytes
-        st.session_state.uploaded_image_name = uploaded_file.name
-
-        try:
-            img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-            preview = _resize_for_preview(img)
+        # Read and hash each upload once, not on every rerun.
+        file_id = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+        if st.session_state.uploaded_image_id != file_id:
+            image_bytes = uploaded_file.getvalue()
+            st.session_state.uploaded_image_bytes = image_bytes
+            st.session_state.uploaded_image_name = uploaded_file.name
+            st.session_state.uploaded_image_digest = hashlib.sha256(image_bytes).hexdigest()
+            st.session_state.uploaded_image_id = file_id
+
+        digest = st.session_state.uploaded_image_digest
+        image_bytes = st.session_state.uploaded_image_bytes
+        preview = _thumbnail(digest, *PREVIEW_BOX, image_bytes)
+        if preview is None:
+            st.info("Preview unavailable for this file.")
+        else:
             st.image(
                 preview,
                 caption=t("preview_caption", lang).format(name=uploaded_file.name),
@@ -102,9 +140,11 @@ with right:
 
             if show_full_image:
                 with st.expander("Full-size image", expanded=False):
-                    st.image(img, caption=uploaded_file.name, use_container_width=True)
-        except Exception:
-            st.info("Preview unavailable for this file.")
+                    st.image(
+                        _thumbnail(digest, *FULL_VIEW_BOX, image_bytes),
+                        caption=uploaded_file.name,
+                        use_container_width=True,
+                    )
     else:
         st.markdown(
             f"""<div class='empty-preview'>📷 {t("need_upload", lang)}</div>""",
@@ -116,14 +156,32 @@ if analyze_clicked:
     if not st.session_state.uploaded_image_bytes:
         st.warning(t("need_upload", lang))
     else:
-        client = get_api_client()
-        with st.spinner(t("analyzing", lang)):
-            result = client.analyze_image(
-                st.session_state.uploaded_image_bytes,
-                filename=st.session_state.uploaded_image_name or "image.jpg",
-                include_laws=include_laws,
-                mode=mode,
-            )
+        cache = _result_cache()
+        cache_key = (st.session_state.uploaded_image_digest, mode, include_laws)
+        result = cache.get(cache_key)
+        if result is not None:
+            cache.move_to_end(cache_key)
+        else:
+            client = get_api_client()
+            with st.spinner(t("analyzing", lang)):
+                original = st.session_state.uploaded_image_bytes
+                # Fit to the model's resolution here; the server would discard the rest anyway.
+                body, name = client.prepare_upload(
+                    original, st.session_state.uploaded_image_name or "image.jpg"
+                )
+                result = client.analyze_image(
+                    body,
+                    filename=name,
+                    include_laws=include_laws,
+                    mode=mode,
+                    downscale=False,
+                )
+            if len(body) < len(original):
+                st.caption(f"Uploaded {len(body) / 1024:,.0f} KB (downscaled from {len(original) / 1024:,.0f} KB).")
+            if result.get("success", False):
+                cache[cache_key] = result
+                while len(cache) > RESULT_CACHE_ENTRIES:
+                    cache.popitem(last=False)
         st.session_state.analysis_result = result
 
 # ── Results ──
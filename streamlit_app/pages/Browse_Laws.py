@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import streamlit as st
 
-from utils.ui import load_css, sidebar, get_api_client
+from utils.ui import load_css, sidebar, get_api_client, get_local_kb
 from utils.i18n import t
 
 st.set_page_config(page_title="Browse Laws • ConstrucSafe BD", page_icon="📚", layout="wide")
@@ -20,28 +20,82 @@ st.markdown(
 )
 
 client = get_api_client()
+# Filters and details come from the in-memory KB bundle; the API is the fallback.
+local_kb = get_local_kb()
+CATALOG_FIELDS = ("display_name_en", "category", "severity", "inspection_domain")
 
 
 @st.cache_data(show_spinner=False, ttl=3600)
-def _cached_list_violations():
-    return client.list_violations()
+def _cached_facets():
+    return client.catalog_facets().get("facets", {})
 
 
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_catalog(kind, category, severity, authority):
+    # One filtered catalog request instead of the ID list + a details call per row.
+    return client.list_catalog(
+        kind=kind,
+        category=category,
+        severity=severity,
+        authority=authority,
+        fields=CATALOG_FIELDS,
+    )
+
+
+ALL = "All"
+facets = {}
+try:
+    facets = local_kb.facets() if local_kb is not None else _cached_facets()
+except Exception as e:
+    st.error(f"Could not load filters: {e}")
+
+KINDS = {"canonical": "Violation types", "micro": "DIFE checklist items"}
+f0, f1, f2, f3 = st.columns(4)
+with f0:
+    kind = st.selectbox("Source", options=list(KINDS), format_func=KINDS.get)
+with f1:
+    category = st.selectbox("Category", options=[ALL, *sorted(facets.get("category", {}))])
+with f2:
+    severity = st.selectbox("Severity", options=[ALL, *sorted(facets.get("severity", {}))])
+with f3:
+    authority = st.selectbox("Authority", options=[ALL, *sorted(facets.get("authority", {}))], format_func=str.upper)
+
 violations = []
 try:
-    violations = _cached_list_violations()
+    filters = {
+        "kind": kind,
+        "category": None if category == ALL else category,
+        "severity": None if severity == ALL else severity,
+        "authority": None if authority == ALL else authority,
+    }
+    if local_kb is not None:
+        violations = local_kb.catalog(CATALOG_FIELDS, **filters)
+    else:
+        violations = _cached_catalog(*filters.values())
 except Exception as e:
     st.error(f"Could not load violations list: {e}")
 
 if violations:
-    vid = st.selectbox("Violation type", options=sorted(violations))
+    names = {v["violation_id"]: v.get("display_name_en") or v.get("inspection_domain") for v in violations}
+    st.caption(f"{len(violations)} violation types")
+    vid = st.selectbox(
+        "Violation type",
+        options=list(names),
+        format_func=lambda x: f"{x} — {names[x]}" if names.get(x) else x,
+    )
     if vid:
-        with st.spinner("Loading details..."):
-            try:
-                details = client.get_violation_details(vid)
-            except Exception as e:
-                st.error(f"Could not load details: {e}")
-                details = None
+        if local_kb is not None:
+            details = local_kb.violation(vid)
+            bundle = {"authorities": {a.get("authority_id"): a for a in local_kb.authorities_for(vid)}}
+        else:
+            with st.spinner("Loading details..."):
+                try:
+                    # Details, authorities and penalty profiles in one request.
+                    bundle = client.batch_get_violations([vid])
+                    details = bundle["violations"].get(vid)
+                except Exception as e:
+                    st.error(f"Could not load details: {e}")
+                    bundle, details = {}, None
 
         if details:
             col1, col2 = st.columns([1, 1])
@@ -64,8 +118,10 @@ if violations:
             if aid:
                 st.markdown("---")
                 st.markdown("### Enforcement authority")
-                try:
-                    a = client.get_authority(aid)
+                authorities = list((bundle.get("authorities") or {}).values())
+                if not authorities:
+                    st.info("Authority info not available.")
+                for a in authorities:
                     st.markdown(f"**{a.get('full_name', '')}** ({a.get('authority_id', '')})")
                     if a.get("full_name_bn"):
                         st.markdown(f"<div class='bengali-text'>{a.get('full_name_bn')}</div>", unsafe_allow_html=True)
@@ -74,8 +130,6 @@ if violations:
                         st.markdown(f"**Hotline:** {a.get('hotline')}")
                     if a.get("website"):
                         st.markdown(f"**Website:** {a.get('website')}")
-                except Exception:
-                    st.info("Authority info not available.")
 
             refs = details.get("legal_references", []) or []
             if refs:
@@ -3,7 +3,7 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from utils.ui import load_css, sidebar, get_api_client
+from utils.ui import load_css, sidebar, get_api_client, get_local_kb
 from utils.i18n import t
 
 st.set_page_config(page_title="Search Laws • ConstrucSafe BD", page_icon="🔎", layout="wide")
@@ -14,7 +14,7 @@ st.markdown(
     f"""
     <div class="page-header">
         <h1>🔎 {t("search_title", lang)}</h1>
-        <div class="subtitle">Search the BNBC clause library by keyword to find relevant regulations.</div>
+        <div class="subtitle">Search violation types, DIFE checklist items and the BNBC clause library by keyword.</div>
     </div>
     """,
     unsafe_allow_html=True,
@@ -22,26 +22,39 @@ st.markdown(
 
 client = get_api_client()
 
+KINDS = {"violation": "Violation types", "micro": "DIFE checklist items", "clause": "BNBC clauses"}
+
 q = st.text_input("Query", placeholder=t("search_placeholder", lang))
-top_k = st.slider("Top K", min_value=1, max_value=20, value=5)
+c1, c2 = st.columns([2, 1])
+with c1:
+    kinds = st.multiselect("Search in", options=list(KINDS), default=list(KINDS), format_func=KINDS.get)
+with c2:
+    top_k = st.slider("Top K", min_value=1, max_value=50, value=10)
 
 if st.button(t("search_btn", lang), type="primary"):
     if not q.strip():
         st.warning("Enter a query.")
     else:
-        with st.spinner("Searching..."):
-            try:
-                res = client.match_text(q.strip(), top_k=top_k)
-            except Exception as e:
-                st.error(f"Search failed: {e}")
-                res = None
+        local_kb = get_local_kb()
+        if local_kb is not None:
+            # Same index and ranking as /laws/search, run in memory.
+            res = {"results": local_kb.search(q.strip(), top_k=top_k, kinds=kinds)}
+        else:
+            with st.spinner("Searching..."):
+                try:
+                    res = client.search(q.strip(), top_k=top_k, kinds=kinds)
+                except Exception as e:
+                    st.error(f"Search failed: {e}")
+                    res = None
 
         if res:
-            matches = res.get("matches", []) or []
-            if not matches:
+            results = res.get("results", []) or []
+            if not results:
                 st.info("No matches found.")
             else:
-                df = pd.DataFrame(matches)
-                cols = [c for c in ["score", "violation_id", "citation", "section", "title", "pdf_page", "gazette_page", "clause_id", "source_catalog_id", "confidence"] if c in df.columns]
-                st.dataframe(df[cols] if cols else df, use_container_width=True)
+                df = pd.DataFrame(results)
+                df["kind"] = df["kind"].map(lambda k: KINDS.get(k, k))
+                df["violation_ids"] = df["violation_ids"].map(lambda ids: ", ".join(ids[:5]) + (" …" if len(ids) > 5 else ""))
+                cols = [c for c in ["score", "kind", "id", "title", "violation_ids"] if c in df.columns]
+                st.dataframe(df[cols], use_container_width=True)
                 st.caption("Tip: pick a violation_id above and open it in **Browse Laws** to see full details.")
@@ -1,13 +1,44 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import io
 import mimetypes
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlencode
 
-import requests
+import httpx
+from PIL import Image
 
 from utils.config import CONFIG
 
+# Conditional-GET cache for the static /laws endpoints (URL -> (ETag, parsed JSON)).
+ETAG_CACHE_SIZE = 512
+# IDs per POST /laws/violations:batchGet (server cap: 500).
+BATCH_GET_CHUNK = 200
+
+# Keep-alive pool per client; the Streamlit client is shared by all sessions (cache_resource).
+POOL_MAX_CONNECTIONS = 20
+POOL_MAX_KEEPALIVE = 10
+# 429/503 are retried with jittered exponential backoff, or after Retry-After when sent.
+# A Retry-After beyond RETRY_MAX_DELAY_S (e.g. the daily quota) is returned, not waited out.
+RETRY_STATUSES = frozenset({429, 503})
+MAX_RETRIES = 3
+RETRY_BACKOFF_S = 0.5
+RETRY_MAX_DELAY_S = 30.0
+# Requests in flight at once in the concurrent helpers (analyze_many, chunked batchGet).
+CONCURRENCY = 4
+
+T = TypeVar("T")
+
 
 @dataclass
 class APIError(Exception):
@@ -16,60 +47,589 @@ class APIError(Exception):
     payload: Optional[dict] = None
 
 
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Last backend health check; `data` is kept from the last success when a check fails."""
+
+    ok: bool
+    data: Dict[str, Any]
+    checked_at: float  # time.monotonic()
+    error: Optional[str] = None
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.checked_at
+
+
+def retry_after_s(response: httpx.Response) -> Optional[float]:
+    """Retry-After in seconds (delta-seconds or HTTP-date), or None."""
+    raw = (response.headers.get("Retry-After") or "").strip()
+    if not raw:
+        return None
+    if raw.isdigit():
+        return float(raw)
+    try:
+        when = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(attempt: int, response: httpx.Response) -> Optional[float]:
+    """Seconds to wait before retry number `attempt + 1`, or None to give up."""
+    if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+        return None
+    hinted = retry_after_s(response)
+    if hinted is not None:
+        if hinted > RETRY_MAX_DELAY_S:
+            return None
+        # A little jitter so clients told the same Retry-After don't return in lockstep.
+        return hinted + random.uniform(0, RETRY_BACKOFF_S)
+    return random.uniform(0, min(RETRY_MAX_DELAY_S, RETRY_BACKOFF_S * 2 ** attempt))  # full jitter
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=POOL_MAX_CONNECTIONS, max_keepalive_connections=POOL_MAX_KEEPALIVE)
+
+
+def _run(coro: Awaitable[T]) -> T:
+    """Run a coroutine from sync code (Streamlit scripts have no running loop)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)  # type: ignore[arg-type]
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()  # type: ignore[arg-type]
+
+
+def fit_to_profile(image_bytes: bytes, filename: str, profile: Optional[Dict[str, Any]]) -> Tuple[bytes, str]:
+    """Downscale and re-encode to the server's model profile (GET /analyze/config).
+
+    The server would do the same resize; doing it here cuts the upload and lets the
+    server skip decoding. Images already in the model format and size, without EXIF/XMP
+    and within the byte budget, unreadable images and older servers (no profile) are
+    sent unchanged.
+    """
+    if not profile:
+        return image_bytes, filename
+    fmt = "WEBP" if profile.get("format") == "webp" else "JPEG"
+    max_side = int(profile.get("max_side") or 1024)
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.format == fmt and img.mode == "RGB" and max(img.size) <= max_side:
+            # Same pass-through rule as the server's model_ready_bytes: no EXIF/XMP, within budget.
+            w, h = img.size
+            per_pixel = float(profile.get("max_bytes_per_pixel") or 0.5)
+            budget = int(profile.get("target_bytes") or 0) or int(w * h * per_pixel)
+            applist = getattr(img, "applist", None) or ()
+            has_metadata = any(m == "APP1" for m, _ in applist) or "exif" in img.info or "xmp" in img.info
+            if not has_metadata and len(image_bytes) <= budget:
+                return image_bytes, filename
+        img = img.convert("RGB")
+        # Same arithmetic and resampling as the server's resize_image.
+        w, h = img.size
+        scale = min(1.0, float(max_side) / float(max(w, h)))
+        if scale < 1.0:
+            img = img.resize((int(w * scale), int(h * scale)))
+        out = io.BytesIO()
+        img.save(out, format=fmt, quality=int(profile.get("quality") or 85))
+    except Exception:
+        return image_bytes, filename
+    stem = filename.rsplit(".", 1)[0] if "." in filename else filename
+    return out.getvalue(), f"{stem}.{'webp' if fmt == 'WEBP' else 'jpg'}"
+
+
+def _analyze_params(include_laws: bool, mode: str, tiling: bool) -> Dict[str, str]:
+    params = {"include_laws": str(include_laws).lower(), "mode": mode}
+    if tiling:
+        params["tiling"] = "true"
+    return params
+
+
+def _upload_files(image_bytes: bytes, filename: str) -> Dict[str, Tuple[str, bytes, str]]:
+    mime, _ = mimetypes.guess_type(filename)
+    return {"file": (filename, image_bytes, mime or "application/octet-stream")}
+
+
+def _analyze_result(r: httpx.Response) -> Dict[str, Any]:
+    if r.status_code >= 400:
+        # API uses FastAPI HTTPException with 'detail'
+        try:
+            payload = r.json()
+        except ValueError:
+            payload = {"detail": r.text}
+        return {"success": False, "error": payload.get("detail", payload), "status_code": r.status_code}
+    return r.json()
+
+
+def _cached_result(r: httpx.Response) -> Optional[Dict[str, Any]]:
+    if r.status_code != 200:
+        return None
+    try:
+        return r.json()
+    except ValueError:
+        return None
+
+
+def _batch_bodies(
+    violation_ids: Sequence[str], include_authorities: bool, include_penalties: bool, chunk_size: int
+) -> List[Dict[str, Any]]:
+    ids = list(dict.fromkeys(violation_ids))
+    step = max(1, int(chunk_size))
+    return [
+        {"ids": ids[i : i + step], "include_authorities": include_authorities, "include_penalties": include_penalties}
+        for i in range(0, len(ids), step)
+    ]
+
+
+def _merge_batches(pages: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"violations": {}, "authorities": {}, "penalties": {}, "not_found": []}
+    for data in pages:
+        for key in ("violations", "authorities", "penalties"):
+            out[key].update(data.get(key) or {})
+        out["not_found"].extend(data.get("not_found") or [])
+    return out
+
+
 class ConstructSafeAPIClient:
+    """Blocking client used by the Streamlit pages.
+
+    One keep-alive connection pool (httpx), gzip/br/zstd responses negotiated and decoded
+    by httpx, and 429/503 retried per `retry_delay`. The *_many helpers fan out through
+    `AsyncConstructSafeAPIClient`.
+    """
+
     def __init__(self, base_url: str | None = None, timeout_s: int | None = None) -> None:
         self.base_url = (base_url or CONFIG.base_url).rstrip("/")
         self.timeout_s = timeout_s or CONFIG.request_timeout_s
-        self.session = requests.Session()
+        # retries=1: one reconnect on connection errors (a dropped keep-alive socket).
+        self.http = httpx.Client(
+            timeout=self.timeout_s, transport=httpx.HTTPTransport(retries=1, limits=_limits())
+        )
+        self._etag_cache: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+        self._health: Optional[HealthSnapshot] = None
+        self._health_refreshing = threading.Lock()
+
+    def close(self) -> None:
+        self.http.close()
 
     def _url(self, path: str) -> str:
         if not path.startswith("/"):
             path = "/" + path
         return self.base_url + path
 
-    def health(self) -> Dict[str, Any]:
-        r = self.session.get(self._url("/health"), timeout=self.timeout_s)
+    def _async(self) -> "AsyncConstructSafeAPIClient":
+        return AsyncConstructSafeAPIClient(self.base_url, self.timeout_s)
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        attempt = 0
+        while True:
+            r = self.http.request(method, url, **kwargs)
+            delay = retry_delay(attempt, r)
+            if delay is None:
+                return r
+            r.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_json_cached(self, path: str) -> Any:
+        """GET with If-None-Match; a 304 reuses the previously parsed body (no transfer, no parse)."""
+        url = self._url(path)
+        with self._etag_lock:
+            hit = self._etag_cache.get(url)
+        headers = {"If-None-Match": hit[0]} if hit else {}
+
+        r = self._request("GET", url, headers=headers)
+        if r.status_code == 304 and hit is not None:
+            with self._etag_lock:
+                if url in self._etag_cache:
+                    self._etag_cache.move_to_end(url)
+            return hit[1]
+        r.raise_for_status()
+        data = r.json()
+
+        etag = r.headers.get("ETag")
+        if etag:
+            with self._etag_lock:
+                self._etag_cache[url] = (etag, data)
+                self._etag_cache.move_to_end(url)
+                while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        return data
+
+    def health(self, timeout_s: float | None = None) -> Dict[str, Any]:
+        """GET /health/details (status, version, KB state); plain /health on older servers."""
+        timeout = timeout_s or self.timeout_s
+        r = self.http.get(self._url("/health/details"), timeout=timeout)
+        if r.status_code == 404:
+            r = self.http.get(self._url("/health"), timeout=timeout)
         r.raise_for_status()
         return r.json()
 
-    def analyze_image(self, image_bytes: bytes, filename: str, *, include_laws: bool = True, mode: str = "fast") -> Dict[str, Any]:
-        mime, _ = mimetypes.guess_type(filename)
-        mime = mime or "application/octet-stream"
+    def _refresh_health(self) -> None:
+        try:
+            data = self.health(timeout_s=CONFIG.health_timeout_s)
+            snap = HealthSnapshot(ok=True, data=data, checked_at=time.monotonic())
+        except (httpx.HTTPError, ValueError) as e:
+            prev = self._health
+            snap = HealthSnapshot(ok=False, data=prev.data if prev else {}, checked_at=time.monotonic(), error=str(e))
+        self._health = snap
+
+    def _refresh_health_in_background(self) -> None:
+        if not self._health_refreshing.acquire(blocking=False):
+            return  # a refresh is already running
+
+        def run() -> None:
+            try:
+                self._refresh_health()
+            finally:
+                self._health_refreshing.release()
 
-        files = {"file": (filename, image_bytes, mime)}
-        params = {"include_laws": str(include_laws).lower(), "mode": mode}
+        threading.Thread(target=run, name="constructsafe-health", daemon=True).start()
 
+    def health_status(self, ttl_s: float | None = None) -> HealthSnapshot:
+        """Cached health (stale-while-revalidate).
+
+        Only the very first call waits for the backend (bounded by CONSTRUCSAFE_HEALTH_TIMEOUT_S).
+        After that the last snapshot is returned immediately, and one older than `ttl_s` is
+        refreshed in a background thread for the next caller.
+        """
+        ttl = CONFIG.health_ttl_s if ttl_s is None else ttl_s
+        snap = self._health
+        if snap is None:
+            with self._health_refreshing:
+                if self._health is None:
+                    self._refresh_health()
+            return self._health  # type: ignore[return-value]
+        if snap.age_s >= ttl:
+            self._refresh_health_in_background()
+        return snap
+
+    def upload_profile(self) -> Optional[Dict[str, Any]]:
+        """Image profile the model receives (GET /analyze/config), or None if unavailable."""
         try:
-            r = self.session.post(self._url("/api/v1/analyze"), params=params, files=files, timeout=self.timeout_s)
-            if r.status_code >= 400:
-                # API uses FastAPI HTTPException with 'detail'
-                try:
-                    payload = r.json()
-                except Exception:
-                    payload = {"detail": r.text}
-                return {"success": False, "error": payload.get("detail", payload), "status_code": r.status_code}
-            return r.json()
-        except requests.RequestException as e:
+            return self._get_json_cached("/api/v1/analyze/config")
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    def prepare_upload(self, image_bytes: bytes, filename: str) -> Tuple[bytes, str]:
+        """`image_bytes` fitted to the server's model profile (see `fit_to_profile`)."""
+        return fit_to_profile(image_bytes, filename, self.upload_profile())
+
+    def analyze_image(
+        self,
+        image_bytes: bytes,
+        filename: str,
+        *,
+        include_laws: bool = True,
+        mode: str = "fast",
+        tiling: bool = False,
+        check_cache: bool = True,
+        downscale: bool = True,
+    ) -> Dict[str, Any]:
+        """Analyze an image; with `check_cache`, ask by hash first and upload only on a miss.
+
+        With `downscale` the image is first fitted to the server's model profile (see
+        `prepare_upload`); tiled analyses always send the original pixels.
+        """
+        if downscale and not tiling:
+            image_bytes, filename = self.prepare_upload(image_bytes, filename)
+        params = _analyze_params(include_laws, mode, tiling)
+
+        if check_cache:
+            cached = self.cached_analysis(hashlib.sha256(image_bytes).hexdigest(), params)
+            if cached is not None:
+                return cached
+
+        try:
+            r = self._request(
+                "POST", self._url("/api/v1/analyze"), params=params, files=_upload_files(image_bytes, filename)
+            )
+            return _analyze_result(r)
+        except httpx.HTTPError as e:
             return {"success": False, "error": str(e), "status_code": None}
 
+    def analyze_many(
+        self, images: Sequence[Tuple[bytes, str]], concurrency: int = CONCURRENCY, **options: Any
+    ) -> List[Dict[str, Any]]:
+        """`analyze_image` for several (bytes, filename) pairs, `concurrency` at a time; results in order."""
+
+        async def run() -> List[Dict[str, Any]]:
+            async with self._async() as client:
+                return await client.analyze_many(images, concurrency=concurrency, **options)
+
+        return _run(run())
+
+    def cached_analysis(self, sha256: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Server-side cached result for these exact bytes, or None (miss or lookup failure)."""
+        try:
+            r = self._request("GET", self._url(f"/api/v1/analyze/by-hash/{sha256}"), params=params)
+        except httpx.HTTPError:
+            return None
+        return _cached_result(r)
+
     def list_violations(self) -> List[str]:
-        r = self.session.get(self._url("/api/v1/laws/violations"), timeout=self.timeout_s)
-        r.raise_for_status()
-        data = r.json()
+        data = self._get_json_cached("/api/v1/laws/violations")
         return data.get("violations", [])
 
+    def violation_catalog(
+        self,
+        *,
+        kind: str | None = None,
+        category: str | None = None,
+        severity: str | None = None,
+        authority: str | None = None,
+        source_id: str | None = None,
+        fields: Sequence[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 200,
+    ) -> Dict[str, Any]:
+        """One catalog page: {"total", "count", "next_cursor", "fields", "items"}."""
+        params = {
+            "kind": kind,
+            "category": category,
+            "severity": severity,
+            "authority": authority,
+            "source_id": source_id,
+            "fields": ",".join(fields) if fields else None,
+            "cursor": cursor,
+            "limit": int(limit),
+        }
+        query = urlencode({k: v for k, v in params.items() if v not in (None, "")})
+        return self._get_json_cached(f"/api/v1/laws/catalog?{query}")
+
+    def list_catalog(self, **filters: Any) -> List[Dict[str, Any]]:
+        """All catalog items matching `filters`, following next_cursor."""
+        items: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            page = self.violation_catalog(cursor=cursor, **filters)
+            items.extend(page.get("items", []))
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return items
+
+    def catalog_facets(self) -> Dict[str, Any]:
+        return self._get_json_cached("/api/v1/laws/catalog/facets")
+
     def get_violation_details(self, violation_id: str) -> Dict[str, Any]:
-        r = self.session.get(self._url(f"/api/v1/laws/violations/{violation_id}"), timeout=self.timeout_s)
+        return self._get_json_cached(f"/api/v1/laws/violations/{violation_id}")
+
+    def batch_get_violations(
+        self,
+        violation_ids: Sequence[str],
+        *,
+        include_authorities: bool = True,
+        include_penalties: bool = True,
+        chunk_size: int = BATCH_GET_CHUNK,
+    ) -> Dict[str, Any]:
+        """Details for many violations: {"violations", "authorities", "penalties", "not_found"}.
+
+        Large ID lists are split into chunks, fetched concurrently, and the results merged
+        (authorities and penalty profiles appear once each).
+        """
+        bodies = _batch_bodies(violation_ids, include_authorities, include_penalties, chunk_size)
+        if len(bodies) > 1:
+
+            async def run() -> Dict[str, Any]:
+                async with self._async() as client:
+                    return await client.batch_get_violations(
+                        violation_ids,
+                        include_authorities=include_authorities,
+                        include_penalties=include_penalties,
+                        chunk_size=chunk_size,
+                    )
+
+            return _run(run())
+        pages = []
+        for body in bodies:
+            r = self._request("POST", self._url("/api/v1/laws/violations:batchGet"), json=body)
+            r.raise_for_status()
+            pages.append(r.json())
+        return _merge_batches(pages)
+
+    def get_authority(self, authority_id: str) -> Dict[str, Any]:
+        return self._get_json_cached(f"/api/v1/laws/authorities/{authority_id}")
+
+    def violation_subtree(self, violation_id: str) -> Dict[str, Any]:
+        """A violation, its descendants and its ancestors (see the Violation Taxonomy API)."""
+        return self._get_json_cached(f"/api/v1/laws/violations/{violation_id}/subtree")
+
+    def rollup_violations(self, violation_ids: Sequence[str], level: int = 0) -> Dict[str, Any]:
+        """Detected IDs grouped under their taxonomy ancestor at `level`."""
+        body = {"ids": list(violation_ids), "level": int(level)}
+        r = self._request("POST", self._url("/api/v1/laws/violations:rollup"), json=body)
         r.raise_for_status()
         return r.json()
 
-    def get_authority(self, authority_id: str) -> Dict[str, Any]:
-        r = self.session.get(self._url(f"/api/v1/laws/authorities/{authority_id}"), timeout=self.timeout_s)
+    def kb_bundle(self) -> Dict[str, Any]:
+        """The whole browsable KB in one response (see utils/kb_bundle.py)."""
+        return self._get_json_cached("/api/v1/laws/bundle")
+
+    def kb_bundle_delta(self, since: str) -> Optional[Dict[str, Any]]:
+        """Changes since bundle version `since`, or None if the server no longer knows it."""
+        r = self._request("GET", self._url("/api/v1/laws/bundle/delta"), params={"since": since})
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+
+    def search(self, query: str, top_k: int = 10, kinds: Sequence[str] | None = None) -> Dict[str, Any]:
+        params: List[Tuple[str, Any]] = [("q", query), ("top_k", int(top_k))]
+        params += [("kind", k) for k in kinds or ()]
+        r = self._request("GET", self._url("/api/v1/laws/search"), params=params)
         r.raise_for_status()
         return r.json()
 
     def match_text(self, text: str, top_k: int = 5) -> Dict[str, Any]:
         params = {"text": text, "top_k": int(top_k)}
-        r = self.session.get(self._url("/api/v1/laws/match-text"), params=params, timeout=self.timeout_s)
+        r = self._request("GET", self._url("/api/v1/laws/match-text"), params=params)
+        r.raise_for_status()
+        return r.json()
+
+
+class AsyncConstructSafeAPIClient:
+    """asyncio counterpart of `ConstructSafeAPIClient` for concurrent work.
+
+    Same pool limits and retry policy. Use it as an async context manager, or call
+    `aclose()`. The fan-out helpers keep at most `concurrency` requests in flight.
+    """
+
+    def __init__(self, base_url: str | None = None, timeout_s: int | None = None) -> None:
+        self.base_url = (base_url or CONFIG.base_url).rstrip("/")
+        self.timeout_s = timeout_s or CONFIG.request_timeout_s
+        self.http = httpx.AsyncClient(
+            timeout=self.timeout_s, transport=httpx.AsyncHTTPTransport(retries=1, limits=_limits())
+        )
+        self._profile: Optional[Dict[str, Any]] = None
+
+    async def __aenter__(self) -> "AsyncConstructSafeAPIClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    def _url(self, path: str) -> str:
+        if not path.startswith("/"):
+            path = "/" + path
+        return self.base_url + path
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        attempt = 0
+        while True:
+            r = await self.http.request(method, url, **kwargs)
+            delay = retry_delay(attempt, r)
+            if delay is None:
+                return r
+            await r.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def health(self) -> Dict[str, Any]:
+        r = await self.http.get(self._url("/health/details"))
+        if r.status_code == 404:
+            r = await self.http.get(self._url("/health"))
+        r.raise_for_status()
+        return r.json()
+
+    async def upload_profile(self) -> Optional[Dict[str, Any]]:
+        """GET /analyze/config once per client; None if unavailable."""
+        if self._profile is None:
+            try:
+                r = await self._request("GET", self._url("/api/v1/analyze/config"))
+                r.raise_for_status()
+                self._profile = r.json()
+            except (httpx.HTTPError, ValueError):
+                return None
+        return self._profile
+
+    async def prepare_upload(self, image_bytes: bytes, filename: str) -> Tuple[bytes, str]:
+        profile = await self.upload_profile()
+        # Pillow work off the event loop, so other uploads keep streaming meanwhile.
+        return await asyncio.to_thread(fit_to_profile, image_bytes, filename, profile)
+
+    async def cached_analysis(self, sha256: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        try:
+            r = await self._request("GET", self._url(f"/api/v1/analyze/by-hash/{sha256}"), params=params)
+        except httpx.HTTPError:
+            return None
+        return _cached_result(r)
+
+    async def analyze_image(
+        self,
+        image_bytes: bytes,
+        filename: str,
+        *,
+        include_laws: bool = True,
+        mode: str = "fast",
+        tiling: bool = False,
+        check_cache: bool = True,
+        downscale: bool = True,
+    ) -> Dict[str, Any]:
+        if downscale and not tiling:
+            image_bytes, filename = await self.prepare_upload(image_bytes, filename)
+        params = _analyze_params(include_laws, mode, tiling)
+
+        if check_cache:
+            cached = await self.cached_analysis(hashlib.sha256(image_bytes).hexdigest(), params)
+            if cached is not None:
+                return cached
+
+        try:
+            r = await self._request(
+                "POST", self._url("/api/v1/analyze"), params=params, files=_upload_files(image_bytes, filename)
+            )
+            return _analyze_result(r)
+        except httpx.HTTPError as e:
+            return {"success": False, "error": str(e), "status_code": None}
+
+    async def analyze_many(
+        self, images: Sequence[Tuple[bytes, str]], concurrency: int = CONCURRENCY, **options: Any
+    ) -> List[Dict[str, Any]]:
+        """Analyze (bytes, filename) pairs concurrently; results in input order."""
+        gate = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def one(image_bytes: bytes, filename: str) -> Dict[str, Any]:
+            async with gate:
+                return await self.analyze_image(image_bytes, filename, **options)
+
+        return list(await asyncio.gather(*(one(b, name) for b, name in images)))
+
+    async def batch_get_violations(
+        self,
+        violation_ids: Sequence[str],
+        *,
+        include_authorities: bool = True,
+        include_penalties: bool = True,
+        chunk_size: int = BATCH_GET_CHUNK,
+        concurrency: int = CONCURRENCY,
+    ) -> Dict[str, Any]:
+        """Chunked batchGet with the chunks in flight concurrently; merged like the sync client."""
+        gate = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def one(body: Dict[str, Any]) -> Dict[str, Any]:
+            async with gate:
+                r = await self._request("POST", self._url("/api/v1/laws/violations:batchGet"), json=body)
+            r.raise_for_status()
+            return r.json()
+
+        bodies = _batch_bodies(violation_ids, include_authorities, include_penalties, chunk_size)
+        return _merge_batches(await asyncio.gather(*(one(b) for b in bodies)))
+
+    async def get_violation_details(self, violation_id: str) -> Dict[str, Any]:
+        r = await self._request("GET", self._url(f"/api/v1/laws/violations/{violation_id}"))
+        r.raise_for_status()
+        return r.json()
+
+    async def search(self, query: str, top_k: int = 10, kinds: Sequence[str] | None = None) -> Dict[str, Any]:
+        params: List[Tuple[str, Any]] = [("q", query), ("top_k", int(top_k))]
+        params += [("kind", k) for k in kinds or ()]
+        r = await self._request("GET", self._url("/api/v1/laws/search"), params=params)
         r.raise_for_status()
         return r.json()
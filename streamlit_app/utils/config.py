@@ -15,6 +15,11 @@ class AppConfig:
     # Default points at Railway backend
     base_url: str = os.getenv("CONSTRUCSAFE_API_BASE_URL", "https://construcsafe-bd-production.up.railway.app")
     request_timeout_s: int = int(os.getenv("CONSTRUCSAFE_HTTP_TIMEOUT_S", "60"))
+    # Sidebar backend status: served from cache, refreshed in the background when older.
+    health_ttl_s: int = int(os.getenv("CONSTRUCSAFE_HEALTH_TTL_S", "30"))
+    health_timeout_s: float = float(os.getenv("CONSTRUCSAFE_HEALTH_TIMEOUT_S", "3"))
+    # Local KB bundle (Browse/Search run in memory): how often to ask for a delta.
+    kb_refresh_s: int = int(os.getenv("CONSTRUCSAFE_KB_REFRESH_S", "300"))
 
 
 CONFIG = AppConfig()
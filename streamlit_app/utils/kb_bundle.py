@@ -0,0 +1,214 @@
+"""Local copy of the knowledge base, loaded from GET /api/v1/laws/bundle.
+
+`LocalKB` answers the Browse Laws / Search Laws questions (catalog filters, details,
+ranked search, source titles) in memory. `BundleCache` keeps one current per process and
+moves it forward with /laws/bundle/delta. Only the standard library is used here, so the
+same code works in an offline field client given a saved bundle file.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+BUNDLE_FORMAT = 1
+KEYED_SECTIONS = ("source_catalog", "violations", "authorities", "penalties")
+CATALOG_FACETS = ("kind", "category", "severity", "authority", "source_id")
+
+
+class Analyzer:
+    """The server tokenizer (backend/utils/text.py), driven by the bundle's analyzer tables."""
+
+    def __init__(self, tables: Dict[str, Any]) -> None:
+        self.sequence_folds = [tuple(x) for x in tables["sequence_folds"]]
+        self.char_folds = str.maketrans(tables["char_folds"])
+        self.english_suffixes = [tuple(x) for x in tables["english_suffixes"]]
+        self.bengali_suffixes = [tuple(x) for x in tables["bengali_suffixes"]]
+        self.min_stem = int(tables["min_stem"])
+        self.stopwords = frozenset(tables["stopwords"])
+        ranges = tables["word_ranges"]
+        self._word_re = re.compile("[" + "".join(f"{re.escape(a)}-{re.escape(b)}" for a, b in ranges) + "]+")
+
+    def normalize(self, text: str) -> str:
+        text = unicodedata.normalize("NFC", text)
+        for seq, repl in self.sequence_folds:
+            if seq in text:
+                text = text.replace(seq, repl)
+        return text.translate(self.char_folds).lower()
+
+    def stem(self, token: str) -> str:
+        if "\u0980" <= token[0] <= "\u09ff":  # Bengali block
+            for suffix, repl in self.bengali_suffixes:
+                if token.endswith(suffix):
+                    base = token[: -len(suffix)] + repl
+                    if len(base) >= self.min_stem and not base.endswith("\u09cd"):  # virama
+                        return base
+                    break
+            return token
+        if token.isdigit():
+            return token
+        for suffix, repl in self.english_suffixes:
+            if token.endswith(suffix):
+                base = token[: -len(suffix)] + repl
+                if suffix == "s" and token[-2:-1] in ("s", "u", "i"):
+                    break
+                if len(base) >= self.min_stem:
+                    token = base
+                break
+        if len(token) > self.min_stem and token.endswith("e"):
+            token = token[:-1]
+        return token
+
+    def tokenize(self, text: str) -> List[str]:
+        if not text:
+            return []
+        return [self.stem(t) for t in self._word_re.findall(self.normalize(text)) if t not in self.stopwords]
+
+
+class LocalKB:
+    """Read-only view over one bundle (same answers as the /laws endpoints, no network)."""
+
+    def __init__(self, bundle: Dict[str, Any]) -> None:
+        if bundle.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported KB bundle format: {bundle.get('format')!r}")
+        self.bundle = bundle
+        self.version: str = bundle["kb_version"]
+        self.violations: Dict[str, Dict[str, Any]] = bundle["violations"]
+        self.authorities: Dict[str, Dict[str, Any]] = bundle["authorities"]
+        self.penalties: Dict[str, Dict[str, Any]] = bundle["penalties"]
+        self.sources: Dict[str, Dict[str, Any]] = bundle["source_catalog"]
+        self._catalog: Dict[str, Dict[str, List[str]]] = bundle["catalog"]
+        self._catalog_sets = {f: {k: frozenset(ids) for k, ids in by_key.items()} for f, by_key in self._catalog.items()}
+        self._docs: List[List[Any]] = bundle["search"]["docs"]
+        self._postings: Dict[str, List[List[float]]] = bundle["search"]["postings"]
+        self.analyzer = Analyzer(bundle["analyzer"])
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LocalKB":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.bundle, ensure_ascii=False), encoding="utf-8")
+
+    def apply_delta(self, delta: Dict[str, Any]) -> "LocalKB":
+        """A new LocalKB with `delta` (from /laws/bundle/delta) applied."""
+        if delta.get("from") != self.version:
+            raise ValueError(f"Delta from {delta.get('from')!r} does not apply to {self.version!r}")
+        bundle = dict(self.bundle)
+        for sec in KEYED_SECTIONS:
+            upsert = (delta.get("upsert") or {}).get(sec) or {}
+            remove = (delta.get("remove") or {}).get(sec) or []
+            if upsert or remove:
+                items = dict(bundle[sec])
+                items.update(upsert)
+                for key in remove:
+                    items.pop(key, None)
+                bundle[sec] = items
+        bundle.update(delta.get("replace") or {})
+        bundle["kb_version"] = delta["to"]
+        return LocalKB(bundle)
+
+    # ── Catalog ──
+
+    def facets(self) -> Dict[str, Dict[str, int]]:
+        return {f: {k: len(ids) for k, ids in by_key.items()} for f, by_key in self._catalog.items()}
+
+    def catalog_ids(self, **filters: Optional[str]) -> List[str]:
+        """Sorted violation IDs matching every given facet value (case-insensitive)."""
+        lists = []
+        for facet, value in filters.items():
+            if value is None or value == "":
+                continue
+            if facet not in CATALOG_FACETS:
+                raise ValueError(f"Unknown facet: {facet}")
+            key = " ".join(str(value).split()).casefold()
+            lists.append((self._catalog.get(facet, {}).get(key, []), self._catalog_sets.get(facet, {}).get(key, frozenset())))
+        if not lists:
+            return sorted(self.violations)
+        lists.sort(key=lambda x: len(x[0]))
+        first, rest = lists[0][0], [s for _, s in lists[1:]]
+        return [vid for vid in first if all(vid in s for s in rest)]
+
+    def catalog(self, fields: Sequence[str] = (), **filters: Optional[str]) -> List[Dict[str, Any]]:
+        keep = ("violation_id", *fields)
+        return [{f: self.violations.get(vid, {}).get(f) for f in keep} for vid in self.catalog_ids(**filters)]
+
+    # ── Details ──
+
+    def violation(self, violation_id: str) -> Optional[Dict[str, Any]]:
+        return self.violations.get((violation_id or "").strip())
+
+    def authority(self, authority_id: str) -> Optional[Dict[str, Any]]:
+        return self.authorities.get((authority_id or "").strip())
+
+    def authorities_for(self, violation_id: str) -> List[Dict[str, Any]]:
+        """Known authorities named in a violation's enforcement block (as in batchGet)."""
+        by_key = {" ".join(aid.split()).casefold(): a for aid, a in self.authorities.items()}
+        keys = self._catalog_sets.get("authority", {})
+        return [by_key[k] for k, ids in keys.items() if k in by_key and violation_id in ids]
+
+    def source_title(self, source_id: str) -> Optional[str]:
+        title = (self.sources.get(source_id) or {}).get("title")
+        return title.strip() if isinstance(title, str) and title.strip() else None
+
+    # ── Search ──
+
+    def search(self, query: str, top_k: int = 10, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Same ranking and result shape as GET /laws/search."""
+        acc: Dict[int, float] = {}
+        for term in dict.fromkeys(self.analyzer.tokenize(query)):
+            for i, score in self._postings.get(term, ()):
+                i = int(i)
+                acc[i] = acc.get(i, 0.0) + score
+        allowed = frozenset(kinds) if kinds else None
+        docs = self._docs
+        candidates: Iterable[Tuple[int, float]] = acc.items()
+        if allowed is not None:
+            candidates = ((i, s) for i, s in candidates if docs[i][0] in allowed)
+        best = heapq.nlargest(max(1, top_k), candidates, key=lambda kv: kv[1])
+        return [
+            {"kind": docs[i][0], "id": docs[i][1], "title": docs[i][2], "score": round(s, 4), "violation_ids": docs[i][3]}
+            for i, s in best
+        ]
+
+
+class BundleCache:
+    """One LocalKB per process, refreshed by delta once it is older than `refresh_s`.
+
+    `get()` never raises: if the backend can't be reached it keeps the bundle it has (or
+    returns None before the first successful load), and callers fall back to the API.
+    """
+
+    def __init__(self, client: Any, refresh_s: float) -> None:
+        self.client = client
+        self.refresh_s = refresh_s
+        self._kb: Optional[LocalKB] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[LocalKB]:
+        kb = self._kb
+        if kb is not None and time.monotonic() - self._checked_at < self.refresh_s:
+            return kb
+        with self._lock:
+            if self._kb is not None and time.monotonic() - self._checked_at < self.refresh_s:
+                return self._kb
+            try:
+                self._kb = self._refresh(self._kb)
+            except Exception:
+                pass
+            self._checked_at = time.monotonic()
+            return self._kb
+
+    def _refresh(self, kb: Optional[LocalKB]) -> LocalKB:
+        if kb is not None:
+            delta = self.client.kb_bundle_delta(kb.version)
+            if delta is not None:
+                return kb.apply_delta(delta) if delta.get("to") != kb.version else kb
+        return LocalKB(self.client.kb_bundle())
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import streamlit as st
 from pathlib import Path
+from typing import Optional
 
 from utils.api_client import ConstructSafeAPIClient
+from utils.config import CONFIG
+from utils.kb_bundle import BundleCache, LocalKB
 from utils.i18n import t
 
 
@@ -18,6 +21,16 @@ def get_api_client() -> ConstructSafeAPIClient:
     return ConstructSafeAPIClient()
 
 
+@st.cache_resource
+def _bundle_cache() -> BundleCache:
+    return BundleCache(get_api_client(), CONFIG.kb_refresh_s)
+
+
+def get_local_kb() -> Optional[LocalKB]:
+    """The KB bundle held in this process (None until the backend has been reached once)."""
+    return _bundle_cache().get()
+
+
 def sidebar() -> str:
     """Render sidebar and return current language code."""
 
@@ -58,13 +71,20 @@ def sidebar() -> str:
 
     # ── Backend status ──
     st.sidebar.markdown("---")
-    client = get_api_client()
-    try:
-        h = client.health()
-        version = h.get("version", "n/a")
-        st.sidebar.success(f"Backend: ✅ v{version}")
-    except Exception:
+    # Cached on the shared client: reruns don't wait on a round-trip to the backend.
+    health = get_api_client().health_status()
+    version = health.data.get("version", "n/a")
+    kb = (health.data.get("kb") or {}).get("current") or {}
+    if not health.ok:
         st.sidebar.error("Backend: ❌ Unavailable")
+    elif health.data.get("status") == "starting":
+        st.sidebar.warning(f"Backend: ⏳ v{version} warming up")
+    else:
+        st.sidebar.success(f"Backend: ✅ v{version}")
+    if kb:
+        st.sidebar.caption(f"Knowledge base {kb.get('version', '')} · {kb.get('violations', 0)} violations")
+    if health.age_s >= 2 * CONFIG.health_ttl_s:
+        st.sidebar.caption(f"Status checked {int(health.age_s)} s ago")
 
     st.sidebar.caption("ConstrucSafe BD • v2.0")
 
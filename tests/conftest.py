@@ -16,3 +16,11 @@ os.environ.setdefault("LAWS_JSON_PATH", "backend/data/laws.json")
 def client():
     from backend.main import app
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _reset_usage_limiter():
+    # All TestClient requests share one IP; keep per-minute limits from leaking across tests.
+    from backend.services.usage_limiter import usage_limiter
+    usage_limiter._state.clear()
+    yield
@@ -0,0 +1,83 @@
+import json
+
+from backend.models.responses import AnalysisResponse, LawReference, PenaltyProfile
+
+
+def _detection(vid: str, severity: str = "high") -> dict:
+    return {
+        "violation_type": vid,
+        "severity": severity,
+        "confidence": "medium",
+        "description": "Worker on scaffold without harness",
+        "location": "upper left",
+        "affected_parties": ["workers"],
+        "raw_confidence_score": 0.61,
+    }
+
+
+def test_fast_body_matches_pydantic_for_every_violation():
+    from backend.services.analysis_response import build_analysis_body
+    from backend.services.law_matcher import LawMatcher
+
+    lm = LawMatcher(laws_file="data/laws.json")
+    ids = lm.get_all_violation_types()
+    flagged = {**_detection(ids[0], "medium"), "flag_reason": "needs review"}
+
+    body = build_analysis_body(
+        law_matcher=lm,
+        raw_violations=[_detection(v) for v in ids] + [_detection("NOT_IN_KB")],
+        raw_flagged=[flagged],
+        include_laws=True,
+        image_id="img-1",
+        timestamp="2026-01-01T00:00:00+00:00",
+        image_quality="good",
+    )
+    doc = json.loads(body)
+
+    # Round-trips through the response model unchanged: no missing, extra or mistyped fields.
+    assert AnalysisResponse.model_validate(doc).model_dump(mode="json") == doc
+    assert doc["violations_found"] == len(ids) + 1
+    assert doc["flagged_found"] == 1 and doc["ui_summary"]["flagged_for_review_count"] == 1
+
+    for item in doc["violations"][: len(ids)]:
+        exact = lm.match_violation(item["violation"]["violation_type"])
+        assert item["laws"] == [LawReference(**lr).model_dump() for lr in exact["laws"]]
+        assert item["penalties"] == [PenaltyProfile(**p).model_dump() for p in exact["penalties"]]
+        assert item["recommended_actions"] == exact["recommended_actions"]
+
+    # Unknown IDs fall back to clause search on the description.
+    assert doc["violations"][-1]["penalties"] == []
+
+
+def test_cache_hit_serves_stored_bytes(client, monkeypatch):
+    from backend.services import vision_analyzer
+    from backend.services.cache_store import cache_store
+    from test_metrics import _unique_jpeg
+
+    calls = {"n": 0}
+
+    async def _fake(self, image_bytes, mode="fast"):
+        calls["n"] += 1
+        return {
+            "success": True,
+            "violations": [_detection("PPE_HELMET_MISSING")],
+            "flagged_for_review": [],
+            "image_quality": "good",
+            "error": None,
+        }
+
+    monkeypatch.setattr(vision_analyzer.VisionAnalyzer, "analyze_image", _fake, raising=True)
+    files = {"file": ("s.jpg", _unique_jpeg((201, 3, 77)), "image/jpeg")}
+
+    first = client.post("/api/v1/analyze?mode=accurate", files=files)
+    second = client.post("/api/v1/analyze?mode=accurate", files=files)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert calls["n"] == 1
+    assert second.content == first.content
+    AnalysisResponse.model_validate(first.json())
+
+    key = next(k for k in cache_store._mem if k.startswith("analyze:accurate:1:"))
+    assert isinstance(cache_store.get_bytes(key), bytes)
+    assert cache_store.get(key)["success"] is True
@@ -75,3 +75,127 @@ def test_analyze_accurate_mocked(client, monkeypatch):
     assert data["success"] is True
     assert data["violations_found"] >= 1
     assert isinstance(data.get("violations", []), list)
+
+
+def test_analyze_rejects_oversized_upload_early(client, monkeypatch):
+    from backend.utils import uploads
+
+    monkeypatch.setattr(uploads, "max_upload_bytes", lambda: 1024)
+
+    big = _sample_image_bytes() + b"\0" * (200 * 1024)
+    files = {"file": ("big.jpg", big, "image/jpeg")}
+    r = client.post("/api/v1/analyze?mode=fast", files=files)
+
+    assert r.status_code == 413
+    assert r.json()["detail"]["error"] == "upload_too_large"
+
+
+def test_analyze_rejects_non_image_header(client):
+    files = {"file": ("notes.jpg", b"%PDF-1.7 not an image", "image/jpeg")}
+    r = client.post("/api/v1/analyze?mode=fast", files=files)
+
+    assert r.status_code == 400
+
+
+def test_exact_repeat_is_served_from_the_upload_hash(client, monkeypatch):
+    import io
+
+    from PIL import Image
+
+    from backend.services import vision_analyzer
+    from backend.services.metrics import UPLOAD_HASH_HITS
+
+    monkeypatch.setattr(vision_analyzer.VisionAnalyzer, "analyze_image", _fake_analyze_image, raising=True)
+    buf = io.BytesIO()
+    # PNG: model-sized JPEGs skip the resize, and with it the shared processed-image key.
+    Image.new("RGB", (40, 30), (201, 33, 150)).save(buf, format="PNG")
+    original = buf.getvalue()
+    url = "/api/v1/analyze?mode=fast&include_laws=true"
+
+    first = client.post(url, files={"file": ("a.png", original, "image/png")})
+    before = UPLOAD_HASH_HITS.value(mode="fast")
+    repeat = client.post(url, files={"file": ("a.png", original, "image/png")})
+    assert repeat.content == first.content
+    assert UPLOAD_HASH_HITS.value(mode="fast") == before + 1
+    assert "resize=" not in repeat.headers["x-timing"] and "validate=" not in repeat.headers["x-timing"]
+
+    # Different bytes, same pixels: falls through to the processed-image key.
+    padded = client.post(url, files={"file": ("b.png", original + b"\0" * 16, "image/png")})
+    assert padded.content == first.content and "resize=" in padded.headers["x-timing"]
+    assert UPLOAD_HASH_HITS.value(mode="fast") == before + 1
+
+
+def test_by_hash_lookup_before_upload(client, monkeypatch):
+    import hashlib
+    import io
+
+    from PIL import Image
+
+    from backend.services import vision_analyzer
+
+    monkeypatch.setattr(vision_analyzer.VisionAnalyzer, "analyze_image", _fake_analyze_image, raising=True)
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 30), (17, 92, 240)).save(buf, format="JPEG")
+    data = buf.getvalue()
+    url = f"/api/v1/analyze/by-hash/{hashlib.sha256(data).hexdigest()}?mode=fast&include_laws=true"
+
+    assert client.get(url).status_code == 404
+    assert client.head(url).status_code == 404
+    uploaded = client.post("/api/v1/analyze?mode=fast&include_laws=true", files={"file": ("c.jpg", data, "image/jpeg")})
+
+    hit = client.get(url)
+    assert hit.status_code == 200 and hit.content == uploaded.content
+    head = client.head(url)
+    assert head.status_code == 200 and head.content == b""
+    assert client.get(url.replace("mode=fast", "mode=accurate")).status_code == 404
+    assert client.get("/api/v1/analyze/by-hash/not-a-hash").status_code == 422
+
+
+def test_analyze_config_publishes_model_profile(client):
+    r = client.get("/api/v1/analyze/config")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["max_side"] == 1024 and body["format"] in ("jpeg", "webp")
+    assert {"quality", "target_bytes", "max_upload_bytes", "tiling_min_source_side"} <= set(body)
+    assert client.get("/api/v1/analyze/config", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_model_sized_upload_is_not_reencoded(client, monkeypatch):
+    import io
+
+    from PIL import Image
+
+    from backend.routers import analyze
+    from backend.services import vision_analyzer
+
+    sent = []
+
+    async def _capture(self, image_bytes: bytes, mode: str = "fast"):
+        sent.append(image_bytes)
+        return await _fake_analyze_image(self, image_bytes, mode)
+
+    def _no_resize(*args, **kwargs):
+        raise AssertionError("model-sized JPEG was re-encoded")
+
+    monkeypatch.setattr(vision_analyzer.VisionAnalyzer, "analyze_image", _capture, raising=True)
+    monkeypatch.setattr(analyze, "resize_image", _no_resize)
+    buf = io.BytesIO()
+    Image.new("RGB", (1024, 600), (64, 128, 32)).save(buf, format="JPEG", quality=85)
+    data = buf.getvalue()
+
+    r = client.post("/api/v1/analyze?mode=fast&include_laws=true", files={"file": ("d.jpg", data, "image/jpeg")})
+    assert r.status_code == 200 and sent == [data]
+
+
+def test_rate_limited_response_carries_retry_after(client, monkeypatch):
+    from types import SimpleNamespace
+
+    from backend.services import usage_limiter
+
+    monkeypatch.setattr(usage_limiter, "settings", SimpleNamespace(RATE_LIMIT_PER_IP=1, DAILY_QUOTA_PER_IP=100))
+    files = {"file": ("notes.jpg", b"%PDF-1.7 not an image", "image/jpeg")}
+    assert client.post("/api/v1/analyze?mode=fast", files=files).status_code == 400
+    r = client.post("/api/v1/analyze?mode=fast", files=files)
+
+    assert r.status_code == 429
+    assert 1 <= int(r.headers["retry-after"]) <= 60
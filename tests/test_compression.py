@@ -0,0 +1,56 @@
+import gzip
+
+
+def test_large_json_is_gzipped_small_is_not(client):
+    params = {"text": "scaffold guard rail helmet harness excavation", "top_k": 20}
+
+    r = client.get("/api/v1/laws/match-text", params=params, headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in r.headers["vary"].lower()
+    assert len(r.json()["matches"]) > 0
+
+    plain = client.get("/api/v1/laws/match-text", params=params, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == r.json()
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_precompressed_laws_bodies_are_not_compressed_twice(client):
+    r = client.get("/api/v1/laws/violations/EXCAVATION_NO_BARRICADE", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.json()["violation_id"] == "EXCAVATION_NO_BARRICADE"
+
+
+def test_middleware_threadpool_path_and_weak_etag():
+    import asyncio
+
+    from backend.utils.compression import CompressionMiddleware
+
+    body = b'{"x":"' + b"a" * 50000 + b'"}'
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json"), (b"etag", b'"abc"')],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=1024, thread_min_size=1024)(scope, None, send))
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"etag"] == b'W/"abc"'
+    assert int(headers[b"content-length"]) == len(sent[1]["body"])
+    assert gzip.decompress(sent[1]["body"]) == body
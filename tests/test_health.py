@@ -5,3 +5,14 @@ def test_health(client):
     assert data.get("status") == "ok"
     # version is part of your contract
     assert "version" in data
+
+
+def test_health_details_reports_kb(client):
+    r = client.get("/health/details")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["status"] in ("ok", "starting") and "version" in data
+    client.get("/api/v1/laws/violations")  # make sure a snapshot is loaded
+    kb = client.get("/health/details").json()["kb"]
+    assert kb["current"]["version"] and kb["current"]["violations"] > 0
+    assert {"reloading", "last_error"} <= set(kb)
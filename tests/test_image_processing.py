@@ -0,0 +1,57 @@
+import io
+
+from PIL import Image, ImageFilter
+
+
+def _noisy_image(w: int = 1024, h: int = 768) -> Image.Image:
+    return Image.effect_noise((w, h), 60).convert("RGB").filter(ImageFilter.GaussianBlur(1.5))
+
+
+def test_encode_image_respects_target_bytes():
+    from backend.utils.image_processing import encode_image
+
+    img = _noisy_image()
+    unconstrained = encode_image(img, quality=85, target_bytes=0)
+    budget = len(unconstrained) // 2
+
+    data = encode_image(img, quality=85, target_bytes=budget)
+
+    assert len(data) <= budget
+    assert Image.open(io.BytesIO(data)).size == img.size
+
+
+def test_resize_image_webp_and_sniff():
+    from backend.utils.image_processing import resize_image, sniff_image_mime
+
+    src = io.BytesIO()
+    _noisy_image(2000, 1000).save(src, format="PNG")
+
+    data = resize_image(src.getvalue(), max_side=512, image_format="webp")
+
+    assert sniff_image_mime(data) == "image/webp"
+    assert Image.open(io.BytesIO(data)).size == (512, 256)
+    assert sniff_image_mime(src.getvalue()) == "image/png"
+
+
+def test_model_ready_bytes_requires_clean_in_budget_jpeg():
+    from backend.utils.image_processing import model_ready_bytes, pass_through_budget, resize_image
+
+    img = _noisy_image(800, 600)
+
+    clean = io.BytesIO()
+    img.save(clean, format="JPEG", quality=85)
+    assert model_ready_bytes(clean.getvalue()) == clean.getvalue()
+
+    # Camera metadata (GPS lives in EXIF) is never forwarded: re-encoded without it.
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    tagged = io.BytesIO()
+    img.save(tagged, format="JPEG", quality=85, exif=exif)
+    assert model_ready_bytes(tagged.getvalue()) is None
+    assert "exif" not in Image.open(io.BytesIO(resize_image(tagged.getvalue()))).info
+
+    # Model-sized but near-lossless: over the byte budget, so re-encoded.
+    heavy = io.BytesIO()
+    Image.effect_noise((800, 600), 60).convert("RGB").save(heavy, format="JPEG", quality=100, subsampling=0)
+    assert len(heavy.getvalue()) > pass_through_budget(800, 600)
+    assert model_ready_bytes(heavy.getvalue()) is None
@@ -0,0 +1,67 @@
+import json
+import pathlib
+import sys
+
+# The Streamlit app imports its helpers as `utils.*` from streamlit_app/.
+APP = pathlib.Path(__file__).resolve().parents[1] / "streamlit_app"
+if str(APP) not in sys.path:
+    sys.path.insert(0, str(APP))
+
+
+def test_bundle_endpoint_and_conditional_get(client):
+    r = client.get("/api/v1/laws/bundle")
+    assert r.status_code == 200
+    bundle = r.json()
+    assert bundle["format"] == 1
+    for section in ("source_catalog", "violations", "authorities", "penalties", "catalog", "search", "analyzer"):
+        assert bundle[section], section
+    assert "file_path" not in next(iter(bundle["source_catalog"].values()))
+    assert client.get("/api/v1/laws/bundle", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    same = client.get(f"/api/v1/laws/bundle/delta?since={bundle['kb_version']}").json()
+    assert same["upsert"] == {} and same["remove"] == {} and same["replace"] == {}
+    assert client.get("/api/v1/laws/bundle/delta?since=0000000000000000").status_code == 404
+
+
+def test_local_kb_matches_server_search_and_catalog(client):
+    from utils.kb_bundle import LocalKB
+
+    from backend.utils.text import tokenize
+
+    kb = LocalKB(client.get("/api/v1/laws/bundle").json())
+    for text in ("Workers without harnesses at heights", "উচ্চতায় কাজ সেফটি নেট নেই", "খোলা প্রান্তে রেলিং ২০২০"):
+        assert kb.analyzer.tokenize(text) == tokenize(text)
+    for q in ("helmet", "guardrail scaffold", "অগ্নি নির্বাপক"):
+        server = client.get("/api/v1/laws/search", params={"q": q, "top_k": 10}).json()["results"]
+        assert [h["id"] for h in kb.search(q, top_k=10)] == [h["id"] for h in server]
+
+    server_page = client.get("/api/v1/laws/catalog?kind=canonical&severity=critical&limit=200").json()
+    assert kb.catalog_ids(kind="canonical", severity="critical")[: server_page["count"]] == [
+        item["violation_id"] for item in server_page["items"]
+    ]
+
+
+def test_delta_turns_old_bundle_into_new(tmp_path):
+    from utils.kb_bundle import LocalKB
+
+    from backend.services.kb_bundle import kb_bundle
+    from backend.services.kb_registry import build_knowledge_base, resolve_laws_path
+
+    doc = json.loads(resolve_laws_path().read_text(encoding="utf-8"))
+    path = tmp_path / "laws.json"
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    old = kb_bundle(build_knowledge_base(path))
+
+    dropped = doc["canonical_violations"].pop(0)["violation_id"]
+    changed = doc["canonical_violations"][0]
+    changed["display_name_en"] = "Changed title"
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    new = kb_bundle(build_knowledge_base(path))
+
+    delta = json.loads(new.delta(old.manifest))
+    assert delta["remove"]["violations"] == [dropped]
+    assert list(delta["upsert"]["violations"]) == [changed["violation_id"]]
+    assert {"catalog", "search"} <= set(delta["replace"]) and "analyzer" not in delta["replace"]
+
+    patched = LocalKB(json.loads(old.full.body)).apply_delta(delta)
+    assert patched.bundle == json.loads(new.full.body)
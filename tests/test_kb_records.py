@@ -0,0 +1,36 @@
+import json
+
+from backend.services.kb_records import Enforcement, LegalReference, ViolationRecord
+from backend.services.kb_registry import resolve_laws_path
+from backend.services.law_matcher import LawMatcher
+
+
+def test_records_rebuild_laws_json_exactly():
+    doc = json.loads(resolve_laws_path().read_text(encoding="utf-8"))
+    lm = LawMatcher(data=json.loads(json.dumps(doc)))
+    entries = [(v["violation_id"], v) for v in doc["canonical_violations"]]
+    entries += [(v["micro_violation_id"], v) for v in doc["micro_violations"] if v["micro_violation_id"] not in dict(entries)]
+    for vid, v in entries:
+        # Same keys in the same order, so pre-encoded bodies (and their ETags) don't change.
+        assert json.dumps(lm.get_violation_details(vid), ensure_ascii=False) == json.dumps(v, ensure_ascii=False)
+
+    rec = lm.get_violation_record("HELMET_MISSING")
+    assert isinstance(rec.enforcement, Enforcement) and isinstance(rec.legal_references[0], LegalReference)
+    assert isinstance(rec.affected_parties, tuple) and rec.kind == "canonical"
+    other = next(r for vid, _ in entries if (r := lm.get_violation_record(vid)) is not rec and r.category == rec.category)
+    assert other.category is rec.category  # interned
+    assert not hasattr(rec, "description_en")  # free text is kept apart from the record
+
+
+def test_unexpected_shapes_round_trip_verbatim():
+    odd = {
+        "violation_id": "X",
+        "enforcement": "DIFE",
+        "legal_references": [{"source_id": "A", "relevant_text_excerpt": "text"}, "junk"],
+        "custom": {"a": [1, {"b": None}]},
+        "notes": None,
+    }
+    rec, text = ViolationRecord.from_json(odd)
+    assert rec.enforcement is None and rec.legal_references == ()
+    assert rec.to_json(text) == odd
+    assert rec.get("custom") == odd["custom"] and rec.get("missing") is None
@@ -0,0 +1,102 @@
+import json
+import time
+
+
+def _laws_copy(tmp_path):
+    from backend.services.kb_registry import resolve_laws_path
+
+    doc = json.loads(resolve_laws_path().read_text(encoding="utf-8"))
+    path = tmp_path / "laws.json"
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    return path, doc
+
+
+def test_reload_swaps_atomically_and_keeps_old_snapshot(tmp_path):
+    from backend.services.kb_registry import KBRegistry
+
+    path, doc = _laws_copy(tmp_path)
+    registry = KBRegistry(path)
+    warmed = []
+    registry.add_warmer(lambda kb: warmed.append(kb.version))
+
+    old = registry.current()
+    dropped = doc["canonical_violations"].pop(0)["violation_id"]
+    path.write_text(json.dumps(doc), encoding="utf-8")
+
+    status = registry.reload(wait=True)
+    new = registry.current()
+
+    assert status["swapped"] is True
+    assert new.version != old.version and warmed == [old.version, new.version]
+    # In-flight holders of the old snapshot still see the old data.
+    assert old.law_matcher.get_violation_details(dropped) is not None
+    assert new.law_matcher.get_violation_details(dropped) is None
+
+    # Same content: no swap. Broken file: keep the current version and report the error.
+    assert registry.reload(wait=True)["swapped"] is False
+    path.write_text("{not json", encoding="utf-8")
+    status = registry.reload(wait=True)
+    assert status["swapped"] is False and status["last_error"]
+    assert registry.current() is new
+
+
+def test_cyclic_garbage_survives_no_reload(tmp_path):
+    import gc
+    import weakref
+
+    from backend.services.kb_registry import KBRegistry
+
+    class Node:
+        pass
+
+    path, _ = _laws_copy(tmp_path)
+    registry = KBRegistry(path)
+    registry.current()
+
+    # A reference cycle that is already garbage while the reload runs (e.g. a request's traceback).
+    node = Node()
+    node.self = node
+    ref = weakref.ref(node)
+    del node
+
+    assert registry.reload(force=True, wait=True)["swapped"] is True
+    gc.collect()
+    assert ref() is None
+    assert gc.isenabled()
+
+
+def test_watcher_picks_up_new_file(tmp_path):
+    from backend.services.kb_registry import KBRegistry
+
+    path, doc = _laws_copy(tmp_path)
+    registry = KBRegistry(path)
+    first = registry.current().version
+    registry.start_watcher(0.05)
+    try:
+        doc["canonical_violations"].pop()
+        path.write_text(json.dumps(doc), encoding="utf-8")
+        deadline = time.time() + 5
+        while registry.current().version == first and time.time() < deadline:
+            time.sleep(0.05)
+        assert registry.current().version != first
+    finally:
+        registry.stop_watcher()
+
+
+def test_admin_kb_endpoints_and_cache_key_scope(client, monkeypatch):
+    from backend.services.cache_store import cache_store
+    from backend.services.kb_registry import kb_registry
+    from backend.utils import admin as admin_utils
+
+    monkeypatch.setattr(admin_utils, "admin_token", lambda: "s3cret")
+    headers = {"X-Admin-Token": "s3cret"}
+
+    status = client.get("/api/v1/admin/kb", headers=headers).json()
+    assert status["current"]["version"] == kb_registry.current().version
+
+    r = client.post("/api/v1/admin/kb/reload?wait=true", headers=headers)
+    assert r.status_code == 200 and r.json()["swapped"] is False
+
+    a = cache_store.make_key(b"img", mode="fast", include_laws=True, kb_version="v1")
+    b = cache_store.make_key(b"img", mode="fast", include_laws=True, kb_version="v2")
+    assert a != b
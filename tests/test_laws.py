@@ -7,3 +7,160 @@ def test_laws_violations(client):
     assert len(data["violations"]) > 10
     # spot check one known violation id
     assert "EXCAVATION_NO_BARRICADE" in data["violations"]
+
+
+def test_violation_details_etag_304_and_gzip(client):
+    from backend.services.kb_registry import kb_registry
+
+    url = "/api/v1/laws/violations/EXCAVATION_NO_BARRICADE"
+    r = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert r.json() == kb_registry.current().law_matcher.get_violation_details("EXCAVATION_NO_BARRICADE")
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and "public, max-age=" in r.headers["cache-control"]
+
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+
+    gz = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip" and gz.headers["etag"] != etag
+    assert gz.json() == r.json()  # transparently decoded by the client
+    assert client.get(url, headers={"If-None-Match": gz.headers["etag"]}).status_code == 304
+
+    assert client.get("/api/v1/laws/violations/NOPE").status_code == 404
+
+
+def test_catalog_filters_pagination_and_projection(client):
+    from backend.services.kb_registry import kb_registry
+
+    lm = kb_registry.current().law_matcher
+    expected = sorted(
+        vid
+        for vid in lm.get_all_violation_types()
+        if (lm.get_violation_details(vid).get("category") or "").lower() == "ppe"
+        and lm.get_violation_details(vid).get("severity") == "high"
+    )
+    assert expected
+
+    seen, cursor = [], None
+    while True:
+        params = {"category": "PPE", "severity": "high", "limit": 3, "fields": "display_name_en"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/laws/catalog", params=params).json()
+        assert page["total"] == len(expected)
+        assert all(set(item) == {"violation_id", "display_name_en"} for item in page["items"])
+        seen += [item["violation_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == expected
+
+    r = client.get("/api/v1/laws/catalog", params={"authority": "dmp", "limit": 1})
+    assert r.json()["total"] == len(lm.catalog_ids({"authority": "DMP"})) > 0
+    assert client.get("/api/v1/laws/catalog", params={"authority": "dmp", "limit": 1}, headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    assert client.get("/api/v1/laws/catalog", params={"fields": "nope"}).status_code == 400
+    assert client.get("/api/v1/laws/catalog", params={"cursor": "%%%"}).status_code == 400
+    assert client.get("/api/v1/laws/catalog", params={"severity": "unknown"}).json()["total"] == 0
+
+    facets = client.get("/api/v1/laws/catalog/facets").json()
+    assert facets["facets"]["severity"]["critical"] > 0 and "visual_indicators" in facets["fields"]
+
+
+def test_batch_get_violations_dedupes_and_resolves(client):
+    from backend.services.kb_registry import kb_registry
+
+    lm = kb_registry.current().law_matcher
+    ids = lm.get_all_violation_types()[:40]
+    r = client.post("/api/v1/laws/violations:batchGet", json={"ids": ids + ids[:5] + ["NOPE"]})
+    assert r.status_code == 200
+    data = r.json()
+    assert list(data["violations"]) == ids
+    assert data["violations"][ids[0]] == lm.get_violation_details(ids[0])
+    assert data["not_found"] == ["NOPE"]
+
+    want_auth = {a for vid in ids for a in lm.authority_ids_for(vid)}
+    want_pen = {p for vid in ids for p in lm.penalty_profile_ids_for(vid)}
+    assert set(data["authorities"]) == want_auth and want_auth
+    assert set(data["penalties"]) == want_pen and want_pen
+    assert data["penalties"][sorted(want_pen)[0]] == lm.get_penalty_profile(sorted(want_pen)[0])
+
+    lean = client.post(
+        "/api/v1/laws/violations:batchGet",
+        json={"ids": ids[:2], "include_authorities": False, "include_penalties": False},
+    ).json()
+    assert lean["authorities"] == {} and lean["penalties"] == {}
+    assert client.post("/api/v1/laws/violations:batchGet", json={"ids": []}).status_code == 422
+
+
+def test_taxonomy_subtree_and_rollup(client):
+    r = client.get("/api/v1/laws/violations/HELMET_MISSING/subtree")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["level"] == 0 and data["ancestors"] == []
+    assert data["subtree"][0]["violation_id"] == "HELMET_MISSING"
+    child = data["subtree"][1]
+    assert child["parent_violation_id"] == "HELMET_MISSING" and child["level"] == 1
+    assert client.get("/api/v1/laws/violations/HELMET_MISSING/subtree", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    assert client.get(f"/api/v1/laws/violations/{child['violation_id']}/subtree").json()["ancestors"] == ["HELMET_MISSING"]
+    assert client.get("/api/v1/laws/violations/NOPE/subtree").status_code == 404
+
+    ids = [child["violation_id"], "HELMET_MISSING", child["violation_id"], "SCAFFOLD_TIES_MISSING", "NOPE"]
+    rolled = client.post("/api/v1/laws/violations:rollup", json={"ids": ids}).json()
+    assert [(g["violation_id"], g["count"]) for g in rolled["groups"]] == [("HELMET_MISSING", 3), ("SCAFFOLD_UNSECURED", 1)]
+    assert rolled["groups"][0]["violation_ids"] == [child["violation_id"], "HELMET_MISSING"]
+    assert rolled["not_found"] == ["NOPE"]
+    same = client.post("/api/v1/laws/violations:rollup", json={"ids": ids[:1], "level": 1}).json()
+    assert same["groups"][0]["violation_id"] == child["violation_id"]
+
+
+def test_taxonomy_ignores_cycles_and_unknown_parents():
+    from backend.services.law_matcher import LawMatcher
+
+    def v(vid, parent=None):
+        return {"violation_id": vid, **({"parent_violation_id": parent} if parent else {})}
+
+    lm = LawMatcher(data={"canonical_violations": [v("A"), v("B", "A"), v("C", "B"), v("X", "Y"), v("Y", "X"), v("Z", "NOPE")]})
+    assert lm.subtree("A") == ("A", "B", "C") and lm.ancestors_of("C") == ("B", "A")
+    assert lm.rollup_target("C", 0) == "A" and lm.rollup_target("C", 1) == "B" and lm.rollup_target("C", 5) == "C"
+    assert lm.taxonomy_level("Z") == 0 and lm.parent_of("Z") is None
+    # X <-> Y: one edge is cut, so both are still reachable from a single root
+    assert sorted(lm.subtree(next(r for r in ("X", "Y") if lm.parent_of(r) is None))) == ["X", "Y"]
+
+
+def test_vision_allowed_ids_follow_model_relevance_and_level():
+    from backend.services.kb_registry import kb_registry
+    from backend.services.vision_analyzer import PRIORITY_VIOLATIONS, allowed_violation_ids
+
+    lm = kb_registry.current().law_matcher
+    vision = {x for x in lm.get_all_violation_types() if lm.get_violation_record(x).model_relevance == "vision"}
+
+    curated, _ = allowed_violation_ids(lm)  # default policy
+    assert curated and set(curated) <= set(PRIORITY_VIOLATIONS)
+
+    ids, allowed = allowed_violation_ids(lm, "taxonomy")  # no rollup by default
+    assert allowed >= vision | set(curated) and list(ids[: len(curated)]) == list(curated)
+    _, top_allowed = allowed_violation_ids(lm, "taxonomy", 0)
+    assert "HELMET_MISSING" in top_allowed  # parent of vision-tagged helmet checks
+    assert all(lm.taxonomy_level(x) == 0 for x in top_allowed - set(curated))
+    assert allowed_violation_ids(lm, "taxonomy", 0) is allowed_violation_ids(lm, "taxonomy", 0)  # precomputed
+
+
+def test_every_curated_and_sensitive_id_is_offered():
+    from backend.services.kb_registry import kb_registry
+    from backend.services.vision_analyzer import (
+        ALLOWED_ID_POLICIES,
+        PRIORITY_VIOLATIONS,
+        SENSITIVE_VIOLATIONS,
+        allowed_violation_ids,
+    )
+
+    lm = kb_registry.current().law_matcher
+    known = set(lm.get_all_violation_types())
+    assert SENSITIVE_VIOLATIONS <= known  # the flag-for-review path needs them in the KB
+    required = {x for x in PRIORITY_VIOLATIONS if x in known} | SENSITIVE_VIOLATIONS
+    for policy in ALLOWED_ID_POLICIES:
+        for level in (-1, 0, 1):
+            _, allowed = allowed_violation_ids(lm, policy, level)
+            assert required <= allowed, (policy, level, sorted(required - allowed))
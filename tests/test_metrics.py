@@ -0,0 +1,35 @@
+import io
+
+from PIL import Image
+
+from test_analyze import _fake_analyze_image
+
+
+def _unique_jpeg(color=(13, 171, 97)) -> bytes:
+    # Distinct pixels so the shared in-memory cache from other tests can't serve a hit.
+    out = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(out, format="JPEG")
+    return out.getvalue()
+
+
+def test_analyze_timing_headers_and_metrics(client, monkeypatch):
+    from backend.services import vision_analyzer
+
+    monkeypatch.setattr(vision_analyzer.VisionAnalyzer, "analyze_image", _fake_analyze_image, raising=True)
+
+    files = {"file": ("sample.jpg", _unique_jpeg(), "image/jpeg")}
+    first = client.post("/api/v1/analyze?mode=fast&include_laws=true", files=files)
+    second = client.post("/api/v1/analyze?mode=fast&include_laws=true", files=files)
+
+    assert first.status_code == 200 and second.status_code == 200
+    timing = first.headers["server-timing"]
+    for name in ("upload_read", "validate", "resize", "cache_lookup", "law_enrichment", "serialization", "total"):
+        assert f"{name};dur=" in timing
+    assert "cache_lookup=" in second.headers["x-timing"]
+
+    m = client.get("/metrics")
+    assert m.status_code == 200
+    body = m.text
+    assert 'constructsafe_stage_seconds_bucket{stage="resize",mode="fast",le="+Inf"}' in body
+    assert 'constructsafe_cache_hits_total{mode="fast"}' in body
+    assert 'route="/api/v1/analyze"' in body
@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    from backend.services.profiler import request_profiler
+    from backend.utils import admin as admin_utils
+
+    monkeypatch.setattr(admin_utils, "admin_token", lambda: "s3cret")
+    request_profiler.store.clear()
+    yield {"X-Admin-Token": "s3cret"}
+    request_profiler.store.clear()
+
+
+def test_admin_routes_require_token(client, monkeypatch):
+    assert client.get("/api/v1/admin/profiles").status_code == 404  # ADMIN_TOKEN unset
+
+    from backend.utils import admin as admin_utils
+
+    monkeypatch.setattr(admin_utils, "admin_token", lambda: "s3cret")
+    assert client.get("/api/v1/admin/profiles").status_code == 401
+    assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "nope"}).status_code == 401
+
+
+def test_profile_switch_captures_cprofile_for_admin_only(client, admin):
+    params = {"text": "workers without helmets", "profile": "1"}
+
+    anon = client.get("/api/v1/laws/match-text", params=params)
+    assert anon.status_code == 200
+    assert "x-profile-id" not in anon.headers
+
+    r = client.get("/api/v1/laws/match-text", params=params, headers=admin)
+    assert r.status_code == 200
+    pid = r.headers["x-profile-id"]
+
+    listing = client.get("/api/v1/admin/profiles", headers=admin).json()
+    assert [p["id"] for p in listing["profiles"]] == [int(pid)]
+
+    detail = client.get(f"/api/v1/admin/profiles/{pid}", headers=admin).json()
+    assert detail["kind"] == "cprofile"
+    assert detail["status"] == 200
+    assert "match_violation_text" in detail["stats_text"]
+
+
+def test_slow_requests_are_sampled_into_ring_buffer(client, admin, monkeypatch):
+    from backend.services.profiler import request_profiler
+
+    monkeypatch.setattr(request_profiler, "threshold_ms", 0.001)
+    for _ in range(3):
+        assert client.get("/api/v1/laws/violations").status_code == 200
+
+    profiles = request_profiler.store.list()
+    assert profiles and all(p.kind == "sampled" for p in profiles)
+    assert profiles[0].path == "/api/v1/laws/violations"
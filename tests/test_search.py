@@ -0,0 +1,44 @@
+def _index():
+    from backend.services.kb_registry import kb_registry
+    from backend.services.search_index import search_index
+
+    lm = kb_registry.current().law_matcher
+    return lm, search_index(lm)
+
+
+def test_micro_violations_are_indexed_and_resolvable():
+    lm, _ = _index()
+    micro = [vid for vid in lm.get_all_violation_types() if lm.is_micro_violation(vid)]
+    assert len(micro) > 100
+    bundle = lm.match_violation(micro[0])
+    assert bundle["violation_id"] == micro[0] and bundle["laws"]
+    assert set(lm.catalog_ids({"kind": "micro"})) == set(micro)
+
+
+def test_search_ranks_across_kinds_with_field_weights():
+    _, idx = _index()
+    hits = idx.search("scaffold guardrail", top_k=5)
+    assert hits and hits[0].kind == "violation" and "GUARDRAIL" in hits[0].id
+    assert all(a.score >= b.score for a, b in zip(hits, hits[1:]))
+
+    assert {h.kind for h in idx.search("confined space", top_k=5, kinds=["micro"])} == {"micro"}
+    clauses = idx.search("storage stacking", top_k=3, kinds=["clause"])
+    assert clauses and clauses[0].violation_ids
+    assert idx.search("zzzz qqqq") == []
+
+
+def test_search_endpoint(client):
+    r = client.get("/api/v1/laws/search", params=[("q", "helmet"), ("kind", "violation"), ("top_k", 3)])
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert len(results) == 3 and all("HELMET" in x["id"] for x in results)
+    assert client.get("/api/v1/laws/search", params={"q": "helmet", "kind": "nope"}).status_code == 400
+
+
+def test_bengali_queries_hit_bengali_fields(client):
+    _, idx = _index()
+    hits = idx.search("হেলমেট নেই", top_k=3, kinds=["violation"])
+    assert hits and all("HELMET" in h.id for h in hits)
+
+    r = client.get("/api/v1/laws/search", params={"q": "খোলা প্রান্তে রেলিং", "top_k": 3})
+    assert any("GUARDRAIL" in x["id"] for x in r.json()["results"])
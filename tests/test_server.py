@@ -0,0 +1,18 @@
+import os
+import pathlib
+
+import pytest
+
+from backend.server import memory_report, memory_usage
+
+
+@pytest.mark.skipif(not pathlib.Path("/proc/self/smaps_rollup").exists(), reason="needs /proc/<pid>/smaps_rollup")
+def test_memory_report_reads_smaps_rollup():
+    usage = memory_usage(os.getpid())
+    assert usage is not None
+    assert usage["rss_mb"] > 0 and usage["pss_mb"] <= usage["rss_mb"]
+    assert usage["uss_mb"] + usage["shared_mb"] == pytest.approx(usage["rss_mb"], abs=0.2)
+
+    report = memory_report([os.getpid(), 2**22 + 1])  # second pid does not exist
+    assert list(report["processes"]) == [os.getpid()]
+    assert report["total_pss_mb"] > 0
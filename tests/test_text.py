@@ -0,0 +1,17 @@
+from backend.utils.text import normalize, tokenize
+
+
+def test_bengali_spelling_variants_fold_together():
+    # precomposed YYA vs YA + nukta; ii/uu-kar vs i/u-kar; candrabindu; two-part o-kar
+    assert normalize("য়") == normalize("য়")
+    assert tokenize("ঝুঁকিপূর্ণ") == tokenize("ঝুকিপুর্ণ")
+    assert normalize("কো") == normalize("কো")
+    assert tokenize("ধারা ৮৮") == ["ধারা", "88"]
+
+
+def test_light_stemming_and_stopwords():
+    assert tokenize("কাজে কাজের কাজ") == ["কাজ", "কাজ", "কাজ"]
+    assert tokenize("শ্রমিকরা") == tokenize("শ্রমিক")
+    assert tokenize("Scaffolding guardrails and the damaged barricades") == tokenize("scaffold guardrail damage barricade")
+    assert tokenize("harness") == ["harness"]
+    assert tokenize("এবং the of") == []
@@ -0,0 +1,90 @@
+import io
+
+from PIL import Image
+
+
+def _wide_jpeg_bytes(w: int = 4096, h: int = 1536) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (w, h), (120, 120, 120)).save(out, format="JPEG", quality=70)
+    return out.getvalue()
+
+
+def test_tile_image_grid():
+    from backend.utils.image_processing import tile_image
+
+    tiles = tile_image(_wide_jpeg_bytes(), max_side=1024, overlap_pct=20, max_tiles=6, min_source_side=2048)
+
+    assert tiles[0].is_overview
+    crops = tiles[1:]
+    assert 1 < len(crops) <= 6
+    # crops overlap horizontally and cover the full width
+    assert crops[0].box[0] == 0
+    assert max(c.box[2] for c in crops) == 4096
+    assert crops[1].box[0] < crops[0].box[2]
+    for c in crops:
+        assert max(Image.open(io.BytesIO(c.image_bytes)).size) <= 1024
+
+
+async def _fake_tile_analyze(self, image_bytes: bytes, mode: str = "fast"):
+    return {
+        "success": True,
+        "violations": [
+            {
+                "violation_type": "PPE_GLOVES_MISSING",
+                "description": "Worker without gloves.",
+                "severity": "medium",
+                "confidence": "high",
+                "location": "near the scaffold",
+                "affected_parties": ["workers"],
+            }
+        ],
+        "flagged_for_review": [],
+        "image_quality": "good",
+    }
+
+
+def test_analyze_tiling_merges_duplicates(client, monkeypatch):
+    from backend.services import vision_analyzer
+
+    monkeypatch.setattr(vision_analyzer.VisionAnalyzer, "analyze_image", _fake_tile_analyze, raising=True)
+
+    files = {"file": ("wide.jpg", _wide_jpeg_bytes(), "image/jpeg")}
+    r = client.post("/api/v1/analyze?mode=fast&include_laws=false&tiling=true", files=files)
+
+    assert r.status_code == 200
+    data = r.json()
+    # every crop reports the same hazard over its whole area; neighbouring crops overlap,
+    # so the detections collapse to one record and the overview duplicate is dropped
+    assert len(data["violations"]) == 1
+    assert data["violations"][0]["violation"]["location"].endswith("of photo)")
+
+
+def _tile(label: str, box):
+    from backend.utils.image_processing import ImageTile
+
+    return ImageTile(label=label, box=box, image_bytes=b"")
+
+
+def _found(*violations):
+    return {"success": True, "violations": list(violations), "flagged_for_review": [], "image_quality": "good"}
+
+
+def _gloves(location: str, confidence: str = "medium"):
+    return {"violation_type": "PPE_GLOVES_MISSING", "severity": "medium", "confidence": confidence, "location": location}
+
+
+def test_merge_tile_detections_by_region():
+    from backend.services.vision_analyzer import merge_tile_detections
+
+    left, right = _tile("left", (0, 0, 2400, 1500)), _tile("right", (1600, 0, 4000, 1500))
+    # right edge of the left crop and left edge of the right crop: the overlap, one hazard
+    same = merge_tile_detections(
+        [(left, _found(_gloves("right side"))), (right, _found(_gloves("left side", "high")))], max_items=6
+    )
+    assert [v["location"] for v in same["violations"]] == ["left side (right of photo)"]
+
+    # far left and far right of the photo: two separate hazards
+    apart = merge_tile_detections(
+        [(left, _found(_gloves("left foreground"))), (right, _found(_gloves("right foreground")))], max_items=6
+    )
+    assert len(apart["violations"]) == 2
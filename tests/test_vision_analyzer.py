@@ -0,0 +1,84 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+from PIL import Image
+
+
+def _jpeg_bytes() -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (640, 480), (90, 110, 130)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+class _FakeCompletions:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self.replies.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _install_fake_openai(monkeypatch, replies):
+    import openai
+
+    completions = _FakeCompletions(replies)
+
+    class _FakeClient:
+        def __init__(self, api_key=None):
+            self.chat = SimpleNamespace(completions=completions)
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", _FakeClient)
+    return completions
+
+
+def test_invalid_json_triggers_text_only_repair(monkeypatch):
+    from backend.services.vision_analyzer import VisionAnalyzer
+
+    good = {
+        "violations": [
+            {
+                "violation_type": "PPE_GLOVES_MISSING",
+                "confidence_score": 0.95,
+                "severity": "medium",
+                "description": "Bare hands on rebar.",
+                "location": "center",
+                "affected_parties": ["workers"],
+                "evidence_clarity": "clear",
+            },
+            {
+                "violation_type": "NOT_A_REAL_ID",
+                "confidence_score": 0.99,
+                "severity": "high",
+                "description": "x",
+                "location": "x",
+                "affected_parties": ["workers"],
+                "evidence_clarity": "clear",
+            },
+        ]
+    }
+    completions = _install_fake_openai(monkeypatch, ['{"violations": [ {"violation_type": ', json.dumps(good)])
+
+    va = VisionAnalyzer()
+    va.api_key = "test-key"
+    result = asyncio.run(va.analyze_image(_jpeg_bytes(), mode="fast"))
+
+    assert result["success"] is True
+    assert [v["violation_type"] for v in result["violations"]] == ["PPE_GLOVES_MISSING"]
+    assert len(completions.calls) == 2
+    # repair call is text-only
+    assert all(isinstance(m["content"], str) for m in completions.calls[1]["messages"])
+    schema = completions.calls[0]["response_format"]["json_schema"]["schema"]
+    enum = schema["properties"]["violations"]["items"]["properties"]["violation_type"]["enum"]
+    assert "PPE_GLOVES_MISSING" in enum
+
+
+def test_lenient_json_strips_fences():
+    from backend.services.vision_analyzer import VisionAnalyzer
+
+    assert VisionAnalyzer._loads_json_lenient('```json\n{"violations": []}\n```') == {"violations": []}
+    assert VisionAnalyzer._loads_json_lenient("not json") is None